@@ -79,3 +79,13 @@ async def get_current_user(session: SessionDep, token: TokenDep, req: Request):
         
     logger.debug(f"Authenticated user: {user}")
     return user
+
+async def get_current_admin(req: Request, enforcer: enforcerDep, user=Depends(get_current_user)):
+
+    trace_id = get_trace_id(req)
+
+    if not await enforcer.has_role_for_user(str(user.id), settings.FIRST_SUPERUSER_ROLE):
+        logger.warning(f"Admin permission denied for user: {user.id}")
+        raise APIException(status_code=403, message="Permission denied", trace_id=trace_id)
+
+    return user
@@ -5,6 +5,9 @@ from app.api.routes import (
     predict_router,
     common_router,
     role_router,
+    report_router,
+    export_router,
+    map_router,
 )
     
 
@@ -19,5 +22,8 @@ def get_api_router():
     api_router.include_router(predict_router.router)
     api_router.include_router(common_router.router)
     api_router.include_router(role_router.router)
+    api_router.include_router(report_router.router)
+    api_router.include_router(export_router.router)
+    api_router.include_router(map_router.router)
 
     return api_router
\ No newline at end of file
@@ -1,10 +1,18 @@
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Request, status
 
-from app.schemas.geo_schema import ProvinceCreateSchema, ProvinceDetailSchema, ProvinceSchema, QueryGeoSchema
+from app.schemas.geo_schema import DistrictSchema, GeoAutocompleteQuerySchema, GeoNearbyQuerySchema, GeoNearbyResultSchema, GeoPlaceSchema, GeoPointQuerySchema, GeoSearchQuerySchema, GeoSearchResultSchema, ProvinceCreateSchema, ProvinceDetailSchema, ProvinceSchema, QueryDistrictSchema, QueryGeoSchema, QuerySubDistrictSchema, SubDistrictSchema
 from app.schemas import Result
+from app.services.geo_autocomplete import geo_autocomplete
+from app.services.geo_cache import geo_cache
+from app.services.geo_search_service import GeoSearchService
+from app.services.geo_spatial import geo_spatial
+from app.services.district_service import DistrictService
 from app.services.province_service import ProvinceService
+from app.services.sub_district_service import SubDistrictService
+from app.core.config import settings
 from app.api.deps import get_trace_id, SessionDep
-from app.utilities.app_exceptions import APIException, DuplicateResourceException, ResourceNotFoundException, SQLProcessException, ServerProcessException
+from app.utilities.app_exceptions import APIException, DuplicateResourceException, InvalidInputException, ResourceNotFoundException, SQLProcessException, ServerProcessException
+from app.utilities.app_response import cached_response, prepare_response, reference_response_cache
 
 
 router = APIRouter(prefix="/common", tags=["common"])
@@ -22,17 +30,175 @@ async def get_provinces(
     trace_id = get_trace_id(req)
 
     try:
-        result.trace_id = trace_id
-        provinces = await province_service.get_provinces(query = query)
-
-        if query.detail and query.code:
-            result.data = [ProvinceDetailSchema.model_validate(province) for province in provinces]
-        else:
-            result.data = [ProvinceSchema.model_validate(province) for province in provinces]
-        
-        result.success = True
-        return result
+        index = await geo_cache.get_index(session)
+        cache_key = ("common/province", index.version, tuple(query.model_dump().items()))
+
+        prepared = reference_response_cache.get(cache_key)
+
+        if prepared is None:
+            provinces, next_cursor = await province_service.get_provinces(query = query)
+
+            if query.detail and query.code:
+                data = [ProvinceDetailSchema.model_validate(province) for province in provinces]
+            else:
+                data = [ProvinceSchema.model_validate(province) for province in provinces]
+
+            prepared = prepare_response(data, next_cursor)
+            reference_response_cache.set(cache_key, prepared)
+
+        return cached_response(req, prepared)
     
+    except (ServerProcessException, SQLProcessException, InvalidInputException) as e:
+        raise APIException(status_code=e.status_code, message=e.message, trace_id=trace_id, data=e.data)
+
+
+@router.get("/district", response_model=Result)
+async def get_districts(
+    req: Request,
+    session: SessionDep,
+    query: QueryDistrictSchema = Depends(QueryDistrictSchema)
+):
+
+    district_service = DistrictService(session)
+    trace_id = get_trace_id(req)
+
+    try:
+        index = await geo_cache.get_index(session)
+        cache_key = ("common/district", index.version, tuple(query.model_dump().items()))
+
+        prepared = reference_response_cache.get(cache_key)
+
+        if prepared is None:
+            districts, next_cursor = await district_service.get_districts(query)
+
+            prepared = prepare_response([DistrictSchema.model_validate(district) for district in districts], next_cursor)
+            reference_response_cache.set(cache_key, prepared)
+
+        return cached_response(req, prepared)
+
+    except (ServerProcessException, SQLProcessException, InvalidInputException) as e:
+        raise APIException(status_code=e.status_code, message=e.message, trace_id=trace_id, data=e.data)
+
+
+@router.get("/sub-district", response_model=Result)
+async def get_sub_districts(
+    req: Request,
+    session: SessionDep,
+    query: QuerySubDistrictSchema = Depends(QuerySubDistrictSchema)
+):
+
+    sub_district_service = SubDistrictService(session)
+    trace_id = get_trace_id(req)
+
+    try:
+        index = await geo_cache.get_index(session)
+        cache_key = ("common/sub-district", index.version, tuple(query.model_dump().items()))
+
+        prepared = reference_response_cache.get(cache_key)
+
+        if prepared is None:
+            sub_districts, next_cursor = await sub_district_service.get_sub_districts(query)
+
+            prepared = prepare_response([SubDistrictSchema.model_validate(sub_district) for sub_district in sub_districts], next_cursor)
+            reference_response_cache.set(cache_key, prepared)
+
+        return cached_response(req, prepared)
+
+    except (ServerProcessException, SQLProcessException, InvalidInputException) as e:
+        raise APIException(status_code=e.status_code, message=e.message, trace_id=trace_id, data=e.data)
+
+
+@router.get("/search", response_model=Result)
+async def search_places(
+    req: Request,
+    session: SessionDep,
+    query: GeoSearchQuerySchema = Depends(GeoSearchQuerySchema)
+):
+
+    geo_search_service = GeoSearchService(session)
+    trace_id = get_trace_id(req)
+
+    try:
+        places = await geo_search_service.search(query)
+
+        return Result(
+            success=True,
+            data=[GeoSearchResultSchema.model_validate(place) for place in places],
+            trace_id=trace_id
+        )
+
+    except (ServerProcessException, SQLProcessException) as e:
+        raise APIException(status_code=e.status_code, message=e.message, trace_id=trace_id, data=e.data)
+
+
+@router.get("/autocomplete", response_model=Result)
+async def autocomplete_places(
+    req: Request,
+    session: SessionDep,
+    query: GeoAutocompleteQuerySchema = Depends(GeoAutocompleteQuerySchema)
+):
+
+    trace_id = get_trace_id(req)
+
+    try:
+        places = await geo_autocomplete.complete(session, query.q, query.k, query.type)
+
+        return Result(
+            success=True,
+            data=[GeoPlaceSchema.model_validate(place) for place in places],
+            trace_id=trace_id
+        )
+
+    except (ServerProcessException, SQLProcessException) as e:
+        raise APIException(status_code=e.status_code, message=e.message, trace_id=trace_id, data=e.data)
+
+
+@router.get("/reverse-geocode", response_model=Result)
+async def reverse_geocode(
+    req: Request,
+    session: SessionDep,
+    query: GeoPointQuerySchema = Depends(GeoPointQuerySchema)
+):
+
+    trace_id = get_trace_id(req)
+
+    try:
+        places = await geo_spatial.nearby(session, query.lat, query.lon, k=1, lang=query.type)
+
+        if not places or places[0]["distance_km"] > settings.GEO_REVERSE_GEOCODE_MAX_KM:
+            raise APIException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                message="ไม่พบตำบลในบริเวณพิกัดที่ระบุ",
+                trace_id=trace_id
+            )
+
+        return Result(
+            success=True,
+            data=GeoNearbyResultSchema.model_validate(places[0]),
+            trace_id=trace_id
+        )
+
+    except (ServerProcessException, SQLProcessException) as e:
+        raise APIException(status_code=e.status_code, message=e.message, trace_id=trace_id, data=e.data)
+
+
+@router.get("/nearby", response_model=Result)
+async def nearby_places(
+    req: Request,
+    session: SessionDep,
+    query: GeoNearbyQuerySchema = Depends(GeoNearbyQuerySchema)
+):
+
+    trace_id = get_trace_id(req)
+
+    try:
+        places = await geo_spatial.nearby(session, query.lat, query.lon, k=query.k, lang=query.type)
+
+        return Result(
+            success=True,
+            data=[GeoNearbyResultSchema.model_validate(place) for place in places],
+            trace_id=trace_id
+        )
+
     except (ServerProcessException, SQLProcessException) as e:
         raise APIException(status_code=e.status_code, message=e.message, trace_id=trace_id, data=e.data)
-    
\ No newline at end of file
@@ -0,0 +1,91 @@
+from fastapi import APIRouter, Depends, Request
+
+from app.schemas.report_schema import DatasetExportQuerySchema, FarmExportQuerySchema, SummaryExportQuerySchema
+from app.services.export_service import FARM_EXPORT_COLUMNS, ExportService, dataset_columns, dataset_types, summary_export_columns
+from app.services.report_service import parse_group_by
+from app.api.deps import async_session_maker, get_current_user, get_trace_id
+from app.utilities.app_exceptions import APIException, InvalidInputException, ServerProcessException
+from app.utilities.app_export import arrow_stream, export_response, export_stream, load_pyarrow, load_workbook_class
+
+router = APIRouter(prefix="/export", tags=["export"], dependencies=[Depends(get_current_user)])
+
+# แต่ละ export เปิด session ของตัวเอง เพราะ StreamingResponse อ่านแถวต่อหลังจาก session ของคำขอถูกปิดแล้ว
+
+@router.get("/rubber-farm")
+async def export_rubber_farms(
+    req: Request,
+    query: FarmExportQuerySchema = Depends(FarmExportQuerySchema)
+):
+    trace_id = get_trace_id(req)
+
+    try:
+        if query.format == "xlsx":
+            load_workbook_class()
+
+    except ServerProcessException as e:
+        raise APIException(status_code=e.status_code, message=e.message, trace_id=trace_id, data=e.data)
+
+    async def rows():
+        async with async_session_maker() as session:
+            async for row in ExportService(session).farm_rows(query):
+                yield row
+
+    return export_response(
+        query.format,
+        export_stream(query.format, FARM_EXPORT_COLUMNS, rows(), sheet_title="rubber-farm"),
+        "rubber-farm"
+    )
+
+
+@router.get("/rubber-farm/summary")
+async def export_rubber_farm_summary(
+    req: Request,
+    query: SummaryExportQuerySchema = Depends(SummaryExportQuerySchema)
+):
+    trace_id = get_trace_id(req)
+
+    try:
+        groups = parse_group_by(query.group_by)
+
+        if query.format == "xlsx":
+            load_workbook_class()
+
+    except (InvalidInputException, ServerProcessException) as e:
+        raise APIException(status_code=e.status_code, message=e.message, trace_id=trace_id, data=e.data)
+
+    async def rows():
+        async with async_session_maker() as session:
+            async for row in ExportService(session).summary_rows(query):
+                yield row
+
+    return export_response(
+        query.format,
+        export_stream(query.format, summary_export_columns(groups), rows(), sheet_title="rubber-farm-summary"),
+        "rubber-farm-summary"
+    )
+
+
+@router.get("/rubber-farm/dataset")
+async def export_rubber_farm_dataset(
+    req: Request,
+    query: DatasetExportQuerySchema = Depends(DatasetExportQuerySchema)
+):
+    trace_id = get_trace_id(req)
+
+    try:
+        names = dataset_columns(query.columns)
+        load_pyarrow()
+
+    except (InvalidInputException, ServerProcessException) as e:
+        raise APIException(status_code=e.status_code, message=e.message, trace_id=trace_id, data=e.data)
+
+    async def batches():
+        async with async_session_maker() as session:
+            async for batch in ExportService(session).dataset_batches(query, names):
+                yield batch
+
+    return export_response(
+        query.format,
+        arrow_stream(query.format, dataset_types(names), batches()),
+        "rubber-farm-dataset"
+    )
@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, Request
+
+from app.schemas import Result
+from app.schemas.geo_schema import MapClusterQuerySchema, MapClusterSchema
+from app.services.map_cluster_service import MapClusterService
+from app.api.deps import get_trace_id, SessionDep
+from app.utilities.app_exceptions import APIException, InvalidInputException, SQLProcessException, ServerProcessException
+
+
+router = APIRouter(prefix="/map", tags=["map"])
+
+@router.get("/clusters", response_model=Result)
+async def get_map_clusters(
+    req: Request,
+    session: SessionDep,
+    query: MapClusterQuerySchema = Depends(MapClusterQuerySchema)
+):
+    map_cluster_service = MapClusterService(session)
+    trace_id = get_trace_id(req)
+
+    try:
+        clusters = await map_cluster_service.get_clusters(query)
+
+        return Result(
+            success=True,
+            data=[MapClusterSchema.model_validate(cluster) for cluster in clusters],
+            trace_id=trace_id
+        )
+
+    except (InvalidInputException, SQLProcessException, ServerProcessException) as e:
+        raise APIException(status_code=e.status_code, message=e.message, trace_id=trace_id, data=e.data)
@@ -1,12 +1,13 @@
-from fastapi import APIRouter, Depends, Request, status
+from fastapi import APIRouter, BackgroundTasks, Depends, Request, status
 
-from app.schemas import ProductPredictSchema, SuitablePredictSchema, Result
-from app.services.district_service import DistrictService
+from app.schemas import ProductBatchPredictSchema, ProductPredictSchema, SuitableBatchPredictSchema, SuitablePredictSchema, Result
+from app.schemas.predict_schema import SuitabilityMapQuerySchema, SuitabilityMapSchema
+from app.services.geo_cache import geo_cache
 from app.services.predict_service import PredictService
-from app.api.deps import SessionDep, get_current_user, get_trace_id
-from app.services.province_service import ProvinceService
-from app.services.sub_district_service import SubDistrictService
-from app.utilities.app_exceptions import APIException, DuplicateResourceException, ResourceNotFoundException, SQLProcessException, ServerProcessException
+from app.api.deps import SessionDep, async_engine, async_session_maker, get_current_admin, get_current_user, get_trace_id
+from app.core.job_lock import SUITABILITY_MAP_JOB, is_job_running, job_lock
+from app.services.suitability_map_service import SuitabilityMapService
+from app.utilities.app_exceptions import APIException, DuplicateResourceException, InvalidInputException, ResourceNotFoundException, SQLProcessException, ServerProcessException
 
 router = APIRouter(prefix="/predict", tags=["predict"], dependencies=[Depends(get_current_user)])
 result = Result()
@@ -17,31 +18,22 @@ async def predict_product(
     session: SessionDep, 
     user_input: ProductPredictSchema
 ):
-    province_service = ProvinceService(session)
-    district_service = DistrictService(session)
-    sub_district_service = SubDistrictService(session)
     predict_service = PredictService(session)
 
     trace_id = get_trace_id(req)
 
     try:
 
-        province = await province_service._get_province_by_code(user_input.province)
-        district = await district_service._get_district_by_code(user_input.district)
-        subdistrict = await sub_district_service._get_sub_district_by_code(user_input.subdistrict)
+        geo = await geo_cache.resolve(session, user_input.province, user_input.district, user_input.subdistrict)
 
-        if not province or not district or not subdistrict:
+        if not geo:
             raise APIException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 message="กรุณากรอกข้อมูลให้ถูกต้อง",
                 trace_id=trace_id
             )
-        
-        user_input.district = district.name_th
-        user_input.province = province.name_th
-        user_input.subdistrict = subdistrict.name_th
 
-        payload = predict_service.get_product(user_input)
+        payload = await predict_service.get_product(user_input)
 
         return Result(
             success=True,
@@ -49,12 +41,12 @@ async def predict_product(
             trace_id=trace_id
         )
     
-    except (ServerProcessException, SQLProcessException) as e:
+    except (ServerProcessException, SQLProcessException, InvalidInputException) as e:
         raise APIException(status_code=e.status_code, message=e.message, trace_id=trace_id, data=e.data)
     
 
 @router.post("/suitability", response_model=Result)
-def predict_suitability(
+async def predict_suitability(
     session: SessionDep,
     req: Request, 
     user_input: SuitablePredictSchema):
@@ -63,7 +55,7 @@ def predict_suitability(
     trace_id = get_trace_id(req)
 
     try:
-        payload = predict_service.get_suitable(user_input)
+        payload = await predict_service.get_suitable(user_input)
 
         return Result(
             success=True,
@@ -71,5 +63,145 @@ def predict_suitability(
             trace_id=trace_id
         )
      
+    except (ServerProcessException, SQLProcessException, InvalidInputException) as e:
+        raise APIException(status_code=e.status_code, message=e.message, trace_id=trace_id, data=e.data)
+
+
+@router.post("/product/batch", response_model=Result)
+async def predict_product_batch(
+    req: Request,
+    session: SessionDep,
+    user_input: ProductBatchPredictSchema
+):
+    predict_service = PredictService(session)
+
+    trace_id = get_trace_id(req)
+
+    try:
+        items = user_input.items
+
+        geos = [
+            await geo_cache.resolve(session, item.province, item.district, item.subdistrict)
+            for item in items
+        ]
+
+        invalid_items = [index for index, geo in enumerate(geos) if not geo]
+
+        if invalid_items:
+            raise APIException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                message="กรุณากรอกข้อมูลให้ถูกต้อง",
+                trace_id=trace_id,
+                data={"invalid_items": invalid_items}
+            )
+
+        payload = await predict_service.get_product_batch(items)
+
+        return Result(
+            success=True,
+            data=payload,
+            trace_id=trace_id
+        )
+
+    except (ServerProcessException, SQLProcessException, InvalidInputException) as e:
+        raise APIException(status_code=e.status_code, message=e.message, trace_id=trace_id, data=e.data)
+
+
+@router.post("/suitability/batch", response_model=Result)
+async def predict_suitability_batch(
+    session: SessionDep,
+    req: Request,
+    user_input: SuitableBatchPredictSchema):
+
+    predict_service = PredictService(session)
+    trace_id = get_trace_id(req)
+
+    try:
+        payload = await predict_service.get_suitable_batch(user_input.items)
+
+        return Result(
+            success=True,
+            data=payload,
+            trace_id=trace_id
+        )
+
+    except (ServerProcessException, SQLProcessException, InvalidInputException) as e:
+        raise APIException(status_code=e.status_code, message=e.message, trace_id=trace_id, data=e.data)
+
+
+@router.get("/cache", response_model=Result)
+async def get_predict_cache_stats(
+    req: Request,
+    session: SessionDep
+):
+    predict_service = PredictService(session)
+
+    return Result(
+        success=True,
+        data=predict_service.cache_stats(),
+        trace_id=get_trace_id(req)
+    )
+
+
+async def rebuild_suitability_map(year: int | None = None):
+    """
+    Background job: rebuild the suitability map with its own database session
+    """
+
+    # กันการคำนวณซ้อนกัน (รวมถึงคำขอที่เข้ามาพร้อมกันบน worker อื่น)
+    async with job_lock(async_engine, SUITABILITY_MAP_JOB) as acquired:
+        if not acquired:
+            return
+
+        async with async_session_maker() as session:
+            await SuitabilityMapService(session).rebuild(year=year)
+
+
+@router.get("/suitability/map", response_model=Result)
+async def get_suitability_map(
+    req: Request,
+    session: SessionDep,
+    query: SuitabilityMapQuerySchema = Depends(SuitabilityMapQuerySchema)
+):
+    suitability_map_service = SuitabilityMapService(session)
+    trace_id = get_trace_id(req)
+
+    try:
+        rows = await suitability_map_service.get_map(query)
+
+        return Result(
+            success=True,
+            data=[SuitabilityMapSchema.model_validate(row) for row in rows],
+            trace_id=trace_id
+        )
+
     except (ServerProcessException, SQLProcessException) as e:
-        raise APIException(status_code=e.status_code, message=e.message, trace_id=trace_id, data=e.data)
\ No newline at end of file
+        raise APIException(status_code=e.status_code, message=e.message, trace_id=trace_id, data=e.data)
+
+
+@router.post(
+    "/suitability/map/rebuild",
+    response_model=Result,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(get_current_admin)]
+)
+async def rebuild_suitability_map_job(
+    req: Request,
+    session: SessionDep,
+    background_tasks: BackgroundTasks,
+    year: int | None = None
+):
+    if await is_job_running(session, SUITABILITY_MAP_JOB):
+        raise APIException(
+            status_code=status.HTTP_409_CONFLICT,
+            message="กำลังคำนวณแผนที่ความเหมาะสมอยู่ กรุณารอให้เสร็จก่อน",
+            trace_id=get_trace_id(req)
+        )
+
+    background_tasks.add_task(rebuild_suitability_map, year)
+
+    return Result(
+        success=True,
+        message="เริ่มคำนวณแผนที่ความเหมาะสมแล้ว",
+        trace_id=get_trace_id(req)
+    )
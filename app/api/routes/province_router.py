@@ -1,10 +1,13 @@
 from fastapi import APIRouter, Depends, Request
 
-from app.schemas.geo_schema import ProvinceCreateSchema, ProvinceDetailSchema, ProvinceSchema, QueryGeoSchema
+from app.schemas.geo_schema import ProvinceCreateSchema, ProvinceFarmDetailSchema, ProvinceFarmQuerySchema, ProvinceFarmSchema
 from app.schemas import Result
+from app.core.table_version import get_table_version
+from app.services.geo_cache import geo_cache
 from app.services.province_service import ProvinceService
 from app.api.deps import get_trace_id, SessionDep
 from app.utilities.app_exceptions import APIException, DuplicateResourceException, ResourceNotFoundException, SQLProcessException, ServerProcessException
+from app.utilities.app_response import cached_response, prepare_response, reference_response_cache
 
 
 router = APIRouter(prefix="/province", tags=["province"])
@@ -15,23 +18,35 @@ result = Result()
 async def get_provinces_with_rubber_farms(
     req: Request,
     session: SessionDep,
-    query: QueryGeoSchema = Depends(QueryGeoSchema)
+    query: ProvinceFarmQuerySchema = Depends(ProvinceFarmQuerySchema)
 ):
     province_service = ProvinceService(session)
     trace_id = get_trace_id(req)
     
     try:
-        result.trace_id = trace_id
-        provinces = await province_service.get_provinces_with_rubber_farms(query)
+        index = await geo_cache.get_index(session)
+        cache_key = (
+            "province/rubber-farm",
+            index.version,
+            await get_table_version(session, "RubberFarm"),
+            tuple(query.model_dump().items())
+        )
 
-        if query.detail and query.code:
-            result.data = [ProvinceDetailSchema.model_validate(province) for province in provinces]
-        else:
-            result.data = [ProvinceSchema.model_validate(province) for province in provinces]
-        
-        result.success = True
+        prepared = reference_response_cache.get(cache_key)
 
-        return result
+        if prepared is None:
+            provinces = await province_service.get_provinces_with_rubber_farms(query)
+
+            if query.detail and query.code:
+                data = [ProvinceFarmDetailSchema.model_validate(province) for province in provinces]
+            else:
+                data = [ProvinceFarmSchema.model_validate(province) for province in provinces]
+
+            prepared = prepare_response(data)
+            reference_response_cache.set(cache_key, prepared)
+
+        # จำนวนแปลงยางเปลี่ยนทุกครั้งที่นำเข้า: ให้ client ตรวจ ETag ทุกครั้งแทนการเก็บไว้ 24 ชม.
+        return cached_response(req, prepared, max_age=0)
     
     except (ResourceNotFoundException) as e:
         raise APIException(
@@ -0,0 +1,117 @@
+from fastapi import APIRouter, BackgroundTasks, Depends, Request, status
+
+from app.schemas import Result
+from app.schemas.report_schema import DistributionQuerySchema, DistributionSchema, RubberFarmSummaryQuerySchema, RubberFarmSummarySchema, TrendQuerySchema, TrendSeriesSchema
+from app.services.report_service import ReportService
+from app.services.rollup_service import RubberFarmRollupService
+from app.api.deps import SessionDep, async_engine, async_session_maker, get_current_admin, get_current_user, get_trace_id
+from app.core.job_lock import RUBBER_FARM_ROLLUP_JOB, is_job_running, job_lock
+from app.utilities.app_exceptions import APIException, InvalidInputException, SQLProcessException, ServerProcessException
+
+router = APIRouter(prefix="/report", tags=["report"], dependencies=[Depends(get_current_user)])
+
+@router.get("/rubber-farm/summary", response_model=Result)
+async def get_rubber_farm_summary(
+    req: Request,
+    session: SessionDep,
+    query: RubberFarmSummaryQuerySchema = Depends(RubberFarmSummaryQuerySchema)
+):
+    report_service = ReportService(session)
+    trace_id = get_trace_id(req)
+
+    try:
+        summaries = await report_service.get_rubber_farm_summary(query)
+
+        return Result(
+            success=True,
+            data=[RubberFarmSummarySchema.model_validate(summary) for summary in summaries],
+            trace_id=trace_id
+        )
+
+    except (InvalidInputException, SQLProcessException, ServerProcessException) as e:
+        raise APIException(status_code=e.status_code, message=e.message, trace_id=trace_id, data=e.data)
+
+
+async def rebuild_rubber_farm_rollup():
+    """
+    Background job: rebuild the rubber farm rollups with its own database session
+    """
+
+    # กันการคำนวณซ้อนกัน (รวมถึงคำขอที่เข้ามาพร้อมกันบน worker อื่น)
+    async with job_lock(async_engine, RUBBER_FARM_ROLLUP_JOB) as acquired:
+        if not acquired:
+            return
+
+        async with async_session_maker() as session:
+            await RubberFarmRollupService(session).rebuild()
+
+
+@router.post(
+    "/rollup/rebuild",
+    response_model=Result,
+    status_code=status.HTTP_202_ACCEPTED,
+    dependencies=[Depends(get_current_admin)]
+)
+async def rebuild_rubber_farm_rollup_job(
+    req: Request,
+    session: SessionDep,
+    background_tasks: BackgroundTasks
+):
+    if await is_job_running(session, RUBBER_FARM_ROLLUP_JOB):
+        raise APIException(
+            status_code=status.HTTP_409_CONFLICT,
+            message="กำลังคำนวณตารางสรุปแปลงยางอยู่ กรุณารอให้เสร็จก่อน",
+            trace_id=get_trace_id(req)
+        )
+
+    background_tasks.add_task(rebuild_rubber_farm_rollup)
+
+    return Result(
+        success=True,
+        message="เริ่มคำนวณตารางสรุปแปลงยางแล้ว",
+        trace_id=get_trace_id(req)
+    )
+
+
+@router.get("/trends", response_model=Result)
+async def get_trends(
+    req: Request,
+    session: SessionDep,
+    query: TrendQuerySchema = Depends(TrendQuerySchema)
+):
+    report_service = ReportService(session)
+    trace_id = get_trace_id(req)
+
+    try:
+        series = await report_service.get_trends(query)
+
+        return Result(
+            success=True,
+            data=[TrendSeriesSchema.model_validate(item) for item in series],
+            trace_id=trace_id
+        )
+
+    except (InvalidInputException, SQLProcessException, ServerProcessException) as e:
+        raise APIException(status_code=e.status_code, message=e.message, trace_id=trace_id, data=e.data)
+
+
+@router.get("/distribution", response_model=Result)
+async def get_distribution(
+    req: Request,
+    session: SessionDep,
+    query: DistributionQuerySchema = Depends(DistributionQuerySchema)
+):
+    report_service = ReportService(session)
+    trace_id = get_trace_id(req)
+
+    try:
+        distributions = await report_service.get_distribution(query)
+
+        return Result(
+            success=True,
+            data=[DistributionSchema.model_validate(distribution) for distribution in distributions],
+            trace_id=trace_id
+        )
+
+    except (InvalidInputException, SQLProcessException, ServerProcessException) as e:
+        raise APIException(status_code=e.status_code, message=e.message, trace_id=trace_id, data=e.data)
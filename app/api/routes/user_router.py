@@ -7,7 +7,8 @@ from app.schemas.result import Result
 from app.schemas.user_schema import UserCreateSchema, UserViewSchema
 from app.services.user_service import UserService
 from app.api.deps import get_trace_id, SessionDep, enforcerDep
-from app.utilities.app_exceptions import APIException, DuplicateResourceException, InvalidAuthorizationException, InvalidOutputException, ResourceNotFoundException, SQLProcessException, ServerProcessException
+from app.utilities.app_cursor import next_cursor
+from app.utilities.app_exceptions import APIException, DuplicateResourceException, InvalidAuthorizationException, InvalidInputException, InvalidOutputException, ResourceNotFoundException, SQLProcessException, ServerProcessException
 
 
 router = APIRouter(prefix="/user", tags=["users"])
@@ -38,8 +39,9 @@ async def get_user_all(
             "users": [UserViewSchema.model_validate(user) for user in users],
             "total": len(users),
             "limit": query.limit,
-            "offset": query.offset
+            "offset": query.offset,
         }
+        result.next_cursor = next_cursor(users, query.limit, lambda user: [str(user["id"])])
         
         result.success = True
 
@@ -51,7 +53,7 @@ async def get_user_all(
             trace_id=trace_id
         )
 
-    except (ServerProcessException, SQLProcessException) as e:
+    except (ServerProcessException, SQLProcessException, InvalidInputException) as e:
         raise APIException(
             status_code=e.status_code, 
             message=e.message, 
@@ -40,6 +40,68 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = ""
     PREDICT_API_URL: str
 
+    # Config for the prediction models (TF-Serving version and matching encoder files)
+    PREDICT_PRODUCT_MODEL_VERSION: int = 3
+    PREDICT_SUITABILITY_MODEL_VERSION: int = 3
+
+    # Config for the prediction API client (timeouts in seconds)
+    PREDICT_API_CONNECT_TIMEOUT: float = 5.0
+    PREDICT_API_READ_TIMEOUT: float = 30.0
+    PREDICT_API_POOL_TIMEOUT: float = 5.0
+    PREDICT_API_MAX_CONNECTIONS: int = 100
+    PREDICT_API_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    PREDICT_API_KEEPALIVE_EXPIRY: float = 30.0
+
+    # Config for the batch prediction endpoints
+    PREDICT_BATCH_MAX_ITEMS: int = 5000
+    PREDICT_BATCH_CHUNK_SIZE: int = 256
+
+    # Config for micro-batching concurrent single predictions (0 ms disables it)
+    PREDICT_MICROBATCH_WINDOW_MS: float = 5.0
+    PREDICT_MICROBATCH_MAX_SIZE: int = 64
+
+    # Config for the prediction result cache (0 entries disables it)
+    PREDICT_CACHE_SIZE: int = 10000
+    PREDICT_CACHE_TTL_SECONDS: float = 3600
+
+    # Config for the precomputed suitability map (no slope data is stored, so a fixed slope is assumed)
+    SUITABILITY_MAP_BATCH_SIZE: int = 1000
+    SUITABILITY_MAP_DEFAULT_SLOPE: int = 15
+
+    # Config for the pre-serialized reference data responses (geo endpoints)
+    GEO_RESPONSE_CACHE_SIZE: int = 512
+    GEO_RESPONSE_MAX_AGE: int = 86400
+
+    # Config for the in-memory geo tree (seconds between background checks of the shared table versions)
+    GEO_VERSION_POLL_SECONDS: float = 5.0
+
+    # Config for the in-memory place name autocomplete (completions kept per trie node)
+    GEO_AUTOCOMPLETE_TOP_K: int = 20
+
+    # Config for the sub-district spatial grid (cell size in degrees) and reverse geocoding
+    GEO_GRID_CELL_DEGREES: float = 0.1
+    GEO_REVERSE_GEOCODE_MAX_KM: float = 30.0
+    GEO_NEARBY_MAX_K: int = 50
+
+    # Config for the map clusters (grid cells per tile side, tiles per request, cached tiles)
+    MAP_CLUSTER_CELLS_PER_TILE: int = 8
+    MAP_CLUSTER_MAX_ZOOM: int = 20
+    MAP_CLUSTER_MAX_TILES: int = 64
+    MAP_CLUSTER_CACHE_SIZE: int = 4096
+    MAP_CLUSTER_CACHE_TTL_SECONDS: float = 3600
+
+    # Config for the file exports (rows fetched per server-side cursor batch, bytes per streamed chunk, rows per XLSX file)
+    EXPORT_BATCH_SIZE: int = 2000
+    EXPORT_CHUNK_BYTES: int = 65536
+    EXPORT_XLSX_MAX_ROWS: int = 200000
+
+    # Config for the in-memory NumPy snapshot of the rubber farms (rebuilt in the background after imports)
+    ANALYTICS_SNAPSHOT_ENABLED: bool = False
+
+    # Config for the report result cache (entries also expire when a table they read changes; 0 entries disables it)
+    REPORT_CACHE_SIZE: int = 512
+    REPORT_CACHE_TTL_SECONDS: float = 3600
+
     # Config for the first superuser (info: superuser is a user with all permissions)
     FIRST_SUPERUSER: str
     FIRST_SUPERUSER_EMAIL: str
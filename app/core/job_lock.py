@@ -0,0 +1,58 @@
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from sqlalchemy import func, text
+from sqlalchemy.sql import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+logger = logging.getLogger(__name__)
+
+# คีย์ advisory lock ของงานเบื้องหลังที่ต้องรันได้ครั้งละหนึ่งงาน (ทุก worker)
+SUITABILITY_MAP_JOB = 7001
+RUBBER_FARM_ROLLUP_JOB = 7002
+
+
+async def is_job_running(session: AsyncSession, key: int) -> bool:
+    """
+    ตรวจว่ามี connection ใดถือ advisory lock ของงานนี้อยู่หรือไม่ \n
+    Whether any connection, from any worker, currently holds the job's advisory lock.
+    """
+
+    # pg_locks เก็บคีย์ bigint เป็น classid (32 บิตบน) และ objid (32 บิตล่าง) โดย objsubid = 1
+    stmt = text(
+        "SELECT EXISTS (SELECT 1 FROM pg_locks WHERE locktype = 'advisory' "
+        "AND classid = 0 AND objid = :key AND objsubid = 1 AND granted)"
+    )
+
+    return bool(await session.scalar(stmt, {"key": key}))
+
+
+@asynccontextmanager
+async def job_lock(engine: AsyncEngine, key: int) -> AsyncIterator[bool]:
+    """
+    ถือ advisory lock ของงานไว้ตลอดบล็อก คืนค่า False ถ้างานเดียวกันกำลังรันอยู่ \n
+    Hold the job's advisory lock for the block; yields False when the same
+    job is already running elsewhere.
+
+    #### Description
+        lock อยู่บน connection แยกแบบ AUTOCOMMIT ที่ไม่ถูกคืนเข้า pool ระหว่างงาน
+        งานจึง commit ผ่าน session ของตนเองได้ตามปกติ \n
+        The lock lives on a dedicated AUTOCOMMIT connection that stays checked
+        out for the whole job without holding a transaction open, so the job
+        can commit through its own sessions freely.
+    """
+
+    # AUTOCOMMIT: advisory lock ระดับ session ไม่ต้องการ transaction และ connection จะไม่ค้างสถานะ
+    # "idle in transaction" ตลอดงาน (ซึ่งขวาง vacuum และอาจโดน idle_in_transaction_session_timeout)
+    async with engine.execution_options(isolation_level="AUTOCOMMIT").connect() as conn:
+        acquired = bool(await conn.scalar(select(func.pg_try_advisory_lock(key))))
+
+        if not acquired:
+            logger.info("Job %d is already running, skipped", key)
+
+        try:
+            yield acquired
+
+        finally:
+            if acquired:
+                await conn.scalar(select(func.pg_advisory_unlock(key)))
@@ -0,0 +1,45 @@
+import httpx
+
+from app.core.config import settings
+
+_predict_client: httpx.AsyncClient | None = None
+
+
+def get_predict_client() -> httpx.AsyncClient:
+    """
+    Return the shared async HTTP client for the prediction API (TF-Serving)
+
+    The client keeps a keep-alive connection pool, so every prediction reuses
+    an open connection instead of opening a new one per request.
+    """
+    global _predict_client
+
+    if _predict_client is None or _predict_client.is_closed:
+        _predict_client = httpx.AsyncClient(
+            base_url=settings.PREDICT_API_URL,
+            headers={"Content-Type": "application/json"},
+            timeout=httpx.Timeout(
+                connect=settings.PREDICT_API_CONNECT_TIMEOUT,
+                read=settings.PREDICT_API_READ_TIMEOUT,
+                write=settings.PREDICT_API_READ_TIMEOUT,
+                pool=settings.PREDICT_API_POOL_TIMEOUT,
+            ),
+            limits=httpx.Limits(
+                max_connections=settings.PREDICT_API_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.PREDICT_API_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.PREDICT_API_KEEPALIVE_EXPIRY,
+            ),
+        )
+
+    return _predict_client
+
+
+async def close_predict_client() -> None:
+    """
+    Close the shared prediction API client and its connection pool
+    """
+    global _predict_client
+
+    if _predict_client is not None:
+        await _predict_client.aclose()
+        _predict_client = None
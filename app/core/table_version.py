@@ -0,0 +1,44 @@
+from sqlalchemy import func
+from sqlalchemy.sql import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import TableVersion
+
+
+async def bump_table_version(session: AsyncSession, *tables: str) -> None:
+    """
+    เพิ่มเลขรุ่นของตาราง ภายใน transaction เดียวกับการแก้ไขข้อมูล (เรียกก่อน commit) \n
+    Increment the shared version of each table inside the session's
+    transaction, so the bump commits or rolls back together with the write.
+    Call it before `commit()`.
+    """
+
+    # เรียงชื่อตาราง ให้ทุก transaction ล็อกแถวในลำดับเดียวกัน
+    names = sorted(set(tables))
+
+    if not names:
+        return
+
+    stmt = insert(TableVersion).values([{"table_name": name, "version": 1} for name in names])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TableVersion.table_name],
+        set_={"version": TableVersion.version + 1, "updated_at": func.now()},
+    )
+
+    await session.execute(stmt)
+
+
+async def get_table_version(session: AsyncSession, *tables: str) -> tuple[int, ...]:
+    """
+    คืนค่าเลขรุ่นของตารางที่ระบุจากฐานข้อมูล ใช้เป็นส่วนหนึ่งของ key ของแคช \n
+    Return the shared versions of the given tables, for use in cache keys.
+    Read from Postgres on every call, so all workers see the same versions.
+    """
+
+    rows = await session.execute(
+        select(TableVersion.table_name, TableVersion.version).where(TableVersion.table_name.in_(tables))
+    )
+    versions = dict(rows.all())
+
+    return tuple(versions.get(table, 0) for table in tables)
@@ -1,3 +1,5 @@
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
@@ -5,11 +7,45 @@ from starlette.middleware.authentication import AuthenticationMiddleware
 
 from app.core.auth import JWTAuthBackend
 from app.core.config import settings
+from app.api.deps import async_engine, async_session_maker
 from app.api.main import get_api_router
 from app.core.middleware import CasbinMiddleware, TraceIDMiddleware
+from app.core.predict_client import close_predict_client, get_predict_client
+from app.services.encoder_index import product_encoder_index
+from app.services.farm_snapshot import farm_snapshot
+from app.services.geo_autocomplete import geo_autocomplete
+from app.services.geo_spatial import geo_spatial
+from app.services.model_registry import model_registry
 from app.utilities.app_config import auth_exception_handler, exception_handler
 from app.utilities.app_exceptions import APIException
 
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Load shared resources on startup and release them on shutdown
+    """
+
+    model_registry.load()
+    get_predict_client()
+
+    try:
+        async with async_session_maker() as session:
+            await product_encoder_index.get(session)
+            await geo_autocomplete.get(session)
+            await geo_spatial.get(session)
+    except Exception as e:
+        # ยังใช้งานได้ ดัชนีจะถูกสร้างเมื่อมีคำขอครั้งแรก
+        logger.warning("In-memory indexes not built on startup: %s", e)
+
+    farm_snapshot.schedule_refresh(async_engine)
+
+    yield
+
+    await close_predict_client()
+
+
 def get_app() -> FastAPI:
     
     """
@@ -21,6 +57,7 @@ def get_app() -> FastAPI:
         openapi_url=f"{settings.API_V1_STR}/openapi.json",
         default_response_class=ORJSONResponse,
         debug=settings.DEBUG,
+        lifespan=lifespan,
     )
 
     app.add_exception_handler(APIException, exception_handler)
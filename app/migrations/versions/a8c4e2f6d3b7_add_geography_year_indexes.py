@@ -0,0 +1,31 @@
+"""add geography year indexes
+
+Revision ID: a8c4e2f6d3b7
+Revises: f2b6d8a4c1e9
+Create Date: 2026-10-18 18:11:26.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8c4e2f6d3b7'
+down_revision: Union[str, None] = 'f2b6d8a4c1e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'idx_weather_geography_province_year', 'WeatherGeography', ['province_id', 'year'], unique=False,
+        postgresql_include=['rainfall_mm', 'average_temperature', 'average_humidity', 'rainy_day_count']
+    )
+    op.create_index('idx_soil_geography_subdistrict_year', 'SoilGeography', ['subdistrict_id', 'year'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_soil_geography_subdistrict_year', table_name='SoilGeography')
+    op.drop_index('idx_weather_geography_province_year', table_name='WeatherGeography')
@@ -0,0 +1,52 @@
+"""add suitability map table
+
+Revision ID: b1d4e7a2c9f3
+Revises: 3604581f4468
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b1d4e7a2c9f3'
+down_revision: Union[str, None] = '3604581f4468'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('SuitabilityMap',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('subdistrict_id', sa.Integer(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('rainfall_mm', sa.Float(), nullable=True),
+    sa.Column('average_temperature', sa.Float(), nullable=True),
+    sa.Column('average_humidity', sa.Float(), nullable=True),
+    sa.Column('rainy_day_count', sa.Integer(), nullable=True),
+    sa.Column('ph_top', sa.String(length=50), nullable=True),
+    sa.Column('slope', sa.Integer(), nullable=False),
+    sa.Column('temperature_level', sa.SmallInteger(), nullable=False),
+    sa.Column('humidity_level', sa.SmallInteger(), nullable=False),
+    sa.Column('rainfall_level', sa.SmallInteger(), nullable=False),
+    sa.Column('rainfall_days_level', sa.SmallInteger(), nullable=False),
+    sa.Column('slope_level', sa.SmallInteger(), nullable=False),
+    sa.Column('ph_top_level', sa.SmallInteger(), nullable=False),
+    sa.Column('rule_score', sa.SmallInteger(), nullable=False),
+    sa.Column('suitability', sa.SmallInteger(), nullable=True),
+    sa.Column('confidence', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['subdistrict_id'], ['SubDistrict.code'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('subdistrict_id', 'year', name='uq_suitability_map_subdistrict_year')
+    )
+    op.create_index('idx_suitability_map_rank', 'SuitabilityMap', ['year', 'suitability', 'rule_score'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_suitability_map_rank', table_name='SuitabilityMap')
+    op.drop_table('SuitabilityMap')
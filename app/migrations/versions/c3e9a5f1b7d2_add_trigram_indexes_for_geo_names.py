@@ -0,0 +1,43 @@
+"""add trigram indexes for geo names
+
+Revision ID: c3e9a5f1b7d2
+Revises: b1d4e7a2c9f3
+Create Date: 2026-10-18 13:20:11.402817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e9a5f1b7d2'
+down_revision: Union[str, None] = 'b1d4e7a2c9f3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRIGRAM_INDEXES = [
+    ('idx_province_name_th_trgm', 'Province', 'name_th'),
+    ('idx_province_name_en_trgm', 'Province', 'name_en'),
+    ('idx_district_name_th_trgm', 'District', 'name_th'),
+    ('idx_district_name_en_trgm', 'District', 'name_en'),
+    ('idx_subdistrict_name_th_trgm', 'SubDistrict', 'name_th'),
+    ('idx_subdistrict_name_en_trgm', 'SubDistrict', 'name_en'),
+]
+
+
+def upgrade() -> None:
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+
+    for index_name, table_name, column in TRIGRAM_INDEXES:
+        op.create_index(
+            index_name, table_name, [column], unique=False,
+            postgresql_using='gin', postgresql_ops={column: 'gin_trgm_ops'}
+        )
+
+
+def downgrade() -> None:
+    for index_name, table_name, _ in reversed(TRIGRAM_INDEXES):
+        op.drop_index(index_name, table_name=table_name)
@@ -0,0 +1,32 @@
+"""add table version table
+
+Revision ID: c7e1f4a9b2d6
+Revises: a8c4e2f6d3b7
+Create Date: 2026-10-19 09:42:17.318254
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7e1f4a9b2d6'
+down_revision: Union[str, None] = 'a8c4e2f6d3b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('TableVersion',
+    sa.Column('table_name', sa.String(length=100), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('TableVersion')
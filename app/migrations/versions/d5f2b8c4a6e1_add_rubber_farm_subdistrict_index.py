@@ -0,0 +1,26 @@
+"""add rubber farm subdistrict index
+
+Revision ID: d5f2b8c4a6e1
+Revises: c3e9a5f1b7d2
+Create Date: 2026-10-18 15:02:37.559104
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f2b8c4a6e1'
+down_revision: Union[str, None] = 'c3e9a5f1b7d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_rubber_farm_subdistrict', 'RubberFarm', ['subdistrict_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_rubber_farm_subdistrict', table_name='RubberFarm')
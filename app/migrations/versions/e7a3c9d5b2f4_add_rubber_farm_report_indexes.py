@@ -0,0 +1,30 @@
+"""add rubber farm report indexes
+
+Revision ID: e7a3c9d5b2f4
+Revises: d5f2b8c4a6e1
+Create Date: 2026-10-18 16:20:11.284513
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7a3c9d5b2f4'
+down_revision: Union[str, None] = 'd5f2b8c4a6e1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('idx_rubber_farm_rubber_type', 'RubberFarm', ['rubber_type_id'], unique=False)
+    op.create_index('idx_rubber_farm_soil', 'RubberFarm', ['soil_id'], unique=False)
+    op.create_index('idx_rubber_farm_weather', 'RubberFarm', ['weather_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_rubber_farm_weather', table_name='RubberFarm')
+    op.drop_index('idx_rubber_farm_soil', table_name='RubberFarm')
+    op.drop_index('idx_rubber_farm_rubber_type', table_name='RubberFarm')
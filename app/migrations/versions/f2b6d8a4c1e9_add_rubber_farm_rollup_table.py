@@ -0,0 +1,73 @@
+"""add rubber farm rollup table
+
+Revision ID: f2b6d8a4c1e9
+Revises: e7a3c9d5b2f4
+Create Date: 2026-10-18 17:05:48.630271
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b6d8a4c1e9'
+down_revision: Union[str, None] = 'e7a3c9d5b2f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# คอลัมน์รหัสพื้นที่ของแต่ละระดับ สำหรับเติมตารางสรุปจากแปลงยางที่มีอยู่แล้ว
+ROLLUP_LEVELS = {
+    'geography': 'p.geography_id',
+    'province': 'd.province_id',
+    'district': 's.district_id',
+    'subdistrict': 'f.subdistrict_id',
+}
+
+METRICS = ('rubber_area', 'rubber_tree_count', 'rubber_tree_age', 'dry_rubber_content')
+
+
+def upgrade() -> None:
+    op.create_table('RubberFarmRollup',
+    sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+    sa.Column('level', sa.String(length=20), nullable=False),
+    sa.Column('geo_code', sa.Integer(), nullable=False),
+    sa.Column('rubber_type_id', sa.Integer(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('farm_count', sa.BigInteger(), nullable=False),
+    *[
+        column
+        for metric in METRICS
+        for column in (
+            sa.Column(f'{metric}_sum', sa.Float(), nullable=False),
+            sa.Column(f'{metric}_count', sa.BigInteger(), nullable=False),
+        )
+    ],
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['rubber_type_id'], ['RubberType.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('level', 'geo_code', 'rubber_type_id', 'year', name='uq_rubber_farm_rollup_key')
+    )
+    op.create_index('idx_rubber_farm_rollup_level_year', 'RubberFarmRollup', ['level', 'year'], unique=False)
+
+    metric_columns = ', '.join(f'{metric}_sum, {metric}_count' for metric in METRICS)
+    metric_values = ', '.join(f'COALESCE(SUM(f.{metric}), 0), COUNT(f.{metric})' for metric in METRICS)
+
+    for level, geo_code in ROLLUP_LEVELS.items():
+        op.execute(f'''
+            INSERT INTO "RubberFarmRollup" (level, geo_code, rubber_type_id, year, farm_count, {metric_columns})
+            SELECT '{level}', {geo_code}, f.rubber_type_id, w.year, COUNT(*), {metric_values}
+            FROM "RubberFarm" f
+            JOIN "SubDistrict" s ON s.code = f.subdistrict_id
+            JOIN "District" d ON d.code = s.district_id
+            JOIN "Province" p ON p.code = d.province_id
+            JOIN "WeatherGeography" w ON w.id = f.weather_id
+            GROUP BY {geo_code}, f.rubber_type_id, w.year
+        ''')
+
+
+def downgrade() -> None:
+    op.drop_index('idx_rubber_farm_rollup_level_year', table_name='RubberFarmRollup')
+    op.drop_table('RubberFarmRollup')
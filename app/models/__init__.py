@@ -16,6 +16,9 @@ from app.models.rubbertype import RubberType
 from app.models.soiltype import SoilType
 from app.models.casbin_rule import CasbinRule
 from app.models.module import Module
+from app.models.suitabilitymap import SuitabilityMap
+from app.models.rubberfarmrollup import RubberFarmRollup
+from app.models.tableversion import TableVersion
 
 
 __all__ = [
@@ -38,4 +41,7 @@ __all__ = [
     "SoilType",
     "CasbinRule",
     "Module",
+    "SuitabilityMap",
+    "RubberFarmRollup",
+    "TableVersion",
 ]
@@ -16,6 +16,8 @@ class District(SQLModel):
     __table_args__ = (
         Index("idx_district_name_th", "name_th"),
         Index("idx_district_name_en", "name_en"),
+        Index("idx_district_name_th_trgm", "name_th", postgresql_using="gin", postgresql_ops={"name_th": "gin_trgm_ops"}),
+        Index("idx_district_name_en_trgm", "name_en", postgresql_using="gin", postgresql_ops={"name_en": "gin_trgm_ops"}),
     )
 
     # Relationships
@@ -1,5 +1,5 @@
 from typing import Optional
-from sqlalchemy import Column, Integer, Float, ForeignKey, String
+from sqlalchemy import Column, Index, Integer, Float, ForeignKey, String
 from sqlalchemy.orm import mapped_column, Mapped, relationship
 
 from app.models.base import SQLModel
@@ -19,6 +19,13 @@ class RubberFarm(SQLModel):
     document_type: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
     citizen_id: Mapped[Optional[str]] = mapped_column(String(14), nullable=True)
 
+    # Indexes
+    __table_args__ = (
+        Index("idx_rubber_farm_subdistrict", "subdistrict_id"),
+        Index("idx_rubber_farm_rubber_type", "rubber_type_id"),
+        Index("idx_rubber_farm_soil", "soil_id"),
+        Index("idx_rubber_farm_weather", "weather_id"),
+    )
 
     # Relationships
     soil: Mapped["SoilGeography"] = relationship("SoilGeography", back_populates="rubber_farms")
@@ -0,0 +1,39 @@
+from sqlalchemy import BigInteger, Float, ForeignKey, Index, Integer, String, UniqueConstraint
+from sqlalchemy.orm import mapped_column, Mapped
+
+from app.models.base import SQLModel
+
+class RubberFarmRollup(SQLModel):
+    """
+    ตารางสรุปข้อมูลแปลงยางล่วงหน้า ต่อระดับพื้นที่ × พันธุ์ยาง × ปี \n
+    Pre-aggregated rubber farm statistics per geo level × rubber type × year
+
+    #### Description
+        level คือ "geography", "province", "district" หรือ "subdistrict" และ geo_code คือรหัสของพื้นที่ระดับนั้น
+        เก็บผลรวมและจำนวนค่าที่ไม่เป็น NULL ของแต่ละคอลัมน์ เพื่อให้บวก/ลบค่าที่เปลี่ยน (delta) ได้
+        และคำนวณค่าเฉลี่ยได้ถูกต้อง \n
+        Each metric keeps its sum and its non-null count, so writes can add or
+        subtract deltas and averages stay exact (sum / count).
+    """
+
+    __tablename__ = "RubberFarmRollup"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    level: Mapped[str] = mapped_column(String(20), nullable=False)
+    geo_code: Mapped[int] = mapped_column(Integer, nullable=False)
+    rubber_type_id: Mapped[int] = mapped_column(Integer, ForeignKey("RubberType.id"), nullable=False)
+    year: Mapped[int] = mapped_column(Integer, nullable=False)
+    farm_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    rubber_area_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    rubber_area_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    rubber_tree_count_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    rubber_tree_count_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    rubber_tree_age_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    rubber_tree_age_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    dry_rubber_content_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0)
+    dry_rubber_content_count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("level", "geo_code", "rubber_type_id", "year", name="uq_rubber_farm_rollup_key"),
+        Index("idx_rubber_farm_rollup_level_year", "level", "year"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, ForeignKey, String
+from sqlalchemy import Index, Integer, ForeignKey, String
 from sqlalchemy.orm import mapped_column, Mapped, relationship
 from typing import List
 
@@ -16,6 +16,11 @@ class SoilGeography(SQLModel):
     ph_low: Mapped[str] = mapped_column(String(50), nullable=True)
     year: Mapped[int] = mapped_column(Integer, nullable=False)
 
+    # Indexes
+    __table_args__ = (
+        Index("idx_soil_geography_subdistrict_year", "subdistrict_id", "year"),
+    )
+
     # Relationships
     rubber_farms: Mapped[List["RubberFarm"]] = relationship("RubberFarm", back_populates="soil")
     sub_district: Mapped["SubDistrict"] = relationship("SubDistrict", back_populates="soil_geographies")
@@ -1,5 +1,5 @@
 from typing import List
-from sqlalchemy import Float, Integer, String, ForeignKey
+from sqlalchemy import Float, Index, Integer, String, ForeignKey
 from sqlalchemy.orm import relationship, mapped_column, Mapped
 
 from app.models.base import SQLModel
@@ -16,6 +16,12 @@ class SubDistrict(SQLModel):
     zip_code: Mapped[int] = mapped_column(Integer, nullable=False)
     district_id: Mapped[int] = mapped_column(Integer, ForeignKey("District.code"), nullable=False)
 
+    # Indexes
+    __table_args__ = (
+        Index("idx_subdistrict_name_th_trgm", "name_th", postgresql_using="gin", postgresql_ops={"name_th": "gin_trgm_ops"}),
+        Index("idx_subdistrict_name_en_trgm", "name_en", postgresql_using="gin", postgresql_ops={"name_en": "gin_trgm_ops"}),
+    )
+
     # Relationships
     districts: Mapped["District"] = relationship("District", back_populates="sub_districts") # type: ignore
     soil_geographies: Mapped[List["SoilGeography"]] = relationship("SoilGeography", back_populates="sub_district") # type: ignore
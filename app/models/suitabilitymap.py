@@ -0,0 +1,46 @@
+from typing import Optional
+from sqlalchemy import Float, ForeignKey, Index, Integer, SmallInteger, String, UniqueConstraint
+from sqlalchemy.orm import mapped_column, Mapped, relationship
+
+from app.models.base import SQLModel
+
+class SuitabilityMap(SQLModel):
+    """
+    ตารางเก็บผลประเมินความเหมาะสมที่คำนวณไว้ล่วงหน้าของแต่ละตำบล \n
+    Precomputed suitability of every sub-district per year
+
+    #### Description
+        คำนวณจาก SoilGeography (pH ตามตำบลและปี) และ WeatherGeography (สภาพอากาศตามจังหวัดและปี)
+        ด้วยเกณฑ์ความเหมาะสมและโมเดลทำนายความเหมาะสม \n
+        Built by joining SoilGeography and WeatherGeography per sub-district and
+        scoring the rows with the suitability rules and the suitability model.
+    """
+
+    __tablename__ = "SuitabilityMap"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    subdistrict_id: Mapped[int] = mapped_column(Integer, ForeignKey("SubDistrict.code"), nullable=False)
+    year: Mapped[int] = mapped_column(Integer, nullable=False)
+    rainfall_mm: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    average_temperature: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    average_humidity: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    rainy_day_count: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    ph_top: Mapped[Optional[str]] = mapped_column(String(50), nullable=True)
+    slope: Mapped[int] = mapped_column(Integer, nullable=False)
+    temperature_level: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    humidity_level: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    rainfall_level: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    rainfall_days_level: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    slope_level: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    ph_top_level: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    rule_score: Mapped[int] = mapped_column(SmallInteger, nullable=False)
+    suitability: Mapped[Optional[int]] = mapped_column(SmallInteger, nullable=True)
+    confidence: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("subdistrict_id", "year", name="uq_suitability_map_subdistrict_year"),
+        Index("idx_suitability_map_rank", "year", "suitability", "rule_score"),
+    )
+
+    # Relationships
+    sub_district: Mapped["SubDistrict"] = relationship("SubDistrict") # type: ignore
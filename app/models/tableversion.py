@@ -0,0 +1,21 @@
+from sqlalchemy import BigInteger, String
+from sqlalchemy.orm import mapped_column, Mapped
+
+from app.models.base import SQLModel
+
+class TableVersion(SQLModel):
+    """
+    เลขรุ่นของแต่ละตาราง เพิ่มขึ้นใน transaction เดียวกับการแก้ไขข้อมูล \n
+    Per-table version, incremented in the same transaction as each write
+
+    #### Description
+        ทุก worker อ่านเลขรุ่นจากตารางนี้ แคชในหน่วยความจำของแต่ละโปรเซสจึงรู้ว่าข้อมูลเปลี่ยน
+        แม้การแก้ไขจะเกิดใน worker อื่น \n
+        Every worker reads the versions from this table, so the in-process
+        caches of all workers see a write made by any one of them.
+    """
+
+    __tablename__ = "TableVersion"
+
+    table_name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    version: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
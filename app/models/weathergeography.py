@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Float, ForeignKey
+from sqlalchemy import Column, Index, Integer, String, DateTime, Float, ForeignKey
 from sqlalchemy.orm import mapped_column, Mapped, relationship
 from typing import List
 
@@ -16,5 +16,13 @@ class WeatherGeography(SQLModel):
     rainy_day_count: Mapped[int] = mapped_column(Integer, nullable=True)
     year: Mapped[int] = mapped_column(Integer, nullable=False)
 
+    # Indexes (INCLUDE ค่าสภาพอากาศ เพื่อให้รายงานแนวโน้มอ่านจาก index อย่างเดียว)
+    __table_args__ = (
+        Index(
+            "idx_weather_geography_province_year", "province_id", "year",
+            postgresql_include=["rainfall_mm", "average_temperature", "average_humidity", "rainy_day_count"],
+        ),
+    )
+
     rubber_farms: Mapped["RubberFarm"] = relationship("RubberFarm", back_populates="weather")
     province: Mapped[List["Province"]] = relationship("Province", back_populates="weather_geographies")
\ No newline at end of file
@@ -3,4 +3,5 @@ from .base import *
 from .user_schema import *
 from .token_schema import *
 from .predict_schema import *
+from .report_schema import *
 from .result import *
\ No newline at end of file
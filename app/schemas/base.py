@@ -9,4 +9,6 @@ class QuerySchema(Base):
     limit: Optional[int] = Field(100, ge=1, le=1000)
     offset: Optional[int] = Field(0, ge=0)
     search: Optional[str] = None
-    order_by_desc: bool = False
\ No newline at end of file
+    order_by_desc: bool = False
+    # cursor จาก next_cursor ของหน้าก่อนหน้า (keyset pagination ใช้แทน offset)
+    after: Optional[str] = None
\ No newline at end of file
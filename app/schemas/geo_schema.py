@@ -1,5 +1,7 @@
-from typing import Optional, List
+from typing import Literal, Optional, List
+from pydantic import Field
 
+from app.core.config import settings
 from app.schemas.base import Base, QuerySchema
 
 
@@ -19,6 +21,19 @@ class DistrictSchema(BaseGeoSchema):
 class ProvinceDetailSchema(ProvinceSchema):
     districts: Optional[List[DistrictSchema]] = None
 
+class SubDistrictFarmSchema(SubDistrictSchema):
+    farm_count: int
+
+class DistrictFarmSchema(BaseGeoSchema):
+    farm_count: int
+    sub_districts: Optional[List[SubDistrictFarmSchema]] = None
+
+class ProvinceFarmSchema(ProvinceSchema):
+    farm_count: int
+
+class ProvinceFarmDetailSchema(ProvinceFarmSchema):
+    districts: Optional[List[DistrictFarmSchema]] = None
+
 class BaseCreateSchema(Base):
     name_th: str
     name_en: str
@@ -39,3 +54,63 @@ class QueryGeoSchema(QuerySchema):
     type: Optional[str] = None
     detail: Optional[bool] = False
     order_by: Optional[str] = None
+
+# รายการจังหวัดที่มีแปลงยางคืนทั้งต้นไม้ในคำขอเดียว จึงไม่มีฟิลด์แบ่งหน้า
+class ProvinceFarmQuerySchema(Base):
+    code: Optional[int] = None
+    type: Optional[str] = None
+    detail: Optional[bool] = False
+
+class QueryDistrictSchema(QuerySchema):
+    province: Optional[int] = None
+    type: Optional[str] = None
+
+class QuerySubDistrictSchema(QuerySchema):
+    district: Optional[int] = None
+    type: Optional[str] = None
+
+
+class GeoSearchQuerySchema(Base):
+    q: str = Field(..., min_length=1, max_length=100)
+    level: Optional[Literal["province", "district", "subdistrict"]] = None
+    limit: int = Field(20, ge=1, le=100)
+    type: Optional[str] = None
+
+class GeoPlaceSchema(BaseGeoSchema):
+    level: str
+    zip_code: Optional[int] = None
+    district: Optional[BaseGeoSchema] = None
+    province: Optional[BaseGeoSchema] = None
+
+class GeoSearchResultSchema(GeoPlaceSchema):
+    score: float
+
+class GeoAutocompleteQuerySchema(Base):
+    q: str = Field(..., min_length=1, max_length=100)
+    k: int = Field(10, ge=1, le=settings.GEO_AUTOCOMPLETE_TOP_K)
+    type: Optional[str] = None
+
+class GeoPointQuerySchema(Base):
+    lat: float = Field(..., ge=-90, le=90)
+    lon: float = Field(..., ge=-180, le=180)
+    type: Optional[str] = None
+
+class GeoNearbyQuerySchema(GeoPointQuerySchema):
+    k: int = Field(5, ge=1, le=settings.GEO_NEARBY_MAX_K)
+
+class GeoNearbyResultSchema(GeoPlaceSchema):
+    latitude: float
+    longitude: float
+    distance_km: float
+
+class MapClusterQuerySchema(Base):
+    bbox: str = Field(..., description="min_lon,min_lat,max_lon,max_lat")
+    zoom: int = Field(..., ge=0, le=settings.MAP_CLUSTER_MAX_ZOOM)
+
+class MapClusterSchema(Base):
+    latitude: float
+    longitude: float
+    count: int
+    farm_count: int
+    rubber_area: float
+    code: Optional[int] = None
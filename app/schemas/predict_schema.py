@@ -1,7 +1,8 @@
 from enum import IntEnum
-from app.schemas.base import Base
+from app.core.config import settings
+from app.schemas.base import Base, QuerySchema
 
-from typing import Optional, Literal
+from typing import List, Optional, Literal
 from pydantic import Field
 
 class PredictBaseSchema(Base):
@@ -42,6 +43,35 @@ class ProductPredictSchema(PredictBaseSchema):
     rainfall_days: int
     humidity: float
 
+class SuitableBatchPredictSchema(PredictBaseSchema):
+    items: List[SuitablePredictSchema] = Field(..., min_length=1, max_length=settings.PREDICT_BATCH_MAX_ITEMS)
+
+class ProductBatchPredictSchema(PredictBaseSchema):
+    items: List[ProductPredictSchema] = Field(..., min_length=1, max_length=settings.PREDICT_BATCH_MAX_ITEMS)
+
+class SuitabilityMapQuerySchema(QuerySchema):
+    year: Optional[int] = None
+    province: Optional[int] = None
+    district: Optional[int] = None
+    min_suitability: Optional[int] = Field(None, ge=0, le=2)
+    type: Optional[str] = None
+
+class SuitabilityMapSchema(Base):
+    subdistrict_id: int
+    name: Optional[str] = None
+    district_id: int
+    province_id: int
+    year: int
+    ph_top: Optional[str] = None
+    rainfall_mm: Optional[float] = None
+    average_temperature: Optional[float] = None
+    average_humidity: Optional[float] = None
+    rainy_day_count: Optional[int] = None
+    slope: int
+    rule_score: int
+    suitability: Optional[int] = None
+    confidence: Optional[float] = None
+
 class PredictResultSchema(Base):
     pass
 
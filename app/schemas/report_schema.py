@@ -0,0 +1,118 @@
+from typing import Literal, Optional
+from pydantic import Field
+
+from app.schemas.base import Base
+
+
+# มิติที่ใช้จัดกลุ่มรายงานแปลงยางได้ (ส่งใน group_by คั่นด้วย ",")
+REPORT_GROUPS = ("geography", "province", "district", "subdistrict", "rubber_type", "soil_type", "year")
+
+# คอลัมน์ตัวเลขของแปลงยางที่สรุปผล (ผลรวมและค่าเฉลี่ย)
+METRICS = ("rubber_area", "rubber_tree_count", "rubber_tree_age", "dry_rubber_content")
+
+# ควอนไทล์ที่รายงานการกระจายตัวคืนค่า (ชื่อฟิลด์, สัดส่วน)
+DISTRIBUTION_QUANTILES = (("p10", 0.1), ("p50", 0.5), ("p90", 0.9))
+
+class ReportFilterSchema(Base):
+    year: Optional[int] = None
+    geography: Optional[int] = None
+    province: Optional[int] = None
+    district: Optional[int] = None
+    subdistrict: Optional[int] = None
+    rubber_type: Optional[int] = None
+    soil_type: Optional[int] = None
+    type: Optional[str] = None
+
+class RubberFarmSummaryQuerySchema(ReportFilterSchema):
+    group_by: str = Field("province", description="geography, province, district, subdistrict, rubber_type, soil_type, year")
+    limit: int = Field(1000, ge=1, le=10000)
+    offset: int = Field(0, ge=0)
+
+class ReportGroupSchema(Base):
+    code: int
+    name: Optional[str] = None
+
+class MetricSummarySchema(Base):
+    sum: Optional[float] = None
+    avg: Optional[float] = None
+
+class RubberFarmSummarySchema(Base):
+    geography: Optional[ReportGroupSchema] = None
+    province: Optional[ReportGroupSchema] = None
+    district: Optional[ReportGroupSchema] = None
+    subdistrict: Optional[ReportGroupSchema] = None
+    rubber_type: Optional[ReportGroupSchema] = None
+    soil_type: Optional[ReportGroupSchema] = None
+    year: Optional[int] = None
+    farm_count: int
+    rubber_area: MetricSummarySchema
+    rubber_tree_count: MetricSummarySchema
+    rubber_tree_age: MetricSummarySchema
+    dry_rubber_content: MetricSummarySchema
+
+
+class FarmExportQuerySchema(ReportFilterSchema):
+    format: Literal["csv", "xlsx"] = "csv"
+
+class SummaryExportQuerySchema(RubberFarmSummaryQuerySchema):
+    format: Literal["csv", "xlsx"] = "csv"
+
+class DatasetExportQuerySchema(Base):
+    format: Literal["parquet", "arrow"] = "parquet"
+    columns: Optional[str] = Field(None, description="คอลัมน์ที่ต้องการ คั่นด้วย \",\" (ไม่ระบุ = ทุกคอลัมน์)")
+    year: Optional[int] = None
+    province: Optional[int] = None
+
+
+class TrendQuerySchema(Base):
+    level: Literal["province", "district"] = "province"
+    province: Optional[int] = None
+    district: Optional[int] = None
+    year_from: Optional[int] = None
+    year_to: Optional[int] = None
+    type: Optional[str] = None
+
+class TrendValueSchema(Base):
+    value: Optional[float] = None
+    delta: Optional[float] = None
+
+class TrendPointSchema(Base):
+    year: int
+    rainfall_mm: TrendValueSchema
+    average_temperature: TrendValueSchema
+    average_humidity: TrendValueSchema
+    rainy_day_count: TrendValueSchema
+    farm_count: TrendValueSchema
+    rubber_area: TrendValueSchema
+    rubber_tree_count: TrendValueSchema
+    rubber_tree_age: TrendValueSchema
+    dry_rubber_content: TrendValueSchema
+
+class TrendSeriesSchema(ReportGroupSchema):
+    level: str
+    points: list[TrendPointSchema]
+
+
+class DistributionQuerySchema(ReportFilterSchema):
+    level: Literal["geography", "province", "district", "subdistrict"] = "province"
+    metrics: str = Field("rubber_area,rubber_tree_age,dry_rubber_content", description="rubber_area, rubber_tree_count, rubber_tree_age, dry_rubber_content")
+    bins: int = Field(10, ge=1, le=100)
+
+class HistogramBinSchema(Base):
+    lower: float
+    upper: float
+    count: int
+
+class MetricDistributionSchema(Base):
+    count: int
+    min: Optional[float] = None
+    max: Optional[float] = None
+    p10: Optional[float] = None
+    p50: Optional[float] = None
+    p90: Optional[float] = None
+    histogram: list[HistogramBinSchema]
+
+class DistributionSchema(ReportGroupSchema):
+    level: str
+    rubber_type: ReportGroupSchema
+    metrics: dict[str, MetricDistributionSchema]
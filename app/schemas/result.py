@@ -7,6 +7,7 @@ class Result(Base):
     trace_id: str | None = None
     message: str | None = None
     data: Any | None = None
+    next_cursor: str | None = None
 
     @classmethod
     def model_validate(cls, data: dict):
@@ -3,9 +3,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi import HTTPException, status
 
+from app.core.table_version import bump_table_version
 from app.models import District
-from app.schemas import DistrictCreateSchema
-from app.utilities.app_exceptions import DuplicateResourceException, ResourceNotFoundException, SQLProcessException, ServerProcessException
+from app.schemas import DistrictCreateSchema, QueryDistrictSchema
+from app.services.geo_cache import geo_cache
+from app.utilities.app_cursor import paginate_sorted
+from app.utilities.app_exceptions import DuplicateResourceException, InvalidInputException, ResourceNotFoundException, SQLProcessException, ServerProcessException
 
 class DistrictService:
 
@@ -29,6 +32,51 @@ class DistrictService:
 
 
 
+    async def get_districts(self, query: QueryDistrictSchema) -> tuple[list[dict], str | None]:
+        """
+        ดึงข้อมูลอำเภอจากต้นไม้ข้อมูลพื้นที่ในหน่วยความจำ แบ่งหน้าด้วย cursor หรือ offset \n
+        List districts from the in-memory geo tree, paged by cursor or offset.
+        """
+
+        try:
+            index = await geo_cache.get_index(self.session)
+
+            if query.province:
+                districts = index.districts_of(query.province)
+            else:
+                districts = list(index.districts.values())
+
+            if query.search:
+                search = query.search.lower()
+                districts = [
+                    district for district in districts
+                    if search in district.name_th.lower()
+                    or search in (district.name_en or "").lower()
+                    or search in str(district.code)
+                ]
+
+            if query.order_by_desc:
+                districts = districts[::-1]
+
+            districts, cursor = paginate_sorted(
+                districts, query, lambda district: (district.code,), descending=query.order_by_desc
+            )
+
+            return [
+                {"code": district.code, "name": district.name_en if query.type == "en" else district.name_th}
+                for district in districts
+            ], cursor
+
+        except InvalidInputException as e:
+            raise e
+
+        except SQLAlchemyError as e:
+            raise SQLProcessException(event=e)
+
+        except Exception as e:
+            raise ServerProcessException(message="เกิดข้อผิดพลาดที่ไม่รู้จัก")
+
+
     async def _get_district_by_code(self, code: int):
         """
         Retrieve district data from the database based on the specified district code.
@@ -57,8 +105,10 @@ class DistrictService:
             new_district = self._populate_district_fields(District(), district)
             
             self.session.add(new_district)
+            await bump_table_version(self.session, "District")
             await self.session.commit()
             await self.session.refresh(new_district)
+            await geo_cache.refresh(self.session)
 
             return new_district
         
@@ -66,11 +116,11 @@ class DistrictService:
             raise e
         
         except SQLAlchemyError as e:
-            self.session.rollback()
+            await self.session.rollback()
             raise SQLProcessException(event=e)
         
         except Exception as e:
-            self.session.rollback()
+            await self.session.rollback()
             raise ServerProcessException(message="เกิดข้อผิดพลาดที่ไม่รู้จัก")
     
 
@@ -90,21 +140,23 @@ class DistrictService:
 
             DistrictService._populate_district_fields(existing_district, district)
 
+            await bump_table_version(self.session, "District")
             await self.session.commit()
             await self.session.refresh(existing_district)
+            await geo_cache.refresh(self.session)
 
             return existing_district
         
         except SQLAlchemyError as e:
-            self.session.rollback()
+            await self.session.rollback()
             raise SQLProcessException(event=e)
         
         except ResourceNotFoundException as e:
-            self.session.rollback()
+            await self.session.rollback()
             raise e
         
         except Exception as e:
-            self.session.rollback()
+            await self.session.rollback()
             raise ServerProcessException(message="เกิดข้อผิดพลาดที่ไม่รู้จัก")
         
     
@@ -122,19 +174,21 @@ class DistrictService:
                     message="ไม่พบข้อมูลอำเภอที่ต้องการลบ"
                 )
 
-            self.session.delete(existing_district)
+            await self.session.delete(existing_district)
+            await bump_table_version(self.session, "District")
             await self.session.commit()
+            await geo_cache.refresh(self.session)
 
             return True
         
         except SQLAlchemyError as e:
-            self.session.rollback()
+            await self.session.rollback()
             raise SQLProcessException(event=e)
         
         except ResourceNotFoundException as e:
-            self.session.rollback()
+            await self.session.rollback()
             raise e
         
         except Exception as e:
-            self.session.rollback()
+            await self.session.rollback()
             raise ServerProcessException(message="เกิดข้อผิดพลาดที่ไม่รู้จัก")
\ No newline at end of file
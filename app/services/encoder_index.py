@@ -0,0 +1,125 @@
+import asyncio
+import logging
+from types import MappingProxyType
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.services.geo_cache import GeoIndex, geo_cache
+from app.services.model_registry import model_registry
+from app.utilities.app_exceptions import InvalidInputException
+
+logger = logging.getLogger(__name__)
+
+PRODUCT_ENCODER_DIR = "model_product"
+
+# คอลัมน์ที่ encode จากรหัสพื้นที่ (code → name_th → index)
+_GEO_COLUMNS = {
+    "province": "provinces",
+    "district": "districts",
+    "subdistrict": "sub_districts",
+}
+
+# คอลัมน์ที่ encode จากค่าข้อความโดยตรง (name → index)
+_LABEL_COLUMNS = ("rubbertype", "soilgroup", "pH_top")
+
+
+class ProductEncoderIndex:
+    """
+    ตารางแปลงค่าเป็นเลข index ของ LabelEncoder สำหรับโมเดลทำนายผลผลิต \n
+    Lookup tables mapping each input value straight to its LabelEncoder index.
+
+    #### Description
+        รหัสจังหวัด อำเภอ ตำบล ถูกแปลงเป็น index ผ่านชื่อภาษาไทยเพียงครั้งเดียวตอนสร้างตาราง
+        จึงไม่ต้องเรียก `LabelEncoder.transform` ในทุกคำขอ \n
+        Geo codes are mapped through their Thai names once, when the tables are
+        built, so requests never go through `LabelEncoder.transform`.
+    """
+
+    def __init__(self, tables: dict[str, MappingProxyType], geo_index: GeoIndex, generation: int):
+        self.tables = tables
+        self.geo_index = geo_index
+        self.generation = generation
+
+    @classmethod
+    def build(cls, encoders, geo_index: GeoIndex, generation: int) -> "ProductEncoderIndex":
+        tables = {}
+
+        for column in _LABEL_COLUMNS:
+            classes = encoders[column].classes_
+            tables[column] = MappingProxyType({label: index for index, label in enumerate(classes.tolist())})
+
+        for column, attribute in _GEO_COLUMNS.items():
+            class_index = {label: index for index, label in enumerate(encoders[column].classes_.tolist())}
+            entries = getattr(geo_index, attribute)
+
+            table = {}
+            missing = []
+
+            for code, entry in entries.items():
+                index = class_index.get(entry.name_th)
+
+                if index is None:
+                    missing.append(code)
+                else:
+                    table[code] = index
+
+            if missing:
+                logger.warning(
+                    "%d %s codes have no class in the product encoder, e.g. %s",
+                    len(missing), column, missing[:10]
+                )
+
+            tables[column] = MappingProxyType(table)
+
+        return cls(tables, geo_index, generation)
+
+    def encode(self, column: str, values: list) -> np.ndarray:
+        """
+        แปลงค่าทั้งคอลัมน์เป็น index \n
+        Encode a column of values, rejecting values the model has never seen.
+        """
+
+        table = self.tables[column]
+
+        try:
+            return np.fromiter((table[value] for value in values), dtype=np.int64, count=len(values))
+
+        except KeyError as e:
+            raise InvalidInputException(message=f"โมเดลไม่รองรับข้อมูล {column}: {e.args[0]}")
+
+
+class ProductEncoderIndexCache:
+    """
+    เก็บตารางแปลงค่าไว้ใช้ซ้ำ และสร้างใหม่เมื่อ encoder หรือข้อมูลพื้นที่เปลี่ยน \n
+    Keeps the encoder index and rebuilds it when the registry or the geo index changes.
+    """
+
+    def __init__(self):
+        self._index: ProductEncoderIndex | None = None
+        self._lock = asyncio.Lock()
+
+    def _is_current(self, index: ProductEncoderIndex | None, geo_index: GeoIndex) -> bool:
+        return (
+            index is not None
+            and index.geo_index is geo_index
+            and index.generation == model_registry.generation
+        )
+
+    async def get(self, session: AsyncSession) -> ProductEncoderIndex:
+        geo_index = await geo_cache.get_index(session)
+
+        if self._is_current(self._index, geo_index):
+            return self._index
+
+        async with self._lock:
+            if not self._is_current(self._index, geo_index):
+                encoders = model_registry.get(
+                    PRODUCT_ENCODER_DIR, "labelencoders", settings.PREDICT_PRODUCT_MODEL_VERSION
+                )
+                self._index = ProductEncoderIndex.build(encoders, geo_index, model_registry.generation)
+
+            return self._index
+
+
+product_encoder_index = ProductEncoderIndexCache()
@@ -0,0 +1,266 @@
+import logging
+from collections.abc import AsyncIterator
+from sqlalchemy import Float, Integer
+from sqlalchemy.sql import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.models import District, Province, RubberFarm, RubberType, SoilGeography, SoilType, SubDistrict, WeatherGeography
+from app.schemas.report_schema import DatasetExportQuerySchema, FarmExportQuerySchema, SummaryExportQuerySchema
+from app.services.geo_cache import geo_cache
+from app.services.report_service import METRICS, ReportService, farm_statement, report_filters
+from app.utilities.app_exceptions import InvalidInputException
+
+logger = logging.getLogger(__name__)
+
+# คอลัมน์ของไฟล์รายการแปลงยาง (ไม่ส่งออกเลขบัตรประชาชน)
+FARM_EXPORT_COLUMNS = (
+    "id",
+    "province_code", "province",
+    "district_code", "district",
+    "subdistrict_code", "subdistrict",
+    "rubber_type", "year",
+    *METRICS,
+    "document_type",
+)
+
+
+# คอลัมน์ของชุดข้อมูลสำหรับฝึกโมเดล (แปลงยาง + ดิน + สภาพอากาศ + พื้นที่) เรียงตามลำดับในไฟล์
+DATASET_COLUMNS = {
+    "farm_id": RubberFarm.id,
+    "geography_code": Province.geography_id,
+    "province_code": District.province_id,
+    "province": Province.name_th,
+    "district_code": SubDistrict.district_id,
+    "district": District.name_th,
+    "subdistrict_code": RubberFarm.subdistrict_id,
+    "subdistrict": SubDistrict.name_th,
+    "rubber_type": RubberType.name,
+    **{metric: getattr(RubberFarm, metric) for metric in METRICS},
+    "soil_type": SoilType.name,
+    "soil_year": SoilGeography.year,
+    "fertility_top": SoilGeography.fertility_top,
+    "ph_top": SoilGeography.ph_top,
+    "ph_low": SoilGeography.ph_low,
+    "year": WeatherGeography.year,
+    "rainfall_mm": WeatherGeography.rainfall_mm,
+    "average_temperature": WeatherGeography.average_temperature,
+    "average_humidity": WeatherGeography.average_humidity,
+    "rainy_day_count": WeatherGeography.rainy_day_count,
+}
+
+# ตารางที่ join ได้ เรียงตามลำดับ พร้อมตารางที่ต้อง join ก่อน
+DATASET_JOINS = (
+    (SubDistrict, SubDistrict.code == RubberFarm.subdistrict_id, None),
+    (District, District.code == SubDistrict.district_id, SubDistrict),
+    (Province, Province.code == District.province_id, District),
+    (RubberType, RubberType.id == RubberFarm.rubber_type_id, None),
+    (SoilGeography, SoilGeography.id == RubberFarm.soil_id, None),
+    (SoilType, SoilType.id == SoilGeography.soil_type_id, SoilGeography),
+    (WeatherGeography, WeatherGeography.id == RubberFarm.weather_id, None),
+)
+
+
+def dataset_columns(columns: str | None) -> list[str]:
+    """
+    คอลัมน์ที่ต้องการ (คั่นด้วย ",") หรือทุกคอลัมน์เมื่อไม่ระบุ \n
+    Parse the requested column list; every column when none is given.
+    """
+
+    if not columns:
+        return list(DATASET_COLUMNS)
+
+    names = list(dict.fromkeys(name.strip() for name in columns.split(",") if name.strip()))
+    unknown = [name for name in names if name not in DATASET_COLUMNS]
+
+    if unknown or not names:
+        raise InvalidInputException(message=f"ไม่รองรับคอลัมน์ {', '.join(unknown)}")
+
+    return names
+
+
+def dataset_types(names: list[str]) -> dict[str, str]:
+    """
+    ชนิดข้อมูลของแต่ละคอลัมน์ ("int", "float" หรือ "string") สำหรับสร้าง schema ของไฟล์ \n
+    Column kinds used to build the Arrow schema.
+    """
+
+    types = {}
+
+    for name in names:
+        column_type = DATASET_COLUMNS[name].type
+        if isinstance(column_type, Integer):
+            types[name] = "int"
+        elif isinstance(column_type, Float):
+            types[name] = "float"
+        else:
+            types[name] = "string"
+
+    return types
+
+
+def summary_export_columns(groups: list[str]) -> list[str]:
+    """
+    หัวตารางของไฟล์รายงานสรุป: รหัสและชื่อของแต่ละมิติ ตามด้วยค่าสรุป \n
+    Header of a summary export: code and name per group, then the metrics.
+    """
+
+    columns = []
+
+    for group in groups:
+        columns += ["year"] if group == "year" else [f"{group}_code", group]
+
+    return columns + ["farm_count", *(f"{metric}_{part}" for metric in METRICS for part in ("sum", "avg"))]
+
+
+class ExportService:
+    """
+    อ่านข้อมูลสำหรับส่งออกผ่าน server-side cursor ทีละชุด \n
+    Reads export rows through a server-side cursor, one batch at a time.
+
+    #### Description
+        ใช้ `session.stream` (asyncpg server-side cursor) ดึงแถวทีละ `EXPORT_BATCH_SIZE` แถว
+        จึงไม่มีการโหลดผลลัพธ์ทั้งหมดเข้าหน่วยความจำ \n
+        Rows come from `session.stream` in batches of `EXPORT_BATCH_SIZE`, so the
+        full result is never held in memory. The session must stay open while
+        the rows are consumed.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def farm_rows(self, query: FarmExportQuerySchema) -> AsyncIterator[tuple]:
+        """
+        รายการแปลงยางตามตัวกรอง พร้อมชื่อพื้นที่ พันธุ์ยาง และปี \n
+        Yield one tuple per farm, in `FARM_EXPORT_COLUMNS` order.
+        """
+
+        columns = [
+            RubberFarm.id,
+            RubberFarm.subdistrict_id,
+            SubDistrict.district_id,
+            District.province_id,
+            RubberType.name.label("rubber_type"),
+            WeatherGeography.year,
+            *(getattr(RubberFarm, metric) for metric in METRICS),
+            RubberFarm.document_type,
+        ]
+
+        stmt = (
+            farm_statement(columns, {"province", "year"}, report_filters(query))
+            .join(RubberType, RubberType.id == RubberFarm.rubber_type_id)
+            .order_by(RubberFarm.id)
+            .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        )
+
+        index = await geo_cache.get_index(self.session)
+
+        def name(entries, code):
+            entry = entries.get(code)
+            if entry is None:
+                return None
+            return entry.name_en if query.type == "en" else entry.name_th
+
+        try:
+            result = await self.session.stream(stmt)
+
+            async for partition in result.partitions():
+                for row in partition:
+                    yield (
+                        row.id,
+                        row.province_id, name(index.provinces, row.province_id),
+                        row.district_id, name(index.districts, row.district_id),
+                        row.subdistrict_id, name(index.sub_districts, row.subdistrict_id),
+                        row.rubber_type, row.year,
+                        *(getattr(row, metric) for metric in METRICS),
+                        row.document_type,
+                    )
+
+        except SQLAlchemyError as e:
+            # ส่ง header ของ response ไปแล้ว จึงทำได้เพียงบันทึกและหยุดการส่ง
+            logger.error("SQLAlchemy error during farm export: %s", e)
+            raise
+
+    async def summary_rows(self, query: SummaryExportQuerySchema) -> AsyncIterator[tuple]:
+        """
+        แถวของรายงานสรุปแปลงยาง (คำสั่งเดียวกับ /report/rubber-farm/summary) \n
+        Yield the rubber farm summary rows, in `summary_export_columns` order,
+        built with the same statement as /report/rubber-farm/summary.
+        """
+
+        report_service = ReportService(self.session)
+        stmt, groups = report_service.summary_statement(query)
+
+        try:
+            result = await self.session.stream(stmt.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+
+            async for partition in result.partitions():
+                for summary in await report_service.summary_rows(partition, groups, query.type):
+                    row = []
+
+                    for group in groups:
+                        value = summary[group]
+                        if group == "year":
+                            row.append(value)
+                        else:
+                            row += [value["code"], value["name"]] if value else [None, None]
+
+                    row.append(summary["farm_count"])
+
+                    for metric in METRICS:
+                        row += [summary[metric]["sum"], summary[metric]["avg"]]
+
+                    yield tuple(row)
+
+        except SQLAlchemyError as e:
+            logger.error("SQLAlchemy error during summary export: %s", e)
+            raise
+
+    async def dataset_batches(self, query: DatasetExportQuerySchema, names: list[str]) -> AsyncIterator[dict[str, list]]:
+        """
+        ชุดข้อมูลแปลงยางแบบ denormalized ทีละชุด (แบบคอลัมน์) \n
+        Yield the denormalized farm dataset as column batches.
+
+        #### Description
+            SELECT เฉพาะคอลัมน์ที่ขอ และ join เฉพาะตารางที่คอลัมน์หรือตัวกรองต้องใช้
+            ตัวกรองปีและจังหวัดทำใน SQL \n
+            Only the requested columns are selected and only the tables they or
+            the year/province filters need are joined; the filters run in SQL.
+        """
+
+        selected = [DATASET_COLUMNS[name].label(name) for name in names]
+        stmt = select(*selected).select_from(RubberFarm)
+
+        filters = [
+            (column, value)
+            for column, value in ((WeatherGeography.year, query.year), (District.province_id, query.province))
+            if value is not None
+        ]
+
+        needed = {DATASET_COLUMNS[name].table for name in names}
+        needed.update(column.table for column, _ in filters)
+
+        for table, onclause, parent in reversed(DATASET_JOINS):
+            if table.__table__ in needed and parent is not None:
+                needed.add(parent.__table__)
+
+        for table, onclause, _ in DATASET_JOINS:
+            if table.__table__ in needed:
+                stmt = stmt.join(table, onclause)
+
+        stmt = (
+            stmt.where(*(column == value for column, value in filters))
+            .order_by(RubberFarm.id)
+            .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+        )
+
+        try:
+            result = await self.session.stream(stmt)
+
+            async for partition in result.partitions():
+                yield {name: [row[i] for row in partition] for i, name in enumerate(names)}
+
+        except SQLAlchemyError as e:
+            logger.error("SQLAlchemy error during dataset export: %s", e)
+            raise
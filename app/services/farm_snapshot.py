@@ -0,0 +1,248 @@
+import asyncio
+import logging
+from collections import namedtuple
+import numpy as np
+from sqlalchemy.sql import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.config import settings
+from app.core.table_version import get_table_version
+from app.models import District, Province, RubberFarm, SoilGeography, SubDistrict, WeatherGeography
+from app.schemas.report_schema import METRICS
+
+logger = logging.getLogger(__name__)
+
+# ตารางที่ snapshot อ่าน: เมื่อเลขรุ่นของตารางใดเปลี่ยน snapshot จะถือว่าเก่าและไม่ถูกใช้
+SNAPSHOT_TABLES = ("RubberFarm", "SubDistrict", "District", "Province", "SoilGeography", "WeatherGeography")
+
+# คอลัมน์ของแต่ละมิติที่โหลดเข้า snapshot
+SNAPSHOT_DIMENSIONS = {
+    "geography": Province.geography_id,
+    "province": District.province_id,
+    "district": SubDistrict.district_id,
+    "subdistrict": RubberFarm.subdistrict_id,
+    "rubber_type": RubberFarm.rubber_type_id,
+    "soil_type": SoilGeography.soil_type_id,
+    "year": WeatherGeography.year,
+}
+
+
+async def fetch_columns(session: AsyncSession, stmt, integers: tuple[str, ...], floats: tuple[str, ...]) -> dict[str, np.ndarray]:
+    """
+    อ่านผลของ stmt ทีละชุดผ่าน server-side cursor แล้วรวมเป็นอาร์เรย์ NumPy ต่อคอลัมน์ \n
+    Stream `stmt` in batches and return one NumPy array per column: int64
+    for `integers`, float64 (NaN for NULL) for `floats`. The statement must
+    select the integer columns first, then the float columns.
+    """
+
+    names = (*integers, *floats)
+    dtypes = {name: np.int64 if name in integers else np.float64 for name in names}
+    parts: dict[str, list[np.ndarray]] = {name: [] for name in names}
+
+    result = await session.stream(stmt.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+
+    async for partition in result.partitions():
+        for i, name in enumerate(names):
+            parts[name].append(np.array([row[i] for row in partition], dtype=dtypes[name]))
+
+    return {
+        name: np.concatenate(arrays) if arrays else np.empty(0, dtype=dtypes[name])
+        for name, arrays in parts.items()
+    }
+
+
+class FarmSnapshot:
+    """
+    สำเนาข้อมูลแปลงยางแบบคอลัมน์ (NumPy) สำหรับรายงานแบบโต้ตอบ \n
+    Columnar NumPy copy of RubberFarm for interactive analytics.
+
+    #### Description
+        แต่ละมิติเก็บเป็น dictionary encoding: `values[dim]` คือรหัสที่ไม่ซ้ำ (เรียงแล้ว)
+        และ `codes[dim]` คือ index ขนาดเล็ก (uint8/uint16/...) ของแต่ละแปลง
+        คอลัมน์ตัวเลขเก็บเป็น float64 โดยค่า NULL เป็น NaN
+        การกรอง จัดกลุ่ม histogram และ percentile จึงเป็นการคำนวณแบบ vectorized ทั้งหมด \n
+        Every dimension is dictionary-encoded: `values[dim]` holds the sorted
+        distinct codes and `codes[dim]` a small-int index per farm. Metrics are
+        float64 with NaN for NULL. Filters, group-bys, histograms and
+        percentiles are all vectorized array operations.
+    """
+
+    def __init__(self, columns: dict[str, np.ndarray], version: tuple):
+        self.version = version
+        self.size = len(columns["year"]) if "year" in columns else 0
+        self.values: dict[str, np.ndarray] = {}
+        self.codes: dict[str, np.ndarray] = {}
+        self.metrics: dict[str, np.ndarray] = {}
+
+        for dimension in SNAPSHOT_DIMENSIONS:
+            values, codes = np.unique(columns[dimension], return_inverse=True)
+            self.values[dimension] = values
+            self.codes[dimension] = codes.astype(np.min_scalar_type(max(len(values) - 1, 0)))
+
+        for metric in METRICS:
+            self.metrics[metric] = columns[metric]
+
+    @classmethod
+    async def load(cls, session: AsyncSession) -> "FarmSnapshot":
+        """
+        โหลดแปลงยางทั้งหมดผ่าน server-side cursor แล้วแปลงเป็นคอลัมน์ทีละชุด \n
+        Stream every farm through a server-side cursor and convert each batch to columns.
+        """
+
+        # อ่านเลขรุ่นก่อนโหลด: ถ้ามีการเขียนระหว่างโหลด snapshot จะถูกมองว่าเก่าทันที
+        version = await get_table_version(session, *SNAPSHOT_TABLES)
+
+        stmt = (
+            select(
+                *(column.label(dimension) for dimension, column in SNAPSHOT_DIMENSIONS.items()),
+                *(getattr(RubberFarm, metric) for metric in METRICS),
+            )
+            .select_from(RubberFarm)
+            .join(SubDistrict, SubDistrict.code == RubberFarm.subdistrict_id)
+            .join(District, District.code == SubDistrict.district_id)
+            .join(Province, Province.code == District.province_id)
+            .join(SoilGeography, SoilGeography.id == RubberFarm.soil_id)
+            .join(WeatherGeography, WeatherGeography.id == RubberFarm.weather_id)
+        )
+
+        columns = await fetch_columns(session, stmt, tuple(SNAPSHOT_DIMENSIONS), METRICS)
+        snapshot = await asyncio.to_thread(cls, columns, version)
+        logger.info("Rubber farm snapshot loaded: %d farms", snapshot.size)
+
+        return snapshot
+
+    def mask(self, filters: dict[str, int]) -> np.ndarray:
+        """
+        mask ของแปลงที่ตรงกับตัวกรองทุกข้อ (เทียบกับ index ของ dictionary) \n
+        Boolean mask of the farms matching every filter.
+        """
+
+        mask = np.ones(self.size, dtype=bool)
+
+        for dimension, value in filters.items():
+            values = self.values[dimension]
+            position = np.searchsorted(values, value)
+
+            if position == len(values) or values[position] != value:
+                return np.zeros(self.size, dtype=bool)
+
+            mask &= self.codes[dimension] == position
+
+        return mask
+
+    def group_summary(self, groups: list[str], filters: dict[str, int]) -> list:
+        """
+        จำนวนแปลง ผลรวม และค่าเฉลี่ยต่อกลุ่ม คืนค่าแถวที่มีชื่อคอลัมน์เดียวกับรายงานสรุปใน SQL \n
+        Count, sum and average per group, as rows shaped like the SQL summary
+        rows (`farm_count`, `<metric>_sum`, `<metric>_avg`), ordered by group.
+        """
+
+        mask = self.mask(filters)
+        group_codes = [self.codes[group][mask].astype(np.int64) for group in groups]
+        sizes = [len(self.values[group]) for group in groups]
+
+        keys = np.ravel_multi_index(group_codes, sizes) if group_codes else np.zeros(int(mask.sum()), dtype=np.int64)
+        unique_keys, inverse = np.unique(keys, return_inverse=True)
+
+        farm_counts = np.bincount(inverse, minlength=len(unique_keys))
+        positions = np.unravel_index(unique_keys, sizes) if group_codes else []
+
+        Row = namedtuple("SnapshotRow", [*groups, "farm_count", *(f"{m}_{part}" for m in METRICS for part in ("sum", "avg"))])
+
+        columns = [self.values[group][position].tolist() for group, position in zip(groups, positions)]
+        columns.append(farm_counts.tolist())
+
+        for metric in METRICS:
+            values = self.metrics[metric][mask]
+            present = ~np.isnan(values)
+            sums = np.bincount(inverse, weights=np.where(present, values, 0.0), minlength=len(unique_keys))
+            counts = np.bincount(inverse, weights=present, minlength=len(unique_keys))
+
+            with np.errstate(invalid="ignore", divide="ignore"):
+                averages = sums / counts
+
+            columns.append([None if count == 0 else total for total, count in zip(sums.tolist(), counts.tolist())])
+            columns.append([None if count == 0 else average for average, count in zip(averages.tolist(), counts.tolist())])
+
+        return [Row(*values) for values in zip(*columns)]
+
+    def columns(self, dimensions: list[str], metrics: list[str], filters: dict[str, int]) -> dict[str, np.ndarray]:
+        """
+        คอลัมน์ของแปลงที่ผ่านตัวกรอง (มิติคืนเป็นรหัสจริง ไม่ใช่ index ของ dictionary) \n
+        Columns of the filtered farms, with dimensions decoded back to their codes.
+        """
+
+        mask = self.mask(filters)
+
+        columns = {dimension: self.values[dimension][self.codes[dimension][mask]] for dimension in dimensions}
+        columns.update({metric: self.metrics[metric][mask] for metric in metrics})
+
+        return columns
+
+
+class FarmSnapshotCache:
+    """
+    เก็บ snapshot ล่าสุด และสร้างใหม่เบื้องหลังเมื่อข้อมูลถูกนำเข้า \n
+    Holds the latest snapshot and rebuilds it in the background after imports.
+
+    #### Description
+        snapshot จะถูกใช้ก็ต่อเมื่อเลขรุ่นของตาราง (ตาราง TableVersion ที่ทุก worker ใช้ร่วมกัน) ยังตรงกับตอนโหลด
+        worker ที่พบว่า snapshot ของตนเก่า จะสั่งสร้างใหม่เอง ระหว่างนั้นรายงานจะกลับไปอ่านจาก Postgres \n
+        A snapshot is only served while the shared table versions still match
+        the ones it was loaded at, so an import through any worker retires the
+        snapshot on every worker. A worker that finds its snapshot stale starts
+        its own rebuild; until it finishes, reports fall back to Postgres.
+        Disabled unless ANALYTICS_SNAPSHOT_ENABLED is set.
+    """
+
+    def __init__(self, enabled: bool):
+        self.enabled = enabled
+        self._snapshot: FarmSnapshot | None = None
+        self._task: asyncio.Task | None = None
+        self._pending = False
+
+    async def current(self, session: AsyncSession) -> FarmSnapshot | None:
+        if not self.enabled:
+            return None
+
+        snapshot = self._snapshot
+
+        if snapshot is None or snapshot.version != await get_table_version(session, *SNAPSHOT_TABLES):
+            # ข้อมูลถูกแก้ไข (อาจจาก worker อื่น) ให้ worker นี้สร้าง snapshot ใหม่ ถ้ายังไม่ได้เริ่ม
+            if self._task is None or self._task.done():
+                self.schedule_refresh(session.bind)
+            return None
+
+        return snapshot
+
+    def schedule_refresh(self, engine: AsyncEngine) -> None:
+        """
+        สั่งสร้าง snapshot ใหม่เบื้องหลัง (ถ้ากำลังสร้างอยู่ จะสร้างซ้ำอีกครั้งเมื่อเสร็จ) \n
+        Start a background rebuild; a call during a rebuild queues one more run.
+        """
+
+        if not self.enabled:
+            return
+
+        if self._task is not None and not self._task.done():
+            self._pending = True
+            return
+
+        self._task = asyncio.create_task(self._refresh(engine))
+
+    async def _refresh(self, engine: AsyncEngine) -> None:
+        while True:
+            self._pending = False
+
+            try:
+                async with AsyncSession(engine, expire_on_commit=False) as session:
+                    self._snapshot = await FarmSnapshot.load(session)
+
+            except Exception as e:
+                logger.error("Rubber farm snapshot refresh failed: %s", e)
+
+            if not self._pending:
+                break
+
+
+farm_snapshot = FarmSnapshotCache(enabled=settings.ANALYTICS_SNAPSHOT_ENABLED)
@@ -16,6 +16,13 @@ from importlib import import_module
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 
+from app.core.table_version import bump_table_version
+from app.services.farm_snapshot import SNAPSHOT_TABLES, farm_snapshot
+from app.services.geo_cache import geo_cache
+from app.services.rollup_service import RubberFarmRollupService
+
+GEO_MODELS = {"Geography", "Province", "District", "SubDistrict"}
+
 class FileService:
 
     def __init__(self, session: AsyncSession):
@@ -55,7 +62,13 @@ class FileService:
                     logging.info(f"Importing {len(records)} records into {model_name} table.")
 
                     # ใช้ bulk_insert_mappings เพื่อเพิ่มประสิทธิภาพ
-                    await self.session.execute(model_class.__table__.insert(), records)
+                    if model_name == "RubberFarm":
+                        # บวกแปลงที่นำเข้าเข้าตารางสรุปใน transaction เดียวกัน
+                        table = model_class.__table__
+                        farm_ids = (await self.session.execute(table.insert().returning(table.c.id), records)).scalars().all()
+                        await RubberFarmRollupService(self.session).add_farms(farm_ids)
+                    else:
+                        await self.session.execute(model_class.__table__.insert(), records)
 
                     total_imported_records += len(records)
 
@@ -72,8 +85,24 @@ class FileService:
 
             # ถ้าไม่มีข้อผิดพลาดร้ายแรง ให้ commit
             if total_imported_records > 0:
+                imported_models = [entry['model'] for entry in csv_files_import]
+
+                # ตารางสรุปถูกปรับใน transaction เดียวกับการนำเข้าแปลงยาง
+                if "RubberFarm" in imported_models:
+                    imported_models.append("RubberFarmRollup")
+
+                # เพิ่มเลขรุ่นใน transaction เดียวกัน ทุก worker จึงเห็นการเปลี่ยนแปลงพร้อมกับข้อมูล
+                await bump_table_version(self.session, *imported_models)
                 await self.session.commit()
                 logging.info(f"Successfully imported {total_imported_records} records in total.")
+
+                # นำเข้าข้อมูลพื้นที่ ให้สร้างต้นไม้ข้อมูลพื้นที่ในหน่วยความจำใหม่
+                if GEO_MODELS.intersection(entry['model'] for entry in csv_files_import):
+                    await geo_cache.refresh(self.session)
+
+                # snapshot ของแปลงยางเก่าแล้ว ให้สร้างใหม่เบื้องหลัง (ระหว่างนั้นรายงานอ่านจาก Postgres)
+                if set(SNAPSHOT_TABLES).intersection(entry['model'] for entry in csv_files_import):
+                    farm_snapshot.schedule_refresh(self.session.bind)
             else:
                 logging.warning("No valid records imported. Nothing to commit.")
 
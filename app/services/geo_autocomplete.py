@@ -0,0 +1,204 @@
+import asyncio
+import heapq
+import logging
+from array import array
+from bisect import bisect_left
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.services.geo_cache import GeoIndex, geo_cache
+
+logger = logging.getLogger(__name__)
+
+# ลำดับของระดับพื้นที่ในผลลัพธ์ (จังหวัด > อำเภอ > ตำบล)
+LEVELS = ("province", "district", "subdistrict")
+
+
+def normalize(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+class PlaceTrie:
+    """
+    Trie แบบ array สำหรับเติมชื่อพื้นที่อัตโนมัติ (ชื่อไทย/อังกฤษ และรหัสไปรษณีย์) \n
+    Compact array-backed trie over place names (Thai and English) and zip codes.
+
+    #### Description
+        โหนดลูกของแต่ละโหนดเก็บต่อเนื่องกันใน `labels` / `targets` (เรียงตามรหัสอักขระ)
+        และแต่ละโหนดเก็บ id ของพื้นที่ที่ดีที่สุด `top_k` รายการในต้นไม้ย่อยไว้ล่วงหน้า
+        การค้นหาจึงเป็นเพียงการเดินตามคำนำหน้าแล้วอ่านผลลัพธ์ที่คำนวณไว้แล้ว \n
+        The children of node n are the slice `child_start[n]:child_start[n + 1]`
+        of `labels` (sorted code points) and `targets`. Place ids are assigned in
+        rank order (level, then name length), and every node stores the `top_k`
+        best ids of its subtree, so a query walks the prefix and reads one slice.
+    """
+
+    def __init__(self, places: list[tuple[str, int]], keys: list[list[str]], top_k: int):
+        self.places = places
+        self.top_k = top_k
+
+        # สร้าง trie ชั่วคราวแบบ dict แล้วบีบอัดเป็น array
+        children: list[dict[int, int]] = [{}]
+        terminals: list[list[int]] = [[]]
+
+        for place_id, place_keys in enumerate(keys):
+            for key in place_keys:
+                node = 0
+                for char in key:
+                    child = children[node].get(ord(char))
+                    if child is None:
+                        child = len(children)
+                        children[node][ord(char)] = child
+                        children.append({})
+                        terminals.append([])
+                    node = child
+                terminals[node].append(place_id)
+
+        node_count = len(children)
+
+        self.child_start = array('i', [0]) * (node_count + 1)
+        self.labels = array('I')
+        self.targets = array('i')
+
+        for node in range(node_count):
+            self.child_start[node] = len(self.labels)
+            for label in sorted(children[node]):
+                self.labels.append(label)
+                self.targets.append(children[node][label])
+        self.child_start[node_count] = len(self.labels)
+
+        # top-k ของแต่ละโหนด: รวมผลของโหนดลูก (id ของโหนดลูกมากกว่าโหนดแม่เสมอ จึงไล่จากท้าย)
+        self.top = array('i', [-1]) * (node_count * top_k)
+
+        for node in range(node_count - 1, -1, -1):
+            candidates = set(terminals[node])
+            for child in children[node].values():
+                offset = child * top_k
+                for place_id in self.top[offset:offset + top_k]:
+                    if place_id < 0:
+                        break
+                    candidates.add(place_id)
+
+            offset = node * top_k
+            for i, place_id in enumerate(heapq.nsmallest(top_k, candidates)):
+                self.top[offset + i] = place_id
+
+        logger.info("Place trie built: %d places, %d nodes", len(places), node_count)
+
+    def _find(self, prefix: str) -> int:
+        node = 0
+
+        for char in prefix:
+            start, end = self.child_start[node], self.child_start[node + 1]
+            label = ord(char)
+            i = bisect_left(self.labels, label, start, end)
+
+            if i == end or self.labels[i] != label:
+                return -1
+
+            node = self.targets[i]
+
+        return node
+
+    def complete(self, prefix: str, k: int) -> list[tuple[str, int]]:
+        """
+        คืนค่า (ระดับ, รหัส) ของพื้นที่ที่ขึ้นต้นด้วย prefix สูงสุด k รายการ \n
+        Return up to k (level, code) places whose keys start with `prefix`.
+        """
+
+        node = self._find(normalize(prefix))
+
+        if node < 0:
+            return []
+
+        offset = node * self.top_k
+        ids = self.top[offset:offset + min(k, self.top_k)]
+
+        return [self.places[place_id] for place_id in ids if place_id >= 0]
+
+    @classmethod
+    def from_index(cls, index: GeoIndex, top_k: int) -> "PlaceTrie":
+        ranked = []
+
+        for level, entries in zip(LEVELS, (index.provinces, index.districts, index.sub_districts)):
+            for entry in entries.values():
+                keys = set()
+
+                for name in (entry.name_th, entry.name_en):
+                    if not name:
+                        continue
+
+                    name = normalize(name)
+                    keys.add(name)
+
+                    # ให้ค้นหาจากคำถัดไปของชื่อภาษาอังกฤษได้ด้วย เช่น "chiang" ใน "mueang chiang mai"
+                    words = name.split(" ")
+                    for i in range(1, len(words)):
+                        keys.add(" ".join(words[i:]))
+
+                if level == "subdistrict":
+                    keys.add(str(entry.zip_code))
+
+                ranked.append(((LEVELS.index(level), len(entry.name_th), entry.code), (level, entry.code), sorted(keys)))
+
+        ranked.sort(key=lambda item: item[0])
+
+        return cls(
+            places=[place for _, place, _ in ranked],
+            keys=[keys for _, _, keys in ranked],
+            top_k=top_k,
+        )
+
+
+class GeoAutocomplete:
+    """
+    เก็บ trie ที่สร้างจากต้นไม้ข้อมูลพื้นที่รุ่นปัจจุบัน และสร้างใหม่เมื่อข้อมูลพื้นที่เปลี่ยน \n
+    Keeps a trie for the current geo tree version and rebuilds it when the tree changes.
+
+    #### Description
+        การเติมคำอ่านจาก trie และต้นไม้ในหน่วยความจำเท่านั้น ไม่เรียก Postgres (ยกเว้นการโหลดต้นไม้ครั้งแรก)
+        เมื่อต้นไม้เปลี่ยนรุ่น trie ใหม่ถูกสร้างเบื้องหลัง ระหว่างนั้นยังใช้ trie เดิมคู่กับต้นไม้ที่ใช้สร้าง \n
+        Completions are served from the in-memory trie and tree only; Postgres
+        is touched just for the very first tree load. When the tree changes,
+        the new trie is built in the background while the previous trie keeps
+        answering together with the tree it was built from.
+    """
+
+    def __init__(self, top_k: int):
+        self.top_k = top_k
+        self._trie: PlaceTrie | None = None
+        self._index: GeoIndex | None = None
+        self._lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    async def get(self, session: AsyncSession) -> tuple[PlaceTrie, GeoIndex]:
+        index = await geo_cache.get_index(session)
+
+        if self._trie is None:
+            async with self._lock:
+                if self._trie is None:
+                    await self._build(index)
+
+        elif self._index.version != index.version and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._build(index))
+
+        return self._trie, self._index
+
+    async def _build(self, index: GeoIndex) -> None:
+        trie = await asyncio.to_thread(PlaceTrie.from_index, index, self.top_k)
+        self._trie, self._index = trie, index
+
+    async def complete(self, session: AsyncSession, prefix: str, k: int, lang: str | None = None) -> list[dict]:
+        """
+        เติมชื่อพื้นที่อัตโนมัติ พร้อมอำเภอ/จังหวัดที่สังกัด \n
+        Autocomplete a place name and return each match with its parent chain.
+        """
+
+        trie, index = await self.get(session)
+
+        places = (index.place_node(level, code, lang) for level, code in trie.complete(prefix, k))
+
+        return [place for place in places if place]
+
+
+geo_autocomplete = GeoAutocomplete(top_k=settings.GEO_AUTOCOMPLETE_TOP_K)
@@ -0,0 +1,379 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import NamedTuple
+from sqlalchemy.sql import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.core.table_version import get_table_version
+from app.models import District, Geography, Province, SubDistrict
+from app.utilities.app_exceptions import SQLProcessException
+
+logger = logging.getLogger(__name__)
+
+# ตารางที่ต้นไม้ข้อมูลพื้นที่อ่าน: เมื่อเลขรุ่นของตารางใดเปลี่ยน (จาก worker ใดก็ได้) จะโหลดต้นไม้ใหม่
+GEO_TABLES = ("Geography", "Province", "District", "SubDistrict")
+
+
+class GeographyEntry(NamedTuple):
+    code: int
+    name_th: str
+    name_en: str | None
+
+
+class ProvinceEntry(NamedTuple):
+    code: int
+    name_th: str
+    name_en: str | None
+    geography_id: int
+
+
+class DistrictEntry(NamedTuple):
+    code: int
+    name_th: str
+    name_en: str | None
+    province_id: int
+
+
+class SubDistrictEntry(NamedTuple):
+    code: int
+    name_th: str
+    name_en: str | None
+    zip_code: int
+    latitude: float | None
+    longitude: float | None
+    district_id: int
+
+
+class GeoHierarchy(NamedTuple):
+    province: ProvinceEntry
+    district: DistrictEntry
+    sub_district: SubDistrictEntry
+
+
+@dataclass(frozen=True)
+class GeoIndex:
+    """
+    ต้นไม้ ภาค → จังหวัด → อำเภอ → ตำบล แบบอ่านอย่างเดียว \n
+    Immutable Geography → Province → District → SubDistrict tree.
+
+    #### Description
+        เก็บข้อมูลแต่ละระดับตามรหัส (เรียงตามรหัส) และรายการรหัสลูกของแต่ละโหนด
+        เมื่อข้อมูลเปลี่ยนจะสร้างต้นไม้ใหม่ทั้งต้นแล้วสลับแทน ไม่มีการแก้ไขต้นไม้เดิม \n
+        Every level is kept by code (in code order) together with the child codes
+        of each node. A change builds a whole new tree that replaces the old one.
+    """
+
+    geographies: MappingProxyType
+    provinces: MappingProxyType
+    districts: MappingProxyType
+    sub_districts: MappingProxyType
+    geography_provinces: MappingProxyType = MappingProxyType({})
+    province_districts: MappingProxyType = MappingProxyType({})
+    district_sub_districts: MappingProxyType = MappingProxyType({})
+    version: int = 0
+
+    @classmethod
+    def build(
+        cls,
+        geographies: list[GeographyEntry],
+        provinces: list[ProvinceEntry],
+        districts: list[DistrictEntry],
+        sub_districts: list[SubDistrictEntry],
+        version: int = 0,
+    ) -> "GeoIndex":
+        geography_provinces: dict[int, list[int]] = {}
+        province_districts: dict[int, list[int]] = {}
+        district_sub_districts: dict[int, list[int]] = {}
+
+        for entry in provinces:
+            geography_provinces.setdefault(entry.geography_id, []).append(entry.code)
+
+        for entry in districts:
+            province_districts.setdefault(entry.province_id, []).append(entry.code)
+
+        for entry in sub_districts:
+            district_sub_districts.setdefault(entry.district_id, []).append(entry.code)
+
+        def freeze(children: dict[int, list[int]]) -> MappingProxyType:
+            return MappingProxyType({code: tuple(codes) for code, codes in children.items()})
+
+        return cls(
+            geographies=MappingProxyType({entry.code: entry for entry in geographies}),
+            provinces=MappingProxyType({entry.code: entry for entry in provinces}),
+            districts=MappingProxyType({entry.code: entry for entry in districts}),
+            sub_districts=MappingProxyType({entry.code: entry for entry in sub_districts}),
+            geography_provinces=freeze(geography_provinces),
+            province_districts=freeze(province_districts),
+            district_sub_districts=freeze(district_sub_districts),
+            version=version,
+        )
+
+    def districts_of(self, province: int) -> list[DistrictEntry]:
+        return [self.districts[code] for code in self.province_districts.get(province, ())]
+
+    def sub_districts_of(self, district: int) -> list[SubDistrictEntry]:
+        return [self.sub_districts[code] for code in self.district_sub_districts.get(district, ())]
+
+    def resolve(self, province: int, district: int, sub_district: int) -> GeoHierarchy | None:
+        """
+        คืนค่าลำดับชั้นของรหัสที่ระบุ หากตำบลอยู่ในอำเภอ และอำเภออยู่ในจังหวัดนั้นจริง \n
+        Return the hierarchy when the sub-district belongs to the district and the
+        district belongs to the province, otherwise None.
+        """
+
+        sub_district_entry = self.sub_districts.get(sub_district)
+        district_entry = self.districts.get(district)
+        province_entry = self.provinces.get(province)
+
+        if not sub_district_entry or not district_entry or not province_entry:
+            return None
+
+        if sub_district_entry.district_id != district or district_entry.province_id != province:
+            return None
+
+        return GeoHierarchy(province_entry, district_entry, sub_district_entry)
+
+    def place_node(self, level: str, code: int, lang: str | None = None) -> dict | None:
+        """
+        ข้อมูลของพื้นที่ระดับใดก็ได้ พร้อมอำเภอ/จังหวัดที่สังกัด \n
+        Describe a place of any level together with its parent chain.
+        `level` is "province", "district" or "subdistrict".
+        """
+
+        def node(entry) -> dict:
+            return {"code": entry.code, "name": entry.name_en if lang == "en" else entry.name_th}
+
+        if level == "subdistrict":
+            sub_district = self.sub_districts.get(code)
+            if sub_district is None:
+                return None
+
+            district = self.districts[sub_district.district_id]
+
+            return {
+                "level": level,
+                **node(sub_district),
+                "zip_code": sub_district.zip_code,
+                "district": node(district),
+                "province": node(self.provinces[district.province_id]),
+            }
+
+        if level == "district":
+            district = self.districts.get(code)
+            if district is None:
+                return None
+
+            return {"level": level, **node(district), "province": node(self.provinces[district.province_id])}
+
+        province = self.provinces.get(code)
+        if province is None:
+            return None
+
+        return {"level": level, **node(province)}
+
+    def contains(self, province: int, district: int, sub_district: int) -> bool:
+        return (
+            province in self.provinces
+            and district in self.districts
+            and sub_district in self.sub_districts
+        )
+
+
+class GeoCache:
+    """
+    แคชข้อมูลภูมิศาสตร์ในหน่วยความจำของโปรเซส \n
+    In-process cache of the geographic reference data.
+
+    #### Description
+        โหลดข้อมูลจากฐานข้อมูลครั้งแรกที่มีการเรียกใช้ หลังจากนั้นคำขอทุกครั้งอ่านจากหน่วยความจำเท่านั้น
+        เลขรุ่นของตารางพื้นที่ (ตาราง TableVersion ที่ทุก worker ใช้ร่วมกัน) ถูกตรวจเบื้องหลัง
+        อย่างมากทุก `GEO_VERSION_POLL_SECONDS` วินาที และโหลดต้นไม้ใหม่เมื่อเลขรุ่นเปลี่ยนเท่านั้น \n
+        The index is loaded on first use; after that every request is served
+        from memory. The shared versions of GEO_TABLES are checked in the
+        background at most every `GEO_VERSION_POLL_SECONDS`, and the tree is
+        only reloaded when they changed, so a write made through any worker
+        reaches every worker within one poll interval.
+    """
+
+    def __init__(self, poll_seconds: float):
+        self.poll_seconds = poll_seconds
+        self._index: GeoIndex | None = None
+        self._table_versions: tuple[int, ...] | None = None
+        self._checked_at = 0.0
+        self._lock = asyncio.Lock()
+        self._poll_task: asyncio.Task | None = None
+        self._version = 0
+
+    async def get_index(self, session: AsyncSession) -> GeoIndex:
+        index = self._index
+
+        if index is not None:
+            if time.monotonic() - self._checked_at >= self.poll_seconds and (self._poll_task is None or self._poll_task.done()):
+                self._poll_task = asyncio.create_task(self._poll(session.bind))
+            return index
+
+        async with self._lock:
+            if self._index is None:
+                versions = await get_table_version(session, *GEO_TABLES)
+                self._index = await self._load(session)
+                self._table_versions = versions
+                self._checked_at = time.monotonic()
+            return self._index
+
+    async def _poll(self, engine: AsyncEngine) -> None:
+        """
+        ตรวจเลขรุ่นของตารางพื้นที่ และโหลดต้นไม้ใหม่เมื่อข้อมูลถูกแก้ไขจาก worker ใดก็ได้ \n
+        Check the shared versions and swap in a new tree only when they changed.
+        """
+
+        self._checked_at = time.monotonic()
+
+        try:
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                versions = await get_table_version(session, *GEO_TABLES)
+
+                if versions == self._table_versions:
+                    return
+
+                async with self._lock:
+                    index = await self._load(session)
+                    self._index = index
+                    self._table_versions = versions
+
+        except SQLAlchemyError as e:
+            logger.error("Geo index version check failed: %s", e)
+
+    def invalidate(self) -> None:
+        self._index = None
+
+    async def refresh(self, session: AsyncSession) -> None:
+        """
+        สร้างต้นไม้ใหม่จากฐานข้อมูลแล้วสลับแทนต้นเดิม (เรียกหลัง commit ข้อมูลพื้นที่) \n
+        Rebuild the tree and swap it in; called after geo data is committed.
+        Readers keep whichever complete tree they already hold.
+        """
+
+        try:
+            versions = await get_table_version(session, *GEO_TABLES)
+            index = await self._load(session)
+
+        except SQLAlchemyError as e:
+            logger.error("SQLAlchemy error: %s", e)
+            self.invalidate()
+            return
+
+        self._index = index
+        self._table_versions = versions
+        self._checked_at = time.monotonic()
+
+    async def resolve(self, session: AsyncSession, province: int, district: int, sub_district: int) -> GeoHierarchy | None:
+        """
+        แปลงรหัสจังหวัด อำเภอ ตำบล เป็นข้อมูลพร้อมตรวจสอบลำดับชั้น \n
+        Resolve province/district/sub-district codes and check that they nest.
+
+        #### Description
+            ใช้ดัชนีในหน่วยความจำเป็นหลัก หากไม่พบรหัสในดัชนี (เช่น ข้อมูลเพิ่งถูกเพิ่ม)
+            จะค้นหาด้วยคำสั่ง SELECT แบบ join เพียงครั้งเดียว \n
+            Served from the in-memory index; codes missing from the index (for
+            example rows added after it was built) fall back to one joined SELECT.
+        """
+
+        try:
+            index = await self.get_index(session)
+
+            if index.contains(province, district, sub_district):
+                return index.resolve(province, district, sub_district)
+
+            hierarchy = await self._query_hierarchy(session, province, district, sub_district)
+
+        except SQLAlchemyError as e:
+            logger.error("SQLAlchemy error: %s", e)
+            raise SQLProcessException(
+                event=e,
+                message="เกิดข้อผิดพลาดในการดึงข้อมูลพื้นที่",
+            )
+
+        # ดัชนีล้าสมัย ให้โหลดใหม่ในครั้งถัดไป
+        if hierarchy:
+            self.invalidate()
+
+        return hierarchy
+
+    async def _query_hierarchy(self, session: AsyncSession, province: int, district: int, sub_district: int) -> GeoHierarchy | None:
+        stmt = (
+            select(Province, District, SubDistrict)
+            .join(District, District.province_id == Province.code)
+            .join(SubDistrict, SubDistrict.district_id == District.code)
+            .where(
+                Province.code == province,
+                District.code == district,
+                SubDistrict.code == sub_district,
+            )
+        )
+
+        row = (await session.execute(stmt)).first()
+
+        if not row:
+            return None
+
+        province_row, district_row, sub_district_row = row
+
+        return GeoHierarchy(
+            self._province_entry(province_row),
+            self._district_entry(district_row),
+            self._sub_district_entry(sub_district_row),
+        )
+
+    async def _load(self, session: AsyncSession) -> GeoIndex:
+        geographies = (await session.execute(
+            select(Geography.code, Geography.name_th, Geography.name_en).order_by(Geography.code)
+        )).all()
+        provinces = (await session.execute(
+            select(Province.code, Province.name_th, Province.name_en, Province.geography_id)
+            .order_by(Province.code)
+        )).all()
+        districts = (await session.execute(
+            select(District.code, District.name_th, District.name_en, District.province_id)
+            .order_by(District.code)
+        )).all()
+        sub_districts = (await session.execute(
+            select(
+                SubDistrict.code, SubDistrict.name_th, SubDistrict.name_en, SubDistrict.zip_code,
+                SubDistrict.latitude, SubDistrict.longitude, SubDistrict.district_id
+            )
+            .order_by(SubDistrict.code)
+        )).all()
+
+        logger.info(
+            "Geo index loaded: %d provinces, %d districts, %d sub-districts",
+            len(provinces), len(districts), len(sub_districts)
+        )
+
+        self._version += 1
+
+        return GeoIndex.build(
+            version=self._version,
+            geographies=[GeographyEntry(*row) for row in geographies],
+            provinces=[ProvinceEntry(*row) for row in provinces],
+            districts=[DistrictEntry(*row) for row in districts],
+            sub_districts=[SubDistrictEntry(*row) for row in sub_districts],
+        )
+
+    def _province_entry(self, row: Province) -> ProvinceEntry:
+        return ProvinceEntry(row.code, row.name_th, row.name_en, row.geography_id)
+
+    def _district_entry(self, row: District) -> DistrictEntry:
+        return DistrictEntry(row.code, row.name_th, row.name_en, row.province_id)
+
+    def _sub_district_entry(self, row: SubDistrict) -> SubDistrictEntry:
+        return SubDistrictEntry(
+            row.code, row.name_th, row.name_en, row.zip_code, row.latitude, row.longitude, row.district_id
+        )
+
+
+geo_cache = GeoCache(poll_seconds=settings.GEO_VERSION_POLL_SECONDS)
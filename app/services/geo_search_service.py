@@ -0,0 +1,105 @@
+import logging
+from sqlalchemy import Integer, String, desc, func, literal, or_, union_all
+from sqlalchemy.sql import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.models import District, Province, SubDistrict
+from app.schemas.geo_schema import GeoSearchQuerySchema
+from app.services.geo_cache import geo_cache
+from app.utilities.app_exceptions import SQLProcessException
+from app.utilities.app_utilities import LIKE_ESCAPE, contains_pattern
+
+logger = logging.getLogger(__name__)
+
+# ลำดับของระดับพื้นที่ เมื่อคะแนนเท่ากันให้ระดับที่ใหญ่กว่าขึ้นก่อน
+LEVEL_ORDER = {"province": 0, "district": 1, "subdistrict": 2}
+
+class GeoSearchService:
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def search(self, query: GeoSearchQuerySchema) -> list[dict]:
+        """
+        ค้นหาชื่อจังหวัด อำเภอ ตำบล พร้อมกัน เรียงตามความคล้าย (pg_trgm) \n
+        Search province, district and sub-district names at once, ranked by
+        trigram similarity, and attach the parent chain of every match.
+
+        #### Parameters
+            query: GeoSearchQuerySchema => คำค้นหา ระดับพื้นที่ จำนวนผลลัพธ์ และภาษา
+
+        #### Returns
+            list[dict] => ผลการค้นหาพร้อมข้อมูลอำเภอ/จังหวัดที่สังกัด
+        """
+
+        try:
+            levels = {
+                "province": Province,
+                "district": District,
+                "subdistrict": SubDistrict,
+            }
+
+            if query.level:
+                levels = {query.level: levels[query.level]}
+
+            stmt = union_all(*(
+                self._level_statement(level, model, query.q)
+                for level, model in levels.items()
+            )).subquery()
+
+            stmt = (
+                select(stmt)
+                .order_by(desc(stmt.c.score), stmt.c.level_order, stmt.c.code)
+                .limit(query.limit)
+            )
+
+            rows = (await self.session.execute(stmt)).all()
+            index = await geo_cache.get_index(self.session)
+
+            places = []
+
+            for row in rows:
+                place = index.place_node(row.level, row.code, query.type)
+
+                # แถวที่ยังไม่มีในต้นไม้ (เพิ่งถูกเพิ่ม) จะถูกข้ามไปจนกว่าต้นไม้จะถูกสร้างใหม่
+                if place:
+                    places.append({**place, "score": float(row.score)})
+
+            return places
+
+        except SQLAlchemyError as e:
+            logger.error("SQLAlchemy error: %s", e)
+            raise SQLProcessException(
+                event=e,
+                message="เกิดข้อผิดพลาดในการค้นหาข้อมูลพื้นที่",
+            )
+
+    def _level_statement(self, level: str, model, q: str):
+        """
+        คำสั่ง SELECT ของแต่ละระดับ ใช้ได้ทั้งตัวดำเนินการ % และ ILIKE ผ่าน GIN index \n
+        One SELECT per level; both `%` and ILIKE are served by the trigram GIN indexes.
+        """
+
+        score = func.greatest(
+            func.similarity(model.name_th, q),
+            func.coalesce(func.similarity(model.name_en, q), 0),
+        )
+
+        # % และ _ ในคำค้นต้องตรงตามตัวอักษร ไม่เช่นนั้น q="%" จะตรงกับทุกแถว
+        pattern = contains_pattern(q)
+
+        return (
+            select(
+                literal(level, String).label("level"),
+                literal(LEVEL_ORDER[level], Integer).label("level_order"),
+                model.code.label("code"),
+                score.label("score"),
+            )
+            .where(or_(
+                model.name_th.op("%")(q),
+                model.name_en.op("%")(q),
+                model.name_th.ilike(pattern, escape=LIKE_ESCAPE),
+                model.name_en.ilike(pattern, escape=LIKE_ESCAPE),
+            ))
+        )
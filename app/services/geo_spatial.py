@@ -0,0 +1,198 @@
+import asyncio
+import logging
+import math
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.services.geo_cache import GeoIndex, geo_cache
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+
+
+def haversine_km(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    lat1, lon1 = math.radians(lat), math.radians(lon)
+    lat2, lon2 = np.radians(lats), np.radians(lons)
+
+    a = np.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+class SubDistrictGrid:
+    """
+    ดัชนีเชิงพื้นที่แบบ grid สม่ำเสมอของพิกัดตำบล \n
+    Uniform-grid spatial index over sub-district coordinates.
+
+    #### Description
+        จุดถูกจัดเรียงตามช่อง grid (ขนาด `cell_degrees` องศา) และเก็บตำแหน่งเริ่มต้นของแต่ละช่อง
+        การค้นหาจะขยายวงของช่องรอบจุดที่ต้องการ จนได้ k จุดที่ใกล้ที่สุดแน่นอน \n
+        Points are sorted by grid cell and `cell_start` holds each cell's offset.
+        A query scans rings of cells around the point and stops once no
+        unscanned cell can hold anything closer than the current k-th best.
+    """
+
+    def __init__(self, codes: np.ndarray, lats: np.ndarray, lons: np.ndarray, cell_degrees: float):
+        self.cell_degrees = cell_degrees
+
+        if len(codes) == 0:
+            self.codes = codes
+            self.lats = lats
+            self.lons = lons
+            self.rows = self.cols = 0
+            return
+
+        self.min_lat = float(lats.min())
+        self.min_lon = float(lons.min())
+        self.rows = int((lats.max() - self.min_lat) // cell_degrees) + 1
+        self.cols = int((lons.max() - self.min_lon) // cell_degrees) + 1
+
+        # ระยะทางขั้นต่ำ (กม.) ต่อองศาภายในพื้นที่ ใช้เป็นขอบเขตล่างของช่องที่ยังไม่ได้ค้น
+        max_abs_lat = max(abs(float(lats.min())), abs(float(lats.max())))
+        self.min_km_per_degree = math.radians(1) * EARTH_RADIUS_KM * math.cos(math.radians(max_abs_lat))
+
+        cells = self._cell_row(lats) * self.cols + self._cell_col(lons)
+        order = np.argsort(cells, kind="stable")
+
+        self.codes = codes[order]
+        self.lats = lats[order]
+        self.lons = lons[order]
+        self.cell_start = np.searchsorted(cells[order], np.arange(self.rows * self.cols + 1))
+
+    def _cell_row(self, lats):
+        return np.clip(((lats - self.min_lat) // self.cell_degrees).astype(np.int64), 0, self.rows - 1)
+
+    def _cell_col(self, lons):
+        return np.clip(((lons - self.min_lon) // self.cell_degrees).astype(np.int64), 0, self.cols - 1)
+
+    def _ring(self, row: int, col: int, radius: int) -> list[int]:
+        """
+        ดัชนีของจุดในช่องที่อยู่ห่างจากช่อง (row, col) พอดี radius ช่อง \n
+        Point positions in the cells exactly `radius` cells away from (row, col).
+        """
+
+        positions = []
+
+        for r in range(max(row - radius, 0), min(row + radius, self.rows - 1) + 1):
+            if abs(r - row) == radius:
+                cols = range(max(col - radius, 0), min(col + radius, self.cols - 1) + 1)
+            else:
+                cols = [c for c in (col - radius, col + radius) if 0 <= c < self.cols]
+
+            for c in cols:
+                cell = r * self.cols + c
+                positions.extend(range(self.cell_start[cell], self.cell_start[cell + 1]))
+
+        return positions
+
+    def nearest(self, lat: float, lon: float, k: int) -> list[tuple[int, float]]:
+        """
+        คืนค่า (รหัสตำบล, ระยะทาง กม.) ของ k ตำบลที่ใกล้ที่สุด เรียงจากใกล้ไปไกล \n
+        Return the k nearest (sub-district code, distance in km), nearest first.
+        """
+
+        if len(self.codes) == 0:
+            return []
+
+        k = min(k, len(self.codes))
+        row = int(self._cell_row(np.asarray(lat)))
+        col = int(self._cell_col(np.asarray(lon)))
+        max_radius = max(row, self.rows - 1 - row, col, self.cols - 1 - col)
+        km_per_degree = min(
+            self.min_km_per_degree,
+            math.radians(1) * EARTH_RADIUS_KM * math.cos(math.radians(min(abs(lat), 89.9)))
+        )
+
+        candidates: list[int] = []
+        distances = np.empty(0)
+
+        for radius in range(max_radius + 1):
+            ring = self._ring(row, col, radius)
+
+            if ring:
+                candidates.extend(ring)
+                distances = np.concatenate([
+                    distances,
+                    haversine_km(lat, lon, self.lats[ring], self.lons[ring])
+                ])
+
+            # จุดในช่องที่ยังไม่ได้ค้นอยู่ห่างอย่างน้อย radius ช่องเสมอ
+            if len(candidates) >= k:
+                kth = np.partition(distances, k - 1)[k - 1]
+                if kth <= radius * self.cell_degrees * km_per_degree:
+                    break
+
+        best = np.argsort(distances, kind="stable")[:k]
+
+        return [(int(self.codes[candidates[i]]), float(distances[i])) for i in best]
+
+    @classmethod
+    def from_index(cls, index: GeoIndex, cell_degrees: float) -> "SubDistrictGrid":
+        located = [
+            entry for entry in index.sub_districts.values()
+            if entry.latitude is not None and entry.longitude is not None
+        ]
+
+        grid = cls(
+            codes=np.array([entry.code for entry in located], dtype=np.int64),
+            lats=np.array([entry.latitude for entry in located], dtype=float),
+            lons=np.array([entry.longitude for entry in located], dtype=float),
+            cell_degrees=cell_degrees,
+        )
+
+        logger.info("Sub-district grid built: %d points, %dx%d cells", len(located), grid.rows, grid.cols)
+
+        return grid
+
+
+class GeoSpatial:
+    """
+    เก็บ grid ที่สร้างจากต้นไม้ข้อมูลพื้นที่รุ่นปัจจุบัน และสร้างใหม่เมื่อข้อมูลพื้นที่เปลี่ยน \n
+    Keeps a grid for the current geo tree version and rebuilds it when the tree changes.
+    """
+
+    def __init__(self, cell_degrees: float):
+        self.cell_degrees = cell_degrees
+        self._grid: SubDistrictGrid | None = None
+        self._version: int | None = None
+        self._lock = asyncio.Lock()
+
+    async def get(self, session: AsyncSession) -> tuple[SubDistrictGrid, GeoIndex]:
+        index = await geo_cache.get_index(session)
+
+        if self._version != index.version:
+            async with self._lock:
+                if self._version != index.version:
+                    self._grid = SubDistrictGrid.from_index(index, self.cell_degrees)
+                    self._version = index.version
+
+        return self._grid, index
+
+    async def nearby(self, session: AsyncSession, lat: float, lon: float, k: int, lang: str | None = None) -> list[dict]:
+        """
+        ตำบลที่ใกล้จุดพิกัดที่สุด k ตำบล พร้อมอำเภอ/จังหวัดที่สังกัดและระยะทาง \n
+        The k sub-districts nearest to a point, with their parent chain and distance.
+        """
+
+        grid, index = await self.get(session)
+
+        places = []
+
+        for code, distance in grid.nearest(lat, lon, k):
+            place = index.place_node("subdistrict", code, lang)
+
+            if place:
+                sub_district = index.sub_districts[code]
+                places.append({
+                    **place,
+                    "latitude": sub_district.latitude,
+                    "longitude": sub_district.longitude,
+                    "distance_km": round(distance, 3),
+                })
+
+        return places
+
+
+geo_spatial = GeoSpatial(cell_degrees=settings.GEO_GRID_CELL_DEGREES)
@@ -3,8 +3,10 @@ from sqlalchemy.sql import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError
 
+from app.core.table_version import bump_table_version
 from app.models import Geography
 from app.schemas import BaseCreateSchema
+from app.services.geo_cache import geo_cache
 from app.utilities.app_exceptions import SQLProcessException, ServerProcessException
 
 # Configure logging
@@ -78,8 +80,10 @@ class GeographyService:
             )
 
             self.session.add(new_geography)
+            await bump_table_version(self.session, "Geography")
             await self.session.commit()
-            self.session.refresh(new_geography)
+            await self.session.refresh(new_geography)
+            await geo_cache.refresh(self.session)
 
             return new_geography
         
@@ -97,23 +101,25 @@ class GeographyService:
             raise ServerProcessException(message="เกิดข้อผิดพลาดที่ไม่รู้จัก")
             
     
-    def update_geography(self, geography_id: str, geography: BaseCreateSchema):
+    async def update_geography(self, geography_id: str, geography: BaseCreateSchema):
 
         try:
-            stmp = select(Geography).where(Geography.id == geography_id)
-            result = self.session.execute(stmp)
+            stmp = select(Geography).where(Geography.code == geography_id)
+            result = await self.session.execute(stmp)
             current_geography = result.scalars().first()
 
             current_geography.name_th = geography.name_th
             current_geography.name_en = geography.name_en
 
-            self.session.commit()
-            self.session.refresh(current_geography)
+            await bump_table_version(self.session, "Geography")
+            await self.session.commit()
+            await self.session.refresh(current_geography)
+            await geo_cache.refresh(self.session)
 
             return current_geography
         
         except SQLAlchemyError as e:
-            self.session.rollback()
+            await self.session.rollback()
             logger.error("SQLAlchemy error: %s", e)
             raise SQLProcessException(
                 event=e,
@@ -121,29 +127,30 @@ class GeographyService:
             )
         
         except Exception as e:
-            self.session.rollback()
+            await self.session.rollback()
             logger.error("Unknown error: %s", e)
             raise ServerProcessException(message="เกิดข้อผิดพลาดที่ไม่รู้จัก")
     
-    def delete_geography(self, geography_id: str):
+    async def delete_geography(self, geography_id: str):
         """
         Delete geography by id\n
         ลบข้อมูลภูมิศาสตร์โดยใช้ ID\n
         
         """
         try:
-            stmp = select(Geography).where(Geography.id == geography_id)
-            result = self.session.execute(stmp)
+            stmp = select(Geography).where(Geography.code == geography_id)
+            result = await self.session.execute(stmp)
             current_geography = result.scalars().first()
 
-            self.session.delete(current_geography)
-            self.session.commit()
-            self.session.refresh(current_geography)
+            await self.session.delete(current_geography)
+            await bump_table_version(self.session, "Geography")
+            await self.session.commit()
+            await geo_cache.refresh(self.session)
 
             return current_geography
         
         except SQLAlchemyError as e:
-            self.session.rollback()
+            await self.session.rollback()
             logger.error("SQLAlchemy error: %s", e)
             raise SQLProcessException(
                 event=e,
@@ -151,6 +158,6 @@ class GeographyService:
             )
         
         except Exception as e:
-            self.session.rollback()
+            await self.session.rollback()
             logger.error("Unknown error: %s", e)
             raise ServerProcessException(message="เกิดข้อผิดพลาดที่ไม่รู้จัก")
@@ -0,0 +1,226 @@
+import logging
+import math
+from typing import NamedTuple
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.sql import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.core.table_version import get_table_version
+from app.models import RubberFarmRollup
+from app.schemas.geo_schema import MapClusterQuerySchema
+from app.services.geo_cache import geo_cache
+from app.utilities.app_cache import DependencyCache
+from app.utilities.app_exceptions import InvalidInputException, SQLProcessException
+
+logger = logging.getLogger(__name__)
+
+# ละติจูดสูงสุดของ Web Mercator
+MERCATOR_MAX_LAT = 85.05112878
+
+# ตารางที่กลุ่มจุดบนแผนที่อ่าน (พิกัดตำบล และจำนวนแปลงยางจากตารางสรุป)
+MAP_TABLES = ("SubDistrict", "RubberFarmRollup")
+
+# แคชของจุดตำบล และกลุ่มจุดของแต่ละ tile (zoom, x, y)
+map_cluster_cache = DependencyCache(
+    max_size=settings.MAP_CLUSTER_CACHE_SIZE,
+    ttl=settings.MAP_CLUSTER_CACHE_TTL_SECONDS,
+)
+
+
+class MapPoints(NamedTuple):
+    codes: np.ndarray
+    lats: np.ndarray
+    lons: np.ndarray
+    # ตำแหน่งบนแผนที่ Web Mercator ในช่วง [0, 1)
+    xs: np.ndarray
+    ys: np.ndarray
+    farm_counts: np.ndarray
+    rubber_areas: np.ndarray
+
+
+def mercator_x(lons: np.ndarray) -> np.ndarray:
+    return (np.asarray(lons, dtype=float) + 180.0) / 360.0
+
+
+def mercator_y(lats: np.ndarray) -> np.ndarray:
+    lats = np.radians(np.clip(np.asarray(lats, dtype=float), -MERCATOR_MAX_LAT, MERCATOR_MAX_LAT))
+    return (1.0 - np.arcsinh(np.tan(lats)) / math.pi) / 2.0
+
+
+def parse_bbox(bbox: str) -> tuple[float, float, float, float]:
+    """
+    แปลง bbox "min_lon,min_lat,max_lon,max_lat" \n
+    Parse a "min_lon,min_lat,max_lon,max_lat" bounding box.
+    """
+
+    try:
+        min_lon, min_lat, max_lon, max_lat = (float(value) for value in bbox.split(","))
+    except ValueError:
+        raise InvalidInputException(message="bbox ต้องอยู่ในรูปแบบ min_lon,min_lat,max_lon,max_lat")
+
+    if not (-180 <= min_lon <= max_lon <= 180 and -90 <= min_lat <= max_lat <= 90):
+        raise InvalidInputException(message="ขอบเขตของ bbox ไม่ถูกต้อง")
+
+    return min_lon, min_lat, max_lon, max_lat
+
+
+def tile_clusters(points: MapPoints, zoom: int, tile_x: int, tile_y: int, cells: int) -> list[dict]:
+    """
+    รวมจุดตำบลใน tile เดียวเป็นกลุ่มตาม grid ขนาด cells × cells \n
+    Aggregate the points of one tile into a `cells` × `cells` grid.
+
+    #### Description
+        ช่องของ grid อยู่ภายใน tile เสมอ ผลของแต่ละ tile จึงแคชแยกกันได้และไม่ซ้อนกัน
+        จำนวนกลุ่มต่อ tile ไม่เกิน cells² ไม่ว่าจะมีจุดมากเท่าใด \n
+        Grid cells never cross tile edges, so tiles are cached independently
+        and never overlap. A tile yields at most cells² clusters however many
+        points it holds.
+    """
+
+    scale = 2 ** zoom
+    xs = points.xs * scale - tile_x
+    ys = points.ys * scale - tile_y
+    inside = (xs >= 0) & (xs < 1) & (ys >= 0) & (ys < 1)
+
+    if not inside.any():
+        return []
+
+    cell_keys = (ys[inside] * cells).astype(np.int64) * cells + (xs[inside] * cells).astype(np.int64)
+    keys, inverse = np.unique(cell_keys, return_inverse=True)
+
+    counts = np.bincount(inverse)
+    lats = np.bincount(inverse, weights=points.lats[inside]) / counts
+    lons = np.bincount(inverse, weights=points.lons[inside]) / counts
+    farm_counts = np.bincount(inverse, weights=points.farm_counts[inside])
+    rubber_areas = np.bincount(inverse, weights=points.rubber_areas[inside])
+
+    # กลุ่มที่มีตำบลเดียว ส่งรหัสตำบลไปด้วย
+    codes = np.full(len(keys), -1, dtype=np.int64)
+    singles = counts[inverse] == 1
+    codes[inverse[singles]] = points.codes[inside][singles]
+
+    return [
+        {
+            "latitude": lat,
+            "longitude": lon,
+            "count": count,
+            "farm_count": int(farm_count),
+            "rubber_area": rubber_area,
+            "code": code if code >= 0 else None,
+        }
+        for lat, lon, count, farm_count, rubber_area, code in zip(
+            lats.tolist(), lons.tolist(), counts.tolist(), farm_counts.tolist(), rubber_areas.tolist(), codes.tolist()
+        )
+    ]
+
+
+class MapClusterService:
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def get_clusters(self, query: MapClusterQuerySchema) -> list[dict]:
+        """
+        กลุ่มของตำบลในขอบเขตที่มองเห็น ตามระดับ zoom พร้อมจำนวนแปลงยางและพื้นที่ปลูกรวม \n
+        Clusters of sub-districts in the visible bounding box at a zoom level,
+        with their farm count, total rubber area and centroid.
+
+        #### Parameters
+            query: MapClusterQuerySchema => bbox (min_lon,min_lat,max_lon,max_lat) และ zoom
+
+        #### Description
+            แบ่งแผนที่เป็น tile แบบ Web Mercator ตาม zoom และแต่ละ tile เป็น grid
+            (`MAP_CLUSTER_CELLS_PER_TILE` ช่องต่อด้าน) ผลของแต่ละ tile ถูกแคชจนกว่าตำบลหรือตารางสรุปจะเปลี่ยน
+            คืนเฉพาะกลุ่มที่จุดศูนย์กลางอยู่ใน bbox \n
+            The map is split into Web Mercator tiles for the zoom, and each tile
+            into a grid of `MAP_CLUSTER_CELLS_PER_TILE` cells per side. Tiles are
+            cached until sub-districts or the farm rollups change. Only clusters
+            whose centroid falls inside the bbox are returned.
+
+        #### Returns
+            list[dict] => latitude, longitude, count, farm_count, rubber_area และ code (เมื่อกลุ่มมีตำบลเดียว)
+        """
+
+        min_lon, min_lat, max_lon, max_lat = parse_bbox(query.bbox)
+        scale = 2 ** query.zoom
+
+        # y ของ Mercator เพิ่มขึ้นจากเหนือลงใต้
+        first_x, last_x = (min(int(x * scale), scale - 1) for x in mercator_x([min_lon, max_lon]))
+        first_y, last_y = (min(int(y * scale), scale - 1) for y in mercator_y([max_lat, min_lat]))
+
+        tile_count = (last_x - first_x + 1) * (last_y - first_y + 1)
+
+        if tile_count > settings.MAP_CLUSTER_MAX_TILES:
+            raise InvalidInputException(message="ขอบเขตที่ขอกว้างเกินไปสำหรับระดับ zoom นี้")
+
+        # อ่านเลขรุ่นครั้งเดียว ใช้ร่วมกันทุก tile ของคำขอนี้
+        versions = await get_table_version(self.session, *MAP_TABLES)
+        points = await map_cluster_cache.get_or_set(self.session, ("points",), MAP_TABLES, self._load_points, versions)
+
+        clusters = []
+
+        for tile_x in range(first_x, last_x + 1):
+            for tile_y in range(first_y, last_y + 1):
+                async def compute(tile_x=tile_x, tile_y=tile_y):
+                    return tile_clusters(points, query.zoom, tile_x, tile_y, settings.MAP_CLUSTER_CELLS_PER_TILE)
+
+                tile = await map_cluster_cache.get_or_set(
+                    self.session, ("tile", query.zoom, tile_x, tile_y), MAP_TABLES, compute, versions
+                )
+
+                clusters.extend(
+                    cluster for cluster in tile
+                    if min_lon <= cluster["longitude"] <= max_lon and min_lat <= cluster["latitude"] <= max_lat
+                )
+
+        return clusters
+
+    async def _load_points(self) -> MapPoints:
+        """
+        พิกัดของตำบล (จากต้นไม้ข้อมูลพื้นที่) พร้อมจำนวนแปลงยางและพื้นที่ปลูกรวมจากตารางสรุประดับตำบล \n
+        Sub-district coordinates from the geo tree, with farm counts and
+        total rubber area from the sub-district rollups.
+        """
+
+        index = await geo_cache.get_index(self.session)
+
+        stmt = (
+            select(
+                RubberFarmRollup.geo_code,
+                func.sum(RubberFarmRollup.farm_count).label("farm_count"),
+                func.coalesce(func.sum(RubberFarmRollup.rubber_area_sum), 0).label("rubber_area"),
+            )
+            .where(RubberFarmRollup.level == "subdistrict")
+            .group_by(RubberFarmRollup.geo_code)
+        )
+
+        try:
+            farms = {row.geo_code: row for row in (await self.session.execute(stmt)).all()}
+
+        except SQLAlchemyError as e:
+            logger.error("SQLAlchemy error: %s", e)
+            raise SQLProcessException(
+                event=e,
+                message="เกิดข้อผิดพลาดในการดึงข้อมูลแปลงยางรายตำบล",
+            )
+
+        located = [
+            entry for entry in index.sub_districts.values()
+            if entry.latitude is not None and entry.longitude is not None
+        ]
+
+        lats = np.array([entry.latitude for entry in located], dtype=float)
+        lons = np.array([entry.longitude for entry in located], dtype=float)
+
+        return MapPoints(
+            codes=np.array([entry.code for entry in located], dtype=np.int64),
+            lats=lats,
+            lons=lons,
+            xs=mercator_x(lons),
+            ys=mercator_y(lats),
+            farm_counts=np.array([farms[entry.code].farm_count if entry.code in farms else 0 for entry in located], dtype=float),
+            rubber_areas=np.array([farms[entry.code].rubber_area if entry.code in farms else 0 for entry in located], dtype=float),
+        )
@@ -0,0 +1,92 @@
+import logging
+import os
+import pickle
+import re
+import threading
+from types import MappingProxyType
+
+logger = logging.getLogger(__name__)
+
+ENCODER_DIR = os.path.join(os.path.dirname(__file__), 'encoder_files')
+
+# <artifact>.pkl => version 1, <artifact>_<version>.pkl => version <version>
+_ARTIFACT_FILE = re.compile(r"^(?P<artifact>.+?)(?:_(?P<version>\d+))?\.pkl$")
+
+
+class ModelRegistry:
+    """
+    ทะเบียนไฟล์ encoder / scaler ของโมเดลที่โหลดครั้งเดียวต่อโปรเซส \n
+    Process-wide registry of the pickled encoder and scaler artifacts.
+
+    #### Description
+        โหลดทุกไฟล์ใน `encoder_files/<model>/` เพียงครั้งเดียว (ตอนเริ่มระบบหรือเมื่อเรียกใช้ครั้งแรก)
+        และเก็บไว้ตาม (model, artifact, version) \n
+        Every file under `encoder_files/<model>/` is unpickled once and kept by
+        (model, artifact, version). Dict artifacts are handed out as read-only
+        mappings so callers cannot mutate the shared copy.
+    """
+
+    def __init__(self, base_dir: str = ENCODER_DIR):
+        self.base_dir = base_dir
+        self._artifacts: dict[tuple[str, str, int], object] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+        self.generation = 0
+
+    def load(self) -> None:
+        """
+        โหลดไฟล์ทั้งหมดจากไดเรกทอรี (เรียกซ้ำเพื่อโหลดใหม่) \n
+        Load (or reload) every artifact from the directory.
+        """
+
+        artifacts = {}
+
+        for model_name in sorted(os.listdir(self.base_dir)):
+            model_dir = os.path.join(self.base_dir, model_name)
+
+            if not os.path.isdir(model_dir):
+                continue
+
+            for file_name in sorted(os.listdir(model_dir)):
+                match = _ARTIFACT_FILE.match(file_name)
+
+                if not match:
+                    continue
+
+                artifact = match.group("artifact")
+                version = int(match.group("version") or 1)
+
+                with open(os.path.join(model_dir, file_name), 'rb') as f:
+                    value = pickle.load(f)
+
+                if isinstance(value, dict):
+                    value = MappingProxyType(value)
+
+                artifacts[(model_name, artifact, version)] = value
+
+        with self._lock:
+            self._artifacts = artifacts
+            self._loaded = True
+            self.generation += 1
+
+        logger.info("Loaded %d model artifacts from %s", len(artifacts), self.base_dir)
+
+    def get(self, model_name: str, artifact: str, version: int):
+        """
+        ดึง artifact ที่โหลดไว้แล้ว \n
+        Return a shared reference to a loaded artifact.
+        """
+
+        if not self._loaded:
+            self.load()
+
+        try:
+            return self._artifacts[(model_name, artifact, version)]
+        except KeyError:
+            raise KeyError(f"Model artifact not found: {model_name}/{artifact}_{version}")
+
+    def keys(self) -> list[tuple[str, str, int]]:
+        return list(self._artifacts.keys())
+
+
+model_registry = ModelRegistry()
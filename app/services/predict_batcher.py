@@ -0,0 +1,96 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+SendPredict = Callable[[str, dict], Awaitable[dict]]
+
+
+class PredictBatcher:
+    """
+    รวมคำขอทำนายผลรายการเดียวที่เข้ามาพร้อมกันให้เป็นคำขอเดียว \n
+    In-process micro-batching dispatcher for single-instance predictions.
+
+    #### Description
+        คำขอที่ส่งไปยังโมเดล (url) เดียวกันภายในช่วงเวลา `window_ms` จะถูกรวมเป็น `instances`
+        ชุดเดียว แล้วแจกผลลัพธ์ `predictions` กลับไปยังผู้เรียกแต่ละราย \n
+        Requests for the same model URL that arrive within `window_ms` (or until
+        `max_batch_size` is reached) are sent as one `instances` array and the
+        `predictions` are fanned back out to the waiting callers in order.
+    """
+
+    def __init__(self, window_ms: float, max_batch_size: int):
+        self.window = window_ms / 1000
+        self.max_batch_size = max_batch_size
+        self._pending: dict[str, list[tuple[dict, asyncio.Future]]] = {}
+        self._timers: dict[str, asyncio.TimerHandle] = {}
+        self._send: dict[str, SendPredict] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+    async def predict(self, url: str, instance: dict, send: SendPredict):
+        """
+        ส่ง instance เข้าคิวและรอผลทำนายของ instance นั้น \n
+        Queue one instance and wait for its prediction.
+        """
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        pending = self._pending.setdefault(url, [])
+        pending.append((instance, future))
+        self._send.setdefault(url, send)
+
+        if len(pending) >= self.max_batch_size:
+            self._flush(url)
+        elif len(pending) == 1:
+            self._timers[url] = loop.call_later(self.window, self._flush, url)
+
+        return await future
+
+    def _flush(self, url: str) -> None:
+        timer = self._timers.pop(url, None)
+        if timer:
+            timer.cancel()
+
+        batch = self._pending.pop(url, [])
+        send = self._send.pop(url, None)
+
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._dispatch(url, batch, send))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, url: str, batch: list[tuple[dict, asyncio.Future]], send: SendPredict) -> None:
+        payload = {
+            "signature_name": "serving_default",
+            "instances": [instance for instance, _ in batch]
+        }
+
+        try:
+            response = await send(url, payload)
+            predictions = response["predictions"]
+
+            if len(predictions) != len(batch):
+                raise ValueError(f"Expected {len(batch)} predictions, got {len(predictions)}")
+
+        except Exception as e:
+            logger.error("Micro-batch of %d instances failed: %s", len(batch), e)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), prediction in zip(batch, predictions):
+            if not future.done():
+                future.set_result(prediction)
+
+
+predict_batcher = PredictBatcher(
+    window_ms=settings.PREDICT_MICROBATCH_WINDOW_MS,
+    max_batch_size=settings.PREDICT_MICROBATCH_MAX_SIZE,
+)
@@ -1,181 +1,341 @@
+import asyncio
 import logging
-import os
-import pickle
-import requests
+import httpx
 import numpy as np
+import orjson
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.schemas import SuitablePredictSchema
 from app.core.config import settings
+from app.core.predict_client import get_predict_client
 from app.schemas.predict_schema import ProductPredictSchema
-from app.utilities.app_exceptions import ServerProcessException
+from app.services.encoder_index import ProductEncoderIndex, product_encoder_index
+from app.services.model_registry import model_registry
+from app.services.predict_batcher import predict_batcher
+from app.services.suitability_rules import EVALUATION_ORDER, suitability_rules
+from app.utilities.app_cache import TTLCache
+from app.utilities.app_exceptions import InvalidInputException, ServerProcessException
 
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
+
+# แคชผลทำนายของแต่ละ instance ที่ผ่านการ encode / scale แล้ว (ใช้ร่วมกันทั้งโปรเซส)
+prediction_cache = TTLCache(
+    max_size=settings.PREDICT_CACHE_SIZE,
+    ttl=settings.PREDICT_CACHE_TTL_SECONDS,
+)
+_CACHE_MISS = object()
+
 class PredictService:
 
+    # ชื่อโมเดลบน TF-Serving และไดเรกทอรี encoder ที่ใช้คู่กัน
+    PRODUCT_MODEL = "model_product"
+    PRODUCT_ENCODER_DIR = "model_product"
+    SUITABILITY_MODEL = "model_suitability"
+    SUITABILITY_ENCODER_DIR = "model_classify"
+
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    def get_url_predict(self, url, payload, headers = {"Content-Type": "application/json"}):
+    async def get_url_predict(self, url, payload):
         """
         รับ url และ payload จากผู้ใช้และส่งไปยัง API ทำนายผลผลิต \n
         Get the url and payload from the user and send it to the prediction API.
         """
-        payload = requests.post(url=f'{settings.PREDICT_API_URL}{url}', json=payload, headers=headers)
-        return payload.json()
+
+        try:
+            response = await get_predict_client().post(url, json=payload)
+            response.raise_for_status()
+
+        except httpx.HTTPStatusError as e:
+            logger.error("Prediction API error: %s", e)
+            raise ServerProcessException(
+                message=f"บริการทำนายผลตอบกลับข้อผิดพลาด (HTTP {e.response.status_code})"
+            )
+
+        except httpx.HTTPError as e:
+            logger.error("Prediction API error: %s", e)
+            raise ServerProcessException(message="ไม่สามารถเชื่อมต่อกับบริการทำนายผลได้")
+
+        # เนื้อหาที่ไม่ใช่ JSON หรือไม่มี "predictions" ถือเป็นข้อผิดพลาดของบริการทำนายผล
+        try:
+            body = response.json()
+            body["predictions"]
+
+        except (ValueError, KeyError, TypeError) as e:
+            logger.error("Invalid prediction API response (HTTP %s): %r", response.status_code, e)
+            raise ServerProcessException(
+                message=f"บริการทำนายผลตอบกลับข้อมูลไม่ถูกต้อง (HTTP {response.status_code})"
+            )
+
+        return body
     
-    def load_encoder(self, encode_path: str):
+    def load_encoder(self, model_dir: str, artifact: str, version: int):
         """
-        โหลดไฟล์ encoder จากไดเรกทอรี \n
-        Load the encoder file from the directory.
+        ดึง encoder ที่โหลดไว้แล้วจาก model registry \n
+        Get the shared encoder instance from the model registry.
         """
-        
-        encode_path = os.path.join(os.path.dirname(__file__), 'encoder_files/', encode_path)
-        
-        with open(encode_path, 'rb') as f:
-            encoders = pickle.load(f)
-        return encoders
+
+        return model_registry.get(model_dir, artifact, version)
     
-    def get_product(self, data: ProductPredictSchema):
+    def _model_url(self, model_name: str, version: int) -> str:
+        return f'/v1/models/{model_name}/versions/{version}:predict'
+
+    def _cache_key(self, model_name: str, version: int, instance: dict) -> tuple:
+        """
+        สร้าง key ของแคชจาก instance ที่ encode แล้ว รุ่นของโมเดล และรุ่นของ encoder \n
+        Build the cache key from the encoded instance, the model version and the
+        registry generation, so reloading the encoders or bumping the model
+        version never serves an old prediction.
+        """
+
+        return (
+            model_name,
+            version,
+            model_registry.generation,
+            orjson.dumps(instance, option=orjson.OPT_SORT_KEYS)
+        )
+
+    async def _predict_instances(self, model_name: str, version: int, instances: list) -> list:
+        """
+        ทำนายผล instances โดยใช้ผลจากแคชก่อน และส่งเฉพาะรายการที่ไม่มีในแคชไปยัง API \n
+        Predict the instances, serving cached predictions first and sending only
+        the misses to the prediction API.
+        """
+
+        keys = [self._cache_key(model_name, version, instance) for instance in instances]
+        predictions = [prediction_cache.get(key, _CACHE_MISS) for key in keys]
+        missing = [i for i, prediction in enumerate(predictions) if prediction is _CACHE_MISS]
+
+        if missing:
+            fetched = await self._send_instances(
+                url=self._model_url(model_name, version),
+                instances=[instances[i] for i in missing]
+            )
+
+            for i, prediction in zip(missing, fetched):
+                predictions[i] = prediction
+                prediction_cache.set(keys[i], prediction)
+
+        return predictions
+
+    def cache_stats(self) -> dict:
+        return prediction_cache.stats()
+
+    async def _send_instances(self, url: str, instances: list) -> list:
+        """
+        ส่ง instances ไปยัง API ทำนายผลและคืนค่า predictions ตามลำดับ \n
+        Send the instances to the prediction API and return the predictions in order.
+
+        #### Description
+            คำขอรายการเดียวจะผ่าน micro-batcher เพื่อรวมกับคำขออื่นที่เข้ามาพร้อมกัน
+            ส่วนคำขอหลายรายการจะถูกแบ่งส่งครั้งละไม่เกิน PREDICT_BATCH_CHUNK_SIZE รายการ \n
+            A single instance goes through the micro-batcher so it can share a
+            request with concurrent callers; larger lists are sent in chunks.
+        """
+
+        if len(instances) == 1 and settings.PREDICT_MICROBATCH_WINDOW_MS > 0:
+            prediction = await predict_batcher.predict(url, instances[0], send=self.get_url_predict)
+            return [prediction]
+
+        chunk_size = settings.PREDICT_BATCH_CHUNK_SIZE
+        chunks = [instances[i:i + chunk_size] for i in range(0, len(instances), chunk_size)]
+
+        responses = await asyncio.gather(*(
+            self.get_url_predict(
+                url=url,
+                payload={"signature_name": "serving_default", "instances": chunk}
+            )
+            for chunk in chunks
+        ))
+
+        return [prediction for response in responses for prediction in response["predictions"]]
+
+    async def get_product(self, data: ProductPredictSchema):
         
         """
         บริการทำนายผลผลิตของพืชที่ต้องการปลูก
         """
 
         try:
+            encoder_index = await product_encoder_index.get(self.session)
 
-            user_cat = self.transform_cat_product(data)
-            user_numeric = self.transform_num_product(data)
-
-            user_cat = { key: [int(value)] for key, value in user_cat.items()}
-            user_numeric = user_numeric.tolist()
-
-            payload = {
-                "signature_name": "serving_default",
-                "instances": [
-                    {
-                        "district_input": [user_cat["district_input"]],
-                        "soilgroup_input": [user_cat["soilgroup_input"]],
-                        "subdistrict_input": [user_cat["subdistrict_input"]],
-                        "rubbertype_input": [user_cat["rubbertype_input"]],
-                        "province_input": [user_cat["province_input"]],
-                        "pH_top_input": [user_cat["pH_top_input"]],
-                        "numeric_input": user_numeric[0]
-                    }
-                ]
-            }
-            response = self.get_url_predict(url='/v1/models/model_product/versions/3:predict', payload=payload)
+            predictions = await self._predict_instances(
+                model_name=self.PRODUCT_MODEL,
+                version=settings.PREDICT_PRODUCT_MODEL_VERSION,
+                instances=self.build_product_instances([data], encoder_index)
+            )
 
-            return response
+            return {"predictions": predictions}
         
+        except (ServerProcessException, InvalidInputException) as e:
+            raise e
+
         except Exception:
             raise ServerProcessException(message="เกิดข้อผิดพลาดที่ไม่รู้จัก")
+
+    async def get_product_batch(self, data_list: list[ProductPredictSchema]):
+        """
+        บริการทำนายผลผลิตหลายรายการพร้อมกัน \n
+        Predict the product of many inputs with one request per chunk.
+        """
+
+        try:
+            encoder_index = await product_encoder_index.get(self.session)
+
+            predictions = await self._predict_instances(
+                model_name=self.PRODUCT_MODEL,
+                version=settings.PREDICT_PRODUCT_MODEL_VERSION,
+                instances=self.build_product_instances(data_list, encoder_index)
+            )
+
+            return {"predictions": predictions}
+
+        except (ServerProcessException, InvalidInputException) as e:
+            raise e
+
+        except Exception as e:
+            logger.error("Unknown error: %s", e)
+            raise ServerProcessException(message="เกิดข้อผิดพลาดที่ไม่รู้จัก")
         
-    def get_suitable(self, data: SuitablePredictSchema):
+    async def get_suitable(self, data: SuitablePredictSchema):
         """
         บริการทำนายความเหมาะสมของพืชที่ต้องการปลูก
         """
-        # try:
-            # Evaluate each parameter
-        evaluations = {
-                "temperature": self.evaluate_suitability("temperature", data.temperature),
-                "humidity": self.evaluate_suitability("humidity", data.humidity),
-                "rainfall": self.evaluate_suitability("rainfall", data.rainfall),
-                "rainfall_days": self.evaluate_suitability("rainfall_days", data.rainfall_days),
-                "slope": self.evaluate_suitability("slope", data.slope),
-                "ph_top": self.evaluate_suitability("ph_top", data.ph_top)
-            }
 
-            # Continue with your existing ML prediction logic
-        numeric_scaler = self.transform_num_suitable(data)
+        results = await self.get_suitable_batch([data])
 
-        payload = {
-                "signature_name": "serving_default",
-                "instances": [{"keras_tensor": numeric_scaler[0]}]
-            }
+        return results[0]
 
-        response = self.get_url_predict(url='/v1/models/model_suitability/versions/3:predict', payload=payload)
-
-        response = response['predictions'][0]
-        predicted_class_index = int(np.argmax(response))
+    async def get_suitable_batch(self, data_list: list[SuitablePredictSchema]):
+        """
+        บริการทำนายความเหมาะสมหลายรายการพร้อมกัน \n
+        Predict the suitability of many inputs with one request per chunk.
+        """
 
+        evaluations = self.evaluate_suitability_many(data_list)
+        probabilities = await self.predict_suitability_probabilities(data_list)
 
         class_labels = [0, 1, 2]
-        predicted_class_label = class_labels[predicted_class_index]
+        predicted_class_indexes = np.argmax(probabilities, axis=1)
+
+        return [
+            {
+                "suitability": class_labels[int(index)],
+                "evaluations": evaluation
+            }
+            for index, evaluation in zip(predicted_class_indexes, evaluations)
+        ]
+
+    async def predict_suitability_probabilities(self, data_list: list[SuitablePredictSchema]) -> np.ndarray:
+        """
+        ทำนายความน่าจะเป็นของแต่ละระดับความเหมาะสม (N, 3) \n
+        Return the suitability model's class probabilities as an (N, 3) array.
+        """
+
+        numeric_scaler = self.transform_num_suitable(data_list)
 
-        predicted_result = {
-                    "suitability": predicted_class_label
-                }
+        predictions = await self._predict_instances(
+            model_name=self.SUITABILITY_MODEL,
+            version=settings.PREDICT_SUITABILITY_MODEL_VERSION,
+            instances=[{"keras_tensor": row} for row in numeric_scaler]
+        )
 
-            # Add evaluations to the response
-        predicted_result["evaluations"] = evaluations
-        print(predicted_result)
-        return predicted_result
+        return np.asarray(predictions, dtype=float)
 
-        # except Exception as e:
-        #     logger.error("Unknown error: %s", e)
-        #     raise ServerProcessException(message="เกิดข้อผิดพลาดที่ไม่รู้จัก")
+    def build_product_instances(self, data_list: list[ProductPredictSchema], encoder_index: ProductEncoderIndex) -> list[dict]:
+        """
+        สร้าง instances สำหรับโมเดลทำนายผลผลิต \n
+        Build the TF-Serving instances for the product model.
+        """
 
+        user_cat = {
+            key: values.tolist()
+            for key, values in self.transform_cat_product(data_list, encoder_index).items()
+        }
+        user_numeric = self.transform_num_product(data_list).tolist()
+
+        return [
+            {
+                "district_input": [[user_cat["district_input"][i]]],
+                "soilgroup_input": [[user_cat["soilgroup_input"][i]]],
+                "subdistrict_input": [[user_cat["subdistrict_input"][i]]],
+                "rubbertype_input": [[user_cat["rubbertype_input"][i]]],
+                "province_input": [[user_cat["province_input"][i]]],
+                "pH_top_input": [[user_cat["pH_top_input"][i]]],
+                "numeric_input": user_numeric[i]
+            }
+            for i in range(len(data_list))
+        ]
     
-    def transform_cat_suitable(self, data: SuitablePredictSchema):
+    def transform_cat_suitable(self, data_list: list[SuitablePredictSchema]) -> np.ndarray:
         """
         แปลงข้อมูลที่ได้ให้อยู่ในรูปแบบการทำนายความเหมาะสม และส่งค่ากลับ
         """
-        encoders = self.load_encoder('model_classify/labelencoders_3.pkl')
+        encoders = self.load_encoder(
+            self.SUITABILITY_ENCODER_DIR, "labelencoders", settings.PREDICT_SUITABILITY_MODEL_VERSION
+        )
         
         ph_top_encoder = encoders['pH_top']
-        user_pH_top_encoded = ph_top_encoder.transform([data.ph_top])[0]
+        values = [data.ph_top for data in data_list]
 
-        return user_pH_top_encoded
+        # ค่าที่ encoder ไม่รู้จัก (รวมถึงค่าว่าง) แจ้งเป็นข้อมูลไม่ถูกต้อง พร้อมลำดับของรายการ
+        known = set(ph_top_encoder.classes_.tolist())
+        invalid_items = [index for index, value in enumerate(values) if value not in known]
+
+        if invalid_items:
+            raise InvalidInputException(
+                message=f"โมเดลไม่รองรับข้อมูล pH_top ของรายการที่ {', '.join(map(str, invalid_items))}"
+            )
+
+        return ph_top_encoder.transform(np.asarray(values))
     
-    def transform_num_suitable(self, data: SuitablePredictSchema):
+    def transform_num_suitable(self, data_list: list[SuitablePredictSchema]) -> list:
         """
         แปลงข้อมูลที่ได้ให้อยู่ในรูปแบบของข้อมูลที่เป็นตัวเลข และส่งค่ากลับ
         """
 
-        user_pH_top_encoded = self.transform_cat_suitable(data)
+        user_pH_top_encoded = self.transform_cat_suitable(data_list)
 
-        scaler = self.load_encoder('model_classify/scaler_numeric_3.pkl')
+        scaler = self.load_encoder(
+            self.SUITABILITY_ENCODER_DIR, "scaler_numeric", settings.PREDICT_SUITABILITY_MODEL_VERSION
+        )
 
-        user_numeric = np.array([[
-                                    user_pH_top_encoded, 
-                                    data.rainfall, 
-                                    data.temperature,
-                                    data.humidity,
-                                    data.rainfall_days,
-                                    data.slope,
-                                ]])
+        user_numeric = np.column_stack([
+            user_pH_top_encoded,
+            [data.rainfall for data in data_list],
+            [data.temperature for data in data_list],
+            [data.humidity for data in data_list],
+            [data.rainfall_days for data in data_list],
+            [data.slope for data in data_list],
+        ]).astype(float)
         
         numeric_scaler = scaler.transform(user_numeric).tolist()
 
         return numeric_scaler
     
-    def transform_cat_product(self, data: ProductPredictSchema):
+    def transform_cat_product(self, data_list: list[ProductPredictSchema], encoder_index: ProductEncoderIndex) -> dict[str, np.ndarray]:
         """
-        แปลงข้อมูลที่ได้ให้อยู่ในรูปแบบการทำนายผลผลิต และส่งค่ากลับ
+        แปลงข้อมูลที่ได้ให้อยู่ในรูปแบบการทำนายผลผลิต และส่งค่ากลับ \n
+        Province, district and sub-district are given as codes and looked up
+        directly in the precomputed encoder index.
         """
-        encoders = self.load_encoder('model_product/labelencoders_3.pkl')
-        
-        province_encoder = encoders['province']
-        district_encoder = encoders['district']
-        subdistrict_encoder = encoders['subdistrict']
-        rubbertype_encoder = encoders['rubbertype']
-        soilgroup_encoder = encoders['soilgroup']
-        ph_top_encoder = encoders['pH_top']
 
-        user_cat = {
-            "province_input": province_encoder.transform([data.province])[0],
-            "district_input": district_encoder.transform([data.district])[0],
-            "subdistrict_input": subdistrict_encoder.transform([data.subdistrict])[0],
-            "rubbertype_input": rubbertype_encoder.transform([data.rubber_type])[0],
-            "soilgroup_input": soilgroup_encoder.transform([data.soil_group])[0],
-            "pH_top_input": ph_top_encoder.transform([data.ph_top])[0],
+        columns = {
+            "province_input": ("province", [data.province for data in data_list]),
+            "district_input": ("district", [data.district for data in data_list]),
+            "subdistrict_input": ("subdistrict", [data.subdistrict for data in data_list]),
+            "rubbertype_input": ("rubbertype", [data.rubber_type for data in data_list]),
+            "soilgroup_input": ("soilgroup", [data.soil_group for data in data_list]),
+            "pH_top_input": ("pH_top", [data.ph_top for data in data_list]),
         }
 
-        return user_cat
+        return {
+            key: encoder_index.encode(encoder_name, values)
+            for key, (encoder_name, values) in columns.items()
+        }
     
-    def transform_num_product(self, data: ProductPredictSchema):
+    def transform_num_product(self, data_list: list[ProductPredictSchema]) -> np.ndarray:
         """
         แปลงข้อมูลที่ได้ให้อยู่ในรูปแบบของข้อมูลที่เป็นตัวเลข และส่งค่ากลับ
         """
@@ -186,7 +346,7 @@ class PredictService:
                                 data.rainfall,
                                 data.temperature,
                                 data.rainfall_days,
-                                data.humidity]])
+                                data.humidity] for data in data_list], dtype=float)
 
         return user_numeric
     
@@ -199,291 +359,16 @@ class PredictService:
         Returns:
             dict: ผลการประเมินความเหมาะสม (2: เหมาะสม, 1: เหมาะสมปานกลาง, 0: ไม่เหมาะสม)
         """
-        param = self._get_param_config(param_name)
-        if not param:
-            return {"suitability": 0, "message": "ไม่พบข้อมูลเกณฑ์การประเมิน"}
-
-        # Special handling for ph_top which can be ranges like "4.5-5.0"
-        if param_name == "ph_top" and isinstance(value, str):
-            return self._evaluate_ph_top(value, param)
-        elif "ranges" in param:
-            # For numeric parameters with range definitions
-            try:
-                numeric_value = float(value)
-                return self._evaluate_with_ranges(numeric_value, param)
-            except ValueError:
-                logger.error(f"Invalid numeric value for {param_name}: {value}")
-                return {
-                    "suitability": 0,
-                    "message": f"ค่า {param_name} ({value}) ไม่ถูกต้อง ต้องเป็นตัวเลข"
-                }
-        else:
-            # For simple parameters with min/max values
-            try:
-                numeric_value = float(value)
-                return self._evaluate_simple_param(numeric_value, param, param_name)
-            except ValueError:
-                logger.error(f"Invalid numeric value for {param_name}: {value}")
-                return {
-                    "suitability": 0,
-                    "message": f"ค่า {param_name} ({value}) ไม่ถูกต้อง ต้องเป็นตัวเลข"
-                }
-
-    def _get_param_config(self, param_name: str) -> dict:
-        """Returns the configuration for the specified parameter."""
-        weather_params = {
-            "ph_top": {
-                "suitables": ["4.5-5.0", "4.5-5.5", "4.5-6.0", "5.0-5.5"],
-                "moderate": ["5.0-6.5", "5.5-6.5"],
-                "not_suitable": ["<4.0", "5.5-7.0", "5.5-8.0", "6.0-7.0", "6.0-8.0"],
-                "messages": {
-                    "not_suitable": "ค่า pH ดินเฉลี่ย {value} ไม่เหมาะสม ควรมีค่า pH ดินระหว่าง {suitable}",
-                    "moderate": "ค่า pH ดินเฉลี่ย {value} เหมาะสมปานกลาง ค่าที่เหมาะสมควรอยู่ระหว่าง {suitable}",
-                    "suitable": "ค่า pH ดินเฉลี่ย {value} อยู่ในเกณฑ์ที่เหมาะสม"
-                }
-            },
-            "temperature": {
-                "ranges": {
-                    "suitable": [{"min": 24, "max": 27}],
-                    "moderate": [{"min": 20, "max": 24}, {"min": 27, "max": 35}],
-                    "not_suitable": [{"max": 20}, {"min": 35}]
-                },
-                "messages": {
-                    "not_suitable": "อุณหภูมิเฉลี่ย {value} °C ไม่เหมาะสม ควรอยู่ระหว่าง 24-27 °C",
-                    "moderate": "อุณหภูมิเฉลี่ย {value} °C เหมาะสมปานกลาง ค่าที่เหมาะสมควรอยู่ระหว่าง 24-27 °C",
-                    "suitable": "อุณหภูมิเฉลี่ย {value} °C อยู่ในเกณฑ์ที่เหมาะสม"
-                }
-            },
-            "humidity": {
-                "ranges": {
-                    "suitable": [{"min": 65, "max": 80}],
-                    "moderate": [{"min": 50, "max": 65}, {"min": 80, "max": 90}],
-                    "not_suitable": [{"max": 50}, {"min": 90}]
-                },
-                "messages": {
-                    "not_suitable": "ความชื้นสัมพัทธ์เฉลี่ย {value} % ไม่เหมาะสม ควรอยู่ระหว่าง 65-80 %",
-                    "moderate": "ความชื้นสัมพัทธ์เฉลี่ย {value} % เหมาะสมปานกลาง ค่าที่เหมาะสมควรอยู่ระหว่าง 65-80 %",
-                    "suitable": "ความชื้นสัมพัทธ์เฉลี่ย {value} % อยู่ในเกณฑ์ที่เหมาะสม"
-                }
-            },
-            "rainfall": {
-                "ranges": {
-                    "suitable": [{"min": 1350, "max": 2500}],
-                    "moderate": [{"min": 1000, "max": 1350}, {"min": 2500, "max": 3000}],
-                    "not_suitable": [{"max": 1000}, {"min": 3000}]
-                },
-                "messages": {
-                    "not_suitable": "ปริมาณน้ำฝนเฉลี่ย {value} มม. ไม่เหมาะสม ควรอยู่ระหว่าง 1350-2500 มม.",
-                    "moderate": "ปริมาณน้ำฝนเฉลี่ย {value} มม. เหมาะสมปานกลาง ค่าที่เหมาะสมควรอยู่ระหว่าง 1350-2500 มม.",
-                    "suitable": "ปริมาณน้ำฝนเฉลี่ย {value} มม. อยู่ในเกณฑ์ที่เหมาะสม"
-                }
-            },
-            "rainfall_days": {
-                "ranges": {
-                    "suitable": [{"min": 120, "max": 200}],
-                    "moderate": [{"min": 100, "max": 120}, {"min": 200, "max": 250}],
-                    "not_suitable": [{"max": 100}, {"min": 250}]
-                },
-                "messages": {
-                    "not_suitable": "จำนวนวันฝนตกเฉลี่ย {value} วัน ไม่เหมาะสม ควรอยู่ระหว่าง 120-200 วัน",
-                    "moderate": "จำนวนวันฝนตกเฉลี่ย {value} วัน เหมาะสมปานกลาง ค่าที่เหมาะสมควรอยู่ระหว่าง 120-200 วัน",
-                    "suitable": "จำนวนวันฝนตกเฉลี่ย {value} วัน อยู่ในเกณฑ์ที่เหมาะสม"
-                }
-            },
-            "slope": {
-                "ranges": {
-                    "suitable": [{"min": 15, "max": 16}],
-                    "moderate": [{"min": 0, "max": 15}, {"min": 16, "max": 45}],
-                    "not_suitable": [{"min": 45}]
-                },
-                "messages": {
-                    "not_suitable": "ความลาดชันเฉลี่ย {value} องศา ไม่เหมาะสม ควรอยู่ระหว่าง 15-16 องศา",
-                    "moderate": "ความลาดชันเฉลี่ย {value} องศา เหมาะสมปานกลาง ค่าที่เหมาะสมควรอยู่ระหว่าง 15-16 องศา",
-                    "suitable": "ความลาดชันเฉลี่ย {value} องศา อยู่ในเกณฑ์ที่เหมาะสม"
-                }
-            }
-        }
-        return weather_params.get(param_name)
 
-    def _evaluate_ph_top(self, value, param: dict) -> dict:
-        """Evaluates pH top values against defined ranges."""
-        # For pH top, we need to check if the exact string matches any of the ranges
-        # rather than converting to float and checking numerical ranges
-        
-        # If value is already a suitable range, it's suitable
-        if value in param["suitables"]:
-            return {
-                "suitability": 2,
-                "message": param["messages"]["suitable"].format(value=value)
-            }
-        
-        # If value is a moderate range, it's moderately suitable
-        if value in param["moderate"]:
-            return {
-                "suitability": 1,
-                "message": param["messages"]["moderate"].format(
-                    value=value,
-                    suitable=" หรือ ".join(param["suitables"])
-                )
-            }
-        
-        # If value is in not_suitable list, it's not suitable
-        if value in param["not_suitable"]:
-            return {
-                "suitability": 0,
-                "message": param["messages"]["not_suitable"].format(
-                    value=value,
-                    suitable=" หรือ ".join(param["suitables"])
-                )
-            }
-        
-        # If value is a number or unknown range, try to evaluate it numerically
-        try:
-            value_float = self._convert_to_float(value)
-            
-            # Check against suitable ranges
-            for suitable_range in param["suitables"]:
-                if self._is_in_range(value_float, suitable_range):
-                    return {
-                        "suitability": 2,
-                        "message": param["messages"]["suitable"].format(value=value)
-                    }
-            
-            # Check against moderate ranges
-            for moderate_range in param["moderate"]:
-                if self._is_in_range(value_float, moderate_range):
-                    return {
-                        "suitability": 1,
-                        "message": param["messages"]["moderate"].format(
-                            value=value,
-                            suitable=" หรือ ".join(param["suitables"])
-                        )
-                    }
-            
-            # If neither suitable nor moderate
-            return {
-                "suitability": 0,
-                "message": param["messages"]["not_suitable"].format(
-                    value=value,
-                    suitable=" หรือ ".join(param["suitables"])
-                )
-            }
-        except ValueError:
-            # If we can't convert to float, treat as not suitable
-            logger.error(f"Invalid pH value format: {value}")
-            return {
-                "suitability": 0,
-                "message": f"ค่า pH ดิน ({value}) ไม่ถูกต้อง"
-            }
+        return suitability_rules.evaluate(param_name, value)
 
-    def _convert_to_float(self, value) -> float:
-        """Converts string values (including those with < or >) to float."""
-        if isinstance(value, str):
-            # Handle range values differently - extract first number for comparison
-            if "-" in value and not value.startswith("<") and not value.startswith(">"):
-                try:
-                    # Return the midpoint of the range for comparison
-                    min_val, max_val = map(float, value.split("-"))
-                    return (min_val + max_val) / 2
-                except ValueError:
-                    # If can't parse the range, log and return a default
-                    logger.warning(f"Could not parse range value: {value}")
-                    return 0.0
-            
-            # Handle < and > values
-            if value.startswith('<'):
-                return float(value[1:]) - 0.1
-            elif value.startswith('>'):
-                return float(value[1:]) + 0.1
-            
-            # Regular numeric string
-            return float(value)
-        
-        # Already a numeric value
-        return float(value)
-
-    def _is_in_range(self, value_float: float, range_str: str) -> bool:
-        """Checks if a value is within a specified range."""
-        try:
-            if range_str.startswith("<"):
-                max_val = float(range_str[1:])
-                return value_float < max_val
-            elif range_str.startswith(">"):
-                min_val = float(range_str[1:])
-                return value_float > min_val
-            else:
-                min_val, max_val = map(float, range_str.split("-"))
-                return min_val <= value_float <= max_val
-        except ValueError as e:
-            logger.error(f"Invalid range format '{range_str}': {str(e)}")
-            return False
-
-    def _evaluate_with_ranges(self, value, param: dict) -> dict:
-        """Evaluates values against ranges in the param dictionary."""
-        value_float = float(value)
-        
-        # Check suitable ranges
-        for range_obj in param["ranges"]["suitable"]:
-            min_val = range_obj.get("min", float("-inf"))
-            max_val = range_obj.get("max", float("inf"))
-            if min_val <= value_float <= max_val:
-                return {
-                    "suitability": 2,
-                    "message": param["messages"]["suitable"].format(value=value)
-                }
-        
-        # Check moderate ranges
-        for range_obj in param["ranges"]["moderate"]:
-            min_val = range_obj.get("min", float("-inf"))
-            max_val = range_obj.get("max", float("inf"))
-            if min_val <= value_float <= max_val:
-                return {
-                    "suitability": 1,
-                    "message": param["messages"]["moderate"].format(value=value)
-                }
-        
-        # If neither suitable nor moderate, it's not suitable
-        return {
-            "suitability": 0,
-            "message": param["messages"]["not_suitable"].format(value=value)
-        }
+    def evaluate_suitability_many(self, data_list: list[SuitablePredictSchema]) -> list[dict]:
+        """
+        ประเมินความเหมาะสมของหลายรายการพร้อมกันด้วยเกณฑ์ที่คอมไพล์ไว้แล้ว \n
+        Evaluate every parameter of many inputs in one vectorized pass.
+        """
 
-    def _evaluate_simple_param(self, value, param: dict, param_name: str) -> dict:
-        """Evaluates parameters with simple min/max values."""
-        if "suitable" not in param or "min" not in param["suitable"] or "max" not in param["suitable"]:
-            logger.error(f"Parameter structure for {param_name} is incorrect")
-            return {
-                "suitability": 0, 
-                "message": f"ค่า {param_name} ({value}) ไม่สามารถประเมินความเหมาะสมได้"
-            }
-        
-        value_float = float(value)
-        
-        # Check suitable range
-        if param["suitable"]["min"] <= value_float <= param["suitable"]["max"]:
-            return {
-                "suitability": 2,
-                "message": param["messages"]["suitable"].format(value=value)
-            }
-        
-        # Check moderate range if it exists
-        if "moderate" in param and "min" in param["moderate"] and "max" in param["moderate"]:
-            if param["moderate"]["min"] <= value_float <= param["moderate"]["max"]:
-                return {
-                    "suitability": 1,
-                    "message": param["messages"]["moderate"].format(
-                        value=value,
-                        min=param["suitable"]["min"],
-                        max=param["suitable"]["max"]
-                    )
-                }
-        
-        # If neither suitable nor moderate
-        return {
-            "suitability": 0,
-            "message": param["messages"]["not_suitable"].format(
-                value=value,
-                min=param["suitable"]["min"],
-                max=param["suitable"]["max"]
-            )
-        }
+        return suitability_rules.evaluate_many({
+            name: [getattr(data, name) for data in data_list]
+            for name in EVALUATION_ORDER
+        })
@@ -1,15 +1,17 @@
 import logging
-from sqlalchemy import String, cast, desc, distinct
+from sqlalchemy import func
 from sqlalchemy.sql import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import SQLAlchemyError, CompileError, IntegrityError
-from sqlalchemy.orm import joinedload
 
+from app.core.table_version import bump_table_version
 from app.models import Province, District
 from app.models.rubberfarm import RubberFarm
 from app.models.subdistrict import SubDistrict
-from app.schemas import QueryGeoSchema, ProvinceCreateSchema
-from app.utilities.app_exceptions import DuplicateResourceException, ResourceNotFoundException, SQLProcessException, ServerProcessException
+from app.schemas import ProvinceFarmQuerySchema, QueryGeoSchema, ProvinceCreateSchema
+from app.services.geo_cache import GeoIndex, ProvinceEntry, geo_cache
+from app.utilities.app_cursor import paginate_sorted
+from app.utilities.app_exceptions import DuplicateResourceException, InvalidInputException, ResourceNotFoundException, SQLProcessException, ServerProcessException
 from app.I18n.load_laguage import get_lang_content
 
 logger = logging.getLogger(__name__)
@@ -30,23 +32,25 @@ class ProvinceService:
                 query: QueryGeographySchema => The query parameters.
 
             #### Returns
-                List[Province] => List of Province instances.
+                tuple[List[dict], str | None] => ข้อมูลจังหวัด (และอำเภอ/ตำบล เมื่อ detail=True)
+                และ cursor ของหน้าถัดไป
+
+            #### Description
+                อ่านจากต้นไม้ข้อมูลพื้นที่ในหน่วยความจำ (geo_cache) ไม่ต้องดึงข้อมูลซ้ำทุกคำขอ \n
+                Served from the in-memory geo tree instead of a joinedload per request.
 
         """
 
         try:
 
-            stmp = select(Province)
-            stmp = self._apply_filters(stmp=stmp, query=query)
-            result = await self.session.execute(stmp)
+            index = await geo_cache.get_index(self.session)
 
-            provinces = result.unique().scalars().all()
-            provinces = self._apply_names(provinces, query)
-                        
-            if query.detail:
-                provinces = self._apply_district_details(provinces, query)
+            provinces, cursor = self._filter_provinces(list(index.provinces.values()), query)
 
-            return provinces
+            return [self._province_node(province, index, query) for province in provinces], cursor
+
+        except InvalidInputException as e:
+            raise e
         
         except SQLAlchemyError as e:
             raise SQLProcessException(
@@ -75,8 +79,10 @@ class ProvinceService:
             
             new_province = self._populate_sub_district_fields(Province(), province)
             self.session.add(new_province)
+            await bump_table_version(self.session, "Province")
             await self.session.commit()
-            self.session.refresh(new_province)
+            await self.session.refresh(new_province)
+            await geo_cache.refresh(self.session)
 
             return new_province
         
@@ -111,13 +117,15 @@ class ProvinceService:
                 raise ResourceNotFoundException(message=self.t.get("NotFound"))
             
             self._populate_sub_district_fields(existing_province, province)
+            await bump_table_version(self.session, "Province")
             await self.session.commit()
             await self.session.refresh(existing_province)
+            await geo_cache.refresh(self.session)
 
             return existing_province
         
         except ResourceNotFoundException as e:
-            self.session.rollback()
+            await self.session.rollback()
             raise e
         
         except SQLAlchemyError as e:
@@ -144,8 +152,10 @@ class ProvinceService:
             if not existing_province:
                 raise ResourceNotFoundException(message=self.t.get("NotFound"))
 
-            self.session.delete(existing_province)
+            await self.session.delete(existing_province)
+            await bump_table_version(self.session, "Province")
             await self.session.commit()
+            await geo_cache.refresh(self.session)
 
             return True
         
@@ -168,62 +178,66 @@ class ProvinceService:
             raise ServerProcessException(message=self.t.get("InternalServerError"))
         
 
-    def _apply_filters(self, stmp, query):
-
+    def _filter_provinces(self, provinces: list[ProvinceEntry], query: QueryGeoSchema) -> tuple[list[ProvinceEntry], str | None]:
         """
-        Apply query filters to the SQLAlchemy statement.\n
-        นำเงื่อนไขการค้นหามาใช้กับคำสั่ง SQLAlchemy
-
+        Apply query filters and pagination to the cached provinces.\n
+        นำเงื่อนไขการค้นหาและการแบ่งหน้ามาใช้กับข้อมูลจังหวัดในหน่วยความจำ
         """
 
         if query.code:
-            stmp = stmp.where(Province.code == query.code)
-
-        if query.detail:
-            stmp = stmp.options(
-                joinedload(Province.districts).joinedload(District.sub_districts)
-            )
-
-        if query.limit:
-            stmp = stmp.limit(query.limit)
-
-        if query.offset:
-            stmp = stmp.offset(query.offset)
+            provinces = [province for province in provinces if province.code == query.code]
 
         if query.search:
-            stmp = stmp.filter(
-                Province.name_th.ilike(f"%{query.search}%") |
-                Province.name_en.ilike(f"%{query.search}%") |
-                cast(Province.code, String).ilike(f"%{query.search}%")
-            )
+            search = query.search.lower()
+            provinces = [
+                province for province in provinces
+                if search in province.name_th.lower()
+                or search in (province.name_en or "").lower()
+                or search in str(province.code)
+            ]
 
         if query.order_by_desc:
-            stmp = stmp.order_by(desc(query.order_by))
+            order_by = query.order_by if query.order_by in ProvinceEntry._fields else "code"
+            sort_key = lambda province: (
+                getattr(province, order_by) is not None, getattr(province, order_by), province.code
+            )
+            provinces = sorted(provinces, key=sort_key, reverse=True)
+        else:
+            sort_key = lambda province: (province.code,)
 
-        return stmp
+        return paginate_sorted(provinces, query, sort_key, descending=query.order_by_desc)
 
 
-    def _apply_names(self, provinces, query):
+    def _province_node(self, province: ProvinceEntry, index: GeoIndex, query: QueryGeoSchema) -> dict:
         """
-        Apply name translations to provinces based on query type.\n
-        นำข้อมูลชื่อจังหวัดมาแปลเป็นภาษาที่ต้องการ
+        Build the response node of a province, with districts and sub-districts when detailed.\n
+        สร้างข้อมูลจังหวัดพร้อมชื่อตามภาษาที่ต้องการ
         """
-        for province in provinces:
-            province.name = province.name_en if query.type == "en" else province.name_th
-        return provinces
 
+        node = {
+            "code": province.code,
+            "name": self._entry_name(province, query),
+            "geography_id": province.geography_id,
+        }
+
+        if query.detail:
+            node["districts"] = [
+                {
+                    "code": district.code,
+                    "name": self._entry_name(district, query),
+                    "sub_districts": [
+                        {"code": sub_district.code, "name": self._entry_name(sub_district, query), "zip_code": sub_district.zip_code}
+                        for sub_district in index.sub_districts_of(district.code)
+                    ],
+                }
+                for district in index.districts_of(province.code)
+            ]
+
+        return node
 
-    def _apply_district_details(self, provinces, query):
-        """
-        Apply name translations to districts and sub-districts.\n
-        นำข้อมูลชื่ออำเภอและตำบลมาแปลเป็นภาษาที่ต้องการ
-        """
-        for province in provinces:
-            for district in province.districts:
-                district.name = district.name_en if query.type == "en" else district.name_th
-                for sub_district in district.sub_districts:
-                    sub_district.name = sub_district.name_en if query.type == "en" else sub_district.name_th
-        return provinces
+
+    def _entry_name(self, entry, query: QueryGeoSchema | ProvinceFarmQuerySchema) -> str:
+        return entry.name_en if query.type == "en" else entry.name_th
 
 
     async def _get_province_by_code(self, code: int):
@@ -249,111 +263,98 @@ class ProvinceService:
 
         return province
     
-    def _filter_districts_with_rubber_farms(self, province):
-        """Filter districts and subdistricts that have rubber farms"""
-        
-        filtered_districts = []
-        for district in province.districts:
-            filtered_subdistricts = [
-                sub for sub in district.sub_districts
-                if any(farm.subdistrict_id == sub.code for farm in sub.rubber_farms)
-            ]
-            if filtered_subdistricts:
-                district.sub_districts = filtered_subdistricts
-                filtered_districts.append(district)
-        return filtered_districts
-
-    async def get_provinces_with_rubber_farms(self, query: QueryGeoSchema):
+    async def get_provinces_with_rubber_farms(self, query: ProvinceFarmQuerySchema) -> list[dict]:
         """
-        Get provinces with rubber farms and their districts/subdistricts if detailed view is requested
-        
-        Args:
-            query: QueryGeoSchema - Query parameters for filtering and language selection
-        
-        Returns:
-            List[Province]: List of provinces with rubber farms and optional district details
+        ดึงจังหวัดที่มีแปลงยาง พร้อมอำเภอ/ตำบลที่มีแปลงยางและจำนวนแปลงของแต่ละโหนด \n
+        Get the provinces that have rubber farms, pruned to the districts and
+        sub-districts with farms, with a farm count on every node.
+
+        #### Description
+            นับจำนวนแปลงต่อตำบลด้วยคำสั่ง SQL เดียว (CTE + GROUP BY) แล้วประกอบต้นไม้
+            จากต้นไม้ข้อมูลพื้นที่ในหน่วยความจำ \n
+            Farms are counted per sub-district in one CTE-based query; the tree
+            and its names come from the in-memory geo tree.
+
+        #### Returns
+            list[dict] => จังหวัด (และอำเภอ/ตำบล เมื่อ detail=True) พร้อม farm_count
         """
+
         try:
-            # First, get just the provinces that have rubber farms without loading all related data
-            province_ids_stmt = (
-                select(distinct(Province.code))
-                .join(District, District.province_id == Province.code)
-                .join(SubDistrict, SubDistrict.district_id == District.code)
-                .join(RubberFarm, RubberFarm.subdistrict_id == SubDistrict.code)
+            farm_counts = (
+                select(RubberFarm.subdistrict_id, func.count().label("farm_count"))
+                .group_by(RubberFarm.subdistrict_id)
+                .cte("farm_counts")
             )
-            
+
+            stmt = (
+                select(
+                    District.province_id,
+                    SubDistrict.district_id,
+                    farm_counts.c.subdistrict_id,
+                    farm_counts.c.farm_count,
+                )
+                .join(SubDistrict, SubDistrict.code == farm_counts.c.subdistrict_id)
+                .join(District, District.code == SubDistrict.district_id)
+            )
+
             if query.code:
-                province_ids_stmt = province_ids_stmt.where(Province.code == query.code)
-                
-            # Execute just to get province IDs
-            province_ids_result = await self.session.execute(province_ids_stmt)
-            province_ids = [row[0] for row in province_ids_result.all()]
-            
-            if not province_ids:
+                stmt = stmt.where(District.province_id == query.code)
+
+            rows = (await self.session.execute(stmt)).all()
+
+            if not rows:
                 raise ResourceNotFoundException(message=self.t.get("NotFound"))
-            
-            # Pre-fetch all the data we'll need to avoid lazy loading
-            if query.detail:
-                # Get provinces with eager loading of districts and subdistricts
-                # This avoids lazy loading which causes the MissingGreenlet error
-                provinces_stmt = (
-                    select(Province)
-                    .options(
-                        joinedload(Province.districts).joinedload(District.sub_districts)
-                    )
-                    .where(Province.code.in_(province_ids))
-                )
-            else:
-                provinces_stmt = select(Province).where(Province.code.in_(province_ids))
-                
-            # Execute the statement to get all the data at once
-            provinces_result = await self.session.execute(provinces_stmt)
-            provinces = provinces_result.unique().scalars().all()
-            
-            # If detail is requested, filter the pre-loaded data
-            if query.detail:
-                # Collect districts and subdistricts with rubber farms to filter against
-                district_ids_stmt = (
-                    select(distinct(District.code), District.province_id)
-                    .join(SubDistrict, SubDistrict.district_id == District.code)
-                    .join(RubberFarm, RubberFarm.subdistrict_id == SubDistrict.code)
-                    .where(District.province_id.in_(province_ids))
-                )
-                district_result = await self.session.execute(district_ids_stmt)
-                district_map = {row[0]: row[1] for row in district_result.all()}
-                
-                subdistrict_ids_stmt = (
-                    select(distinct(SubDistrict.code), SubDistrict.district_id)
-                    .join(RubberFarm, RubberFarm.subdistrict_id == SubDistrict.code)
-                    .where(SubDistrict.district_id.in_(list(district_map.keys())))
-                )
-                subdistrict_result = await self.session.execute(subdistrict_ids_stmt)
-                subdistrict_map = {row[0]: row[1] for row in subdistrict_result.all()}
-                
-                # Filter in Python instead of making more DB calls
-                for province in provinces:
-                    # Keep only districts with rubber farms
-                    province.districts = [
-                        d for d in province.districts 
-                        if d.code in district_map and district_map[d.code] == province.code
-                    ]
-                    
-                    # For each district, keep only subdistricts with rubber farms
-                    for district in province.districts:
-                        district.sub_districts = [
-                            sd for sd in district.sub_districts 
-                            if sd.code in subdistrict_map and subdistrict_map[sd.code] == district.code
-                        ]
-            
-            # Apply names according to language selection
-            provinces = self._apply_names(provinces, query)
-            if query.detail:
-                provinces = self._apply_district_details(provinces, query)
-            
-            # Detach the objects from the session to avoid unexpected DB hits
-            for province in provinces:
-                self.session.expunge(province)
-            
+
+            index = await geo_cache.get_index(self.session)
+
+            # province -> district -> sub-district -> farm_count
+            tree: dict[int, dict[int, dict[int, int]]] = {}
+            for row in rows:
+                tree.setdefault(row.province_id, {}).setdefault(row.district_id, {})[row.subdistrict_id] = row.farm_count
+
+            provinces = []
+
+            for province_code in sorted(tree):
+                province = index.provinces.get(province_code)
+                if province is None:
+                    continue
+
+                districts = []
+
+                for district_code in sorted(tree[province_code]):
+                    sub_district_counts = tree[province_code][district_code]
+                    district = index.districts.get(district_code)
+                    if district is None:
+                        continue
+
+                    districts.append({
+                        "code": district.code,
+                        "name": self._entry_name(district, query),
+                        "farm_count": sum(sub_district_counts.values()),
+                        "sub_districts": [
+                            {
+                                "code": code,
+                                "name": self._entry_name(index.sub_districts[code], query),
+                                "zip_code": index.sub_districts[code].zip_code,
+                                "farm_count": count,
+                            }
+                            for code, count in sorted(sub_district_counts.items())
+                            if code in index.sub_districts
+                        ],
+                    })
+
+                node = {
+                    "code": province.code,
+                    "name": self._entry_name(province, query),
+                    "geography_id": province.geography_id,
+                    "farm_count": sum(district["farm_count"] for district in districts),
+                }
+
+                if query.detail:
+                    node["districts"] = districts
+
+                provinces.append(node)
+
             return provinces
 
         except ResourceNotFoundException as e:
@@ -370,4 +371,3 @@ class ProvinceService:
             raise ServerProcessException(
                 message=self.t.get("InternalServerError")
             )
-
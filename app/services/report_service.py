@@ -0,0 +1,702 @@
+import asyncio
+import logging
+import numpy as np
+from sqlalchemy import Float, Integer, case, cast, func
+from sqlalchemy.sql import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.models import District, Province, RubberFarm, RubberFarmRollup, RubberType, SoilGeography, SoilType, SubDistrict, WeatherGeography
+from app.schemas.report_schema import DISTRIBUTION_QUANTILES, METRICS, REPORT_GROUPS, DistributionQuerySchema, ReportFilterSchema, RubberFarmSummaryQuerySchema, TrendQuerySchema
+from app.services.farm_snapshot import SNAPSHOT_TABLES, farm_snapshot, fetch_columns
+from app.services.geo_cache import GEO_TABLES, GeoIndex, geo_cache
+from app.utilities.app_cache import DependencyCache
+from app.utilities.app_exceptions import InvalidInputException, SQLProcessException
+
+logger = logging.getLogger(__name__)
+
+# คอลัมน์ของแต่ละมิติ และตารางที่ต้อง join เพื่อให้ได้คอลัมน์นั้น
+DIMENSIONS = {
+    "geography": (Province.geography_id, (SubDistrict, District, Province)),
+    "province": (District.province_id, (SubDistrict, District)),
+    "district": (SubDistrict.district_id, (SubDistrict,)),
+    "subdistrict": (RubberFarm.subdistrict_id, ()),
+    "rubber_type": (RubberFarm.rubber_type_id, ()),
+    "soil_type": (SoilGeography.soil_type_id, (SoilGeography,)),
+    "year": (WeatherGeography.year, (WeatherGeography,)),
+}
+
+# ระดับพื้นที่ที่มีตารางสรุป (RubberFarmRollup) แยกตาม พันธุ์ยาง × ปี
+ROLLUP_LEVELS = ("geography", "province", "district", "subdistrict")
+
+# ค่าเฉลี่ยสภาพอากาศต่อปี และค่าสรุปแปลงยางต่อปี (ผลรวม หรือค่าเฉลี่ย) ที่ใช้ในรายงานแนวโน้ม
+CLIMATE_METRICS = ("rainfall_mm", "average_temperature", "average_humidity", "rainy_day_count")
+FARM_TREND_METRICS = {
+    "farm_count": "sum",
+    "rubber_area": "sum",
+    "rubber_tree_count": "sum",
+    "rubber_tree_age": "avg",
+    "dry_rubber_content": "avg",
+}
+TREND_METRICS = (*CLIMATE_METRICS, *FARM_TREND_METRICS)
+
+# ตารางที่แต่ละรายงานอ่าน (รวมตารางที่ใช้หาชื่อ) รายการในแคชจะหมดอายุเมื่อตารางเหล่านี้ถูกแก้ไข
+SUMMARY_TABLES = (*GEO_TABLES, "RubberFarm", "RubberFarmRollup", "SoilGeography", "WeatherGeography", "RubberType", "SoilType")
+TREND_TABLES = (*GEO_TABLES, "RubberFarmRollup", "WeatherGeography")
+DISTRIBUTION_TABLES = (*GEO_TABLES, *SNAPSHOT_TABLES, "RubberType")
+
+# แคชผลรายงานต่อชุดพารามิเตอร์ ใช้ร่วมกันทั้งโปรเซส
+report_cache = DependencyCache(
+    max_size=settings.REPORT_CACHE_SIZE,
+    ttl=settings.REPORT_CACHE_TTL_SECONDS,
+)
+
+# เงื่อนไข join ของแต่ละตาราง เรียงตามลำดับที่ต้อง join
+JOINS = (
+    (SubDistrict, SubDistrict.code == RubberFarm.subdistrict_id),
+    (District, District.code == SubDistrict.district_id),
+    (Province, Province.code == District.province_id),
+    (SoilGeography, SoilGeography.id == RubberFarm.soil_id),
+    (WeatherGeography, WeatherGeography.id == RubberFarm.weather_id),
+)
+
+
+def parse_group_by(group_by: str) -> list[str]:
+    """
+    แปลง group_by ที่คั่นด้วย "," เป็นรายการมิติ (ไม่ซ้ำ และคงลำดับเดิม) \n
+    Split a comma-separated `group_by` into known dimensions, keeping order.
+    """
+
+    groups = list(dict.fromkeys(group.strip() for group in group_by.split(",") if group.strip()))
+
+    if not groups:
+        raise InvalidInputException(message="กรุณาระบุ group_by")
+
+    unknown = [group for group in groups if group not in REPORT_GROUPS]
+
+    if unknown:
+        raise InvalidInputException(message=f"ไม่รองรับการจัดกลุ่มตาม {', '.join(unknown)}")
+
+    return groups
+
+
+def parse_metrics(metrics: str) -> list[str]:
+    """
+    แปลงรายการคอลัมน์ตัวเลขที่คั่นด้วย "," (ไม่ซ้ำ และคงลำดับเดิม) \n
+    Split a comma-separated metric list into known metrics, keeping order.
+    """
+
+    names = list(dict.fromkeys(name.strip() for name in metrics.split(",") if name.strip()))
+    unknown = [name for name in names if name not in METRICS]
+
+    if unknown or not names:
+        raise InvalidInputException(message=f"ไม่รองรับคอลัมน์ {', '.join(unknown)}")
+
+    return names
+
+
+def distribution_statistics(keys: np.ndarray, values: np.ndarray, group_count: int, bins: int) -> dict:
+    """
+    histogram และควอนไทล์ของทุกกลุ่มพร้อมกันแบบ vectorized \n
+    Histogram and quantiles of every group in one vectorized pass.
+
+    #### Parameters
+        keys: np.ndarray => index ของกลุ่ม (0..group_count-1) ของแต่ละค่า
+        values: np.ndarray => ค่าที่ไม่เป็น NaN
+
+    #### Description
+        เรียงค่าตาม (กลุ่ม, ค่า) ครั้งเดียว แล้วหยิบตำแหน่งของ min/max/ควอนไทล์ของแต่ละกลุ่มจาก offset
+        ควอนไทล์ใช้การประมาณค่าเชิงเส้นแบบเดียวกับ percentile_cont ของ Postgres
+        ขอบของ histogram ใช้ร่วมกันทุกกลุ่ม (min..max ของทั้งชุด) เพื่อให้เทียบกันได้ \n
+        One lexsort by (group, value), then every group's min, max and
+        quantiles are read at computed offsets, interpolating linearly like
+        Postgres percentile_cont. Histogram edges are shared by all groups
+        (min..max of the whole selection) so the groups are comparable.
+
+    #### Returns
+        dict => edges, count, min, max, ควอนไทล์ และ histogram (group_count × bins)
+    """
+
+    counts = np.bincount(keys, minlength=group_count)
+
+    if values.size == 0:
+        empty = np.full(group_count, np.nan)
+        return {
+            "edges": np.zeros(bins + 1),
+            "count": counts,
+            "min": empty,
+            "max": empty,
+            **{name: empty for name, _ in DISTRIBUTION_QUANTILES},
+            "histogram": np.zeros((group_count, bins), dtype=np.int64),
+        }
+
+    order = np.lexsort((values, keys))
+    keys, values = keys[order], values[order]
+
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    present = counts > 0
+    last = values.size - 1
+
+    def at(positions: np.ndarray) -> np.ndarray:
+        return np.where(present, values[np.minimum(positions, last)], np.nan)
+
+    statistics = {
+        "count": counts,
+        "min": at(starts),
+        "max": at(starts + np.maximum(counts - 1, 0)),
+    }
+
+    for name, quantile in DISTRIBUTION_QUANTILES:
+        position = starts + quantile * np.maximum(counts - 1, 0)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        statistics[name] = at(lower) + (at(upper) - at(lower)) * (position - lower)
+
+    low, high = values.min(), values.max()
+    edges = np.linspace(low, high if high > low else low + 1, bins + 1)
+    positions = np.clip(np.searchsorted(edges, values, side="right") - 1, 0, bins - 1)
+
+    statistics["edges"] = edges
+    statistics["histogram"] = np.bincount(keys * bins + positions, minlength=group_count * bins).reshape(group_count, bins)
+
+    return statistics
+
+
+def report_filters(query: ReportFilterSchema) -> dict[str, int]:
+    return {dimension: getattr(query, dimension) for dimension in REPORT_GROUPS if getattr(query, dimension) is not None}
+
+
+def rollup_level(dimensions: set[str]) -> str | None:
+    """
+    ระดับของตารางสรุปที่ตอบมิติ/ตัวกรองชุดนี้ได้ หรือ None เมื่อต้องคำนวณจาก RubberFarm \n
+    The rollup level that can answer these dimensions and filters, or None
+    when they need the farm table (soil type, or more than one geo level).
+    """
+
+    if not dimensions <= {*ROLLUP_LEVELS, "rubber_type", "year"}:
+        return None
+
+    levels = dimensions.intersection(ROLLUP_LEVELS)
+
+    if len(levels) > 1:
+        return None
+
+    # ไม่มีมิติพื้นที่: ใช้ระดับภาค ซึ่งมีจำนวนแถวน้อยที่สุดและครอบคลุมทุกแปลง
+    return next(iter(levels), "geography")
+
+
+def farm_statement(columns: list, dimensions: set[str], filters: dict[str, int]):
+    """
+    SELECT จาก RubberFarm พร้อม join เฉพาะตารางที่มิติและตัวกรองต้องใช้ \n
+    A SELECT over RubberFarm that joins only the tables the requested
+    dimensions and filters need.
+    """
+
+    needed = set()
+
+    for dimension in dimensions | filters.keys():
+        needed.update(DIMENSIONS[dimension][1])
+
+    stmt = select(*columns).select_from(RubberFarm)
+
+    for model, onclause in JOINS:
+        if model in needed:
+            stmt = stmt.join(model, onclause)
+
+    for dimension, value in filters.items():
+        stmt = stmt.where(DIMENSIONS[dimension][0] == value)
+
+    return stmt
+
+
+class ReportService:
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self._names: dict[str, dict[int, str]] = {}
+
+    async def get_rubber_farm_summary(self, query: RubberFarmSummaryQuerySchema) -> list[dict]:
+        """
+        สรุปข้อมูลแปลงยางตามมิติที่เลือก (จำนวนแปลง ผลรวมและค่าเฉลี่ยของแต่ละคอลัมน์) \n
+        Summarize rubber farms by the requested dimensions: farm count and the
+        sum/average of every numeric column.
+
+        #### Parameters
+            query: RubberFarmSummaryQuerySchema => มิติที่จัดกลุ่ม ตัวกรอง และการแบ่งหน้า
+
+        #### Description
+            การรวมทั้งหมดทำใน SQL ด้วย GROUP BY คำสั่งเดียว ไม่มีการโหลดแปลงยางมาคำนวณใน Python
+            ถ้ามิติและตัวกรองอยู่ในตารางสรุป (ระดับพื้นที่เดียว × พันธุ์ยาง × ปี) จะอ่านจากตารางสรุปแทน
+            เมื่อเปิดใช้ snapshot (ANALYTICS_SNAPSHOT_ENABLED) และยังเป็นรุ่นล่าสุด จะคำนวณจาก snapshot แทน
+            ชื่อพื้นที่มาจากต้นไม้ข้อมูลพื้นที่ในหน่วยความจำ ผลลัพธ์ถูกแคชจนกว่าตารางที่อ่านจะถูกแก้ไข \n
+            All aggregation runs in one GROUP BY statement; farms are never
+            loaded into Python. Groupings covered by RubberFarmRollup (one geo
+            level × rubber type × year) read the rollup rows instead of the
+            farms. When the NumPy snapshot is enabled and current, the groups
+            are computed from it instead. Place names come from the in-memory
+            geo tree. Results are cached until one of SUMMARY_TABLES changes.
+
+        #### Returns
+            list[dict] => หนึ่งรายการต่อกลุ่ม พร้อม farm_count และ sum/avg ของแต่ละคอลัมน์
+        """
+
+        return await report_cache.get_or_set(
+            self.session,
+            ("rubber-farm/summary", tuple(query.model_dump().items())),
+            SUMMARY_TABLES,
+            lambda: self._rubber_farm_summary(query),
+        )
+
+    async def _rubber_farm_summary(self, query: RubberFarmSummaryQuerySchema) -> list[dict]:
+        snapshot = await farm_snapshot.current(self.session)
+
+        if snapshot is not None:
+            groups = parse_group_by(query.group_by)
+            rows = await asyncio.to_thread(snapshot.group_summary, groups, report_filters(query))
+
+            return await self.summary_rows(rows[query.offset:query.offset + query.limit], groups, query.type)
+
+        stmt, groups = self.summary_statement(query)
+
+        try:
+            rows = (await self.session.execute(stmt)).all()
+
+            return await self.summary_rows(rows, groups, query.type)
+
+        except SQLAlchemyError as e:
+            logger.error("SQLAlchemy error: %s", e)
+            raise SQLProcessException(
+                event=e,
+                message="เกิดข้อผิดพลาดในการสรุปข้อมูลแปลงยาง",
+            )
+
+    def summary_statement(self, query: RubberFarmSummaryQuerySchema) -> tuple:
+        """
+        คำสั่ง SELECT ของรายงานสรุป (จากตารางสรุปเมื่อทำได้) พร้อมรายการมิติที่จัดกลุ่ม \n
+        Build the summary SELECT, from the rollups when they cover the
+        grouping, and return it with the parsed group list.
+        """
+
+        groups = parse_group_by(query.group_by)
+        filters = report_filters(query)
+        level = rollup_level(set(groups) | filters.keys())
+
+        if level:
+            stmt = self._rollup_statement(level, groups, filters)
+        else:
+            stmt = self._farm_summary_statement(groups, filters)
+
+        return stmt.limit(query.limit).offset(query.offset), groups
+
+    def _farm_summary_statement(self, groups: list[str], filters: dict[str, int]):
+        """
+        GROUP BY บนตาราง RubberFarm โดยตรง \n
+        Aggregate straight from RubberFarm.
+        """
+
+        group_columns = [DIMENSIONS[group][0].label(group) for group in groups]
+        metric_columns = [func.count().label("farm_count")]
+
+        for metric in METRICS:
+            column = getattr(RubberFarm, metric)
+            metric_columns += [
+                func.sum(column).label(f"{metric}_sum"),
+                cast(func.avg(column), Float).label(f"{metric}_avg"),
+            ]
+
+        return (
+            farm_statement(group_columns + metric_columns, set(groups), filters)
+            .group_by(*(DIMENSIONS[group][0] for group in groups))
+            .order_by(*(DIMENSIONS[group][0] for group in groups))
+        )
+
+    def _rollup_statement(self, level: str, groups: list[str], filters: dict[str, int]):
+        """
+        รวมแถวของตารางสรุประดับ level แทนการอ่านแปลงยางทุกแปลง \n
+        Aggregate the rollup rows of one level instead of scanning every farm.
+        """
+
+        columns = {
+            level: RubberFarmRollup.geo_code,
+            "rubber_type": RubberFarmRollup.rubber_type_id,
+            "year": RubberFarmRollup.year,
+        }
+
+        group_columns = [columns[group].label(group) for group in groups]
+        metric_columns = [cast(func.sum(RubberFarmRollup.farm_count), Integer).label("farm_count")]
+
+        for metric in METRICS:
+            total = func.sum(getattr(RubberFarmRollup, f"{metric}_sum"))
+            count = func.sum(getattr(RubberFarmRollup, f"{metric}_count"))
+            metric_columns += [
+                # ไม่มีค่าเลยให้เป็น NULL เหมือน SUM ใน SQL
+                case((count > 0, total)).label(f"{metric}_sum"),
+                (total / cast(func.nullif(count, 0), Float)).label(f"{metric}_avg"),
+            ]
+
+        stmt = select(*group_columns, *metric_columns).where(RubberFarmRollup.level == level)
+
+        for dimension, value in filters.items():
+            stmt = stmt.where(columns[dimension] == value)
+
+        return (
+            stmt
+            .group_by(*(columns[group] for group in groups))
+            .order_by(*(columns[group] for group in groups))
+        )
+
+    async def get_trends(self, query: TrendQuerySchema) -> list[dict]:
+        """
+        อนุกรมเวลารายปีของสภาพอากาศเฉลี่ยและข้อมูลแปลงยาง ต่อจังหวัดหรืออำเภอ พร้อมผลต่างจากปีก่อน \n
+        Yearly series of climate averages and farm aggregates per province or
+        district, with the change from the previous year.
+
+        #### Parameters
+            query: TrendQuerySchema => ระดับพื้นที่ ตัวกรองจังหวัด/อำเภอ และช่วงปี
+
+        #### Description
+            สภาพอากาศมาจาก WeatherGeography (ระดับจังหวัด อำเภอใช้ค่าของจังหวัดที่สังกัด)
+            ข้อมูลแปลงยางมาจากตารางสรุป RubberFarmRollup ทั้งสองส่วนรวมกันด้วย FULL JOIN ตาม (รหัสพื้นที่, ปี)
+            และผลต่างจากปีก่อนคำนวณด้วย window function LAG ใน SQL \n
+            Climate comes from WeatherGeography (districts use their province's
+            weather) and farm figures from RubberFarmRollup. Both are joined on
+            (code, year) and year-over-year deltas are computed with LAG. The
+            year range is applied after the window, so the first returned year
+            still has a delta when an earlier year exists.
+
+        #### Returns
+            list[dict] => หนึ่งรายการต่อพื้นที่ พร้อม points เรียงตามปี
+        """
+
+        return await report_cache.get_or_set(
+            self.session,
+            ("trends", tuple(query.model_dump().items())),
+            TREND_TABLES,
+            lambda: self._trends(query),
+        )
+
+    async def _trends(self, query: TrendQuerySchema) -> list[dict]:
+        if query.level == "province" and query.district is not None:
+            raise InvalidInputException(message="ตัวกรอง district ใช้ได้เฉพาะ level=district")
+
+        try:
+            climate = self._climate_statement(query).cte("climate")
+            farms = self._farm_trend_statement(query).cte("farms")
+
+            code = func.coalesce(climate.c.code, farms.c.code)
+            year = func.coalesce(climate.c.year, farms.c.year)
+
+            series = (
+                select(
+                    code.label("code"),
+                    year.label("year"),
+                    *(climate.c[metric] for metric in CLIMATE_METRICS),
+                    *(farms.c[metric] for metric in FARM_TREND_METRICS),
+                )
+                .select_from(climate.join(
+                    farms,
+                    (climate.c.code == farms.c.code) & (climate.c.year == farms.c.year),
+                    full=True
+                ))
+                .subquery("series")
+            )
+
+            window = {"partition_by": series.c.code, "order_by": series.c.year}
+
+            deltas = (
+                select(
+                    series.c.code,
+                    series.c.year,
+                    *(series.c[metric] for metric in TREND_METRICS),
+                    *(
+                        (series.c[metric] - func.lag(series.c[metric]).over(**window)).label(f"{metric}_delta")
+                        for metric in TREND_METRICS
+                    ),
+                )
+                .subquery("deltas")
+            )
+
+            stmt = select(deltas)
+
+            if query.year_from is not None:
+                stmt = stmt.where(deltas.c.year >= query.year_from)
+            if query.year_to is not None:
+                stmt = stmt.where(deltas.c.year <= query.year_to)
+
+            rows = (await self.session.execute(stmt.order_by(deltas.c.code, deltas.c.year))).all()
+
+            index = await geo_cache.get_index(self.session)
+
+            series_by_code: dict[int, dict] = {}
+
+            for row in rows:
+                node = series_by_code.get(row.code)
+
+                if node is None:
+                    node = series_by_code[row.code] = {
+                        "level": query.level,
+                        "code": row.code,
+                        "name": self._geo_name(index, query.level, row.code, query.type),
+                        "points": [],
+                    }
+
+                node["points"].append({
+                    "year": row.year,
+                    **{
+                        metric: {"value": getattr(row, metric), "delta": getattr(row, f"{metric}_delta")}
+                        for metric in TREND_METRICS
+                    },
+                })
+
+            return list(series_by_code.values())
+
+        except SQLAlchemyError as e:
+            logger.error("SQLAlchemy error: %s", e)
+            raise SQLProcessException(
+                event=e,
+                message="เกิดข้อผิดพลาดในการดึงข้อมูลแนวโน้ม",
+            )
+
+    def _climate_statement(self, query: TrendQuerySchema):
+        """
+        ค่าเฉลี่ยสภาพอากาศต่อ (พื้นที่, ปี) จาก index (province_id, year) \n
+        Climate averages per (code, year), served by the (province_id, year) index.
+        """
+
+        code = District.code if query.level == "district" else WeatherGeography.province_id
+
+        stmt = select(
+            code.label("code"),
+            WeatherGeography.year,
+            *(cast(func.avg(getattr(WeatherGeography, metric)), Float).label(metric) for metric in CLIMATE_METRICS),
+        )
+
+        if query.level == "district":
+            stmt = stmt.join(District, District.province_id == WeatherGeography.province_id)
+
+            if query.district is not None:
+                stmt = stmt.where(District.code == query.district)
+
+        if query.province is not None:
+            stmt = stmt.where(WeatherGeography.province_id == query.province)
+
+        return stmt.group_by(code, WeatherGeography.year)
+
+    def _farm_trend_statement(self, query: TrendQuerySchema):
+        """
+        ข้อมูลแปลงยางต่อ (พื้นที่, ปี) จากตารางสรุป \n
+        Farm aggregates per (code, year), read from the rollups.
+        """
+
+        columns = [RubberFarmRollup.geo_code.label("code"), RubberFarmRollup.year]
+
+        for metric, kind in FARM_TREND_METRICS.items():
+            if metric == "farm_count":
+                columns.append(cast(func.sum(RubberFarmRollup.farm_count), Float).label(metric))
+                continue
+
+            total = func.sum(getattr(RubberFarmRollup, f"{metric}_sum"))
+            count = func.sum(getattr(RubberFarmRollup, f"{metric}_count"))
+
+            if kind == "sum":
+                columns.append(case((count > 0, total)).label(metric))
+            else:
+                columns.append((total / cast(func.nullif(count, 0), Float)).label(metric))
+
+        stmt = select(*columns).where(RubberFarmRollup.level == query.level)
+
+        if query.level == "district":
+            if query.district is not None:
+                stmt = stmt.where(RubberFarmRollup.geo_code == query.district)
+            if query.province is not None:
+                stmt = (
+                    stmt.join(District, District.code == RubberFarmRollup.geo_code)
+                    .where(District.province_id == query.province)
+                )
+        elif query.province is not None:
+            stmt = stmt.where(RubberFarmRollup.geo_code == query.province)
+
+        return stmt.group_by(RubberFarmRollup.geo_code, RubberFarmRollup.year)
+
+    async def get_distribution(self, query: DistributionQuerySchema) -> list[dict]:
+        """
+        การกระจายตัวของคอลัมน์ตัวเลขต่อพื้นที่และพันธุ์ยาง: histogram และ p10/p50/p90 \n
+        Spread of farm metrics per area and rubber type: a histogram with
+        `bins` bins plus p10/p50/p90.
+
+        #### Parameters
+            query: DistributionQuerySchema => ระดับพื้นที่ คอลัมน์ จำนวนช่อง และตัวกรอง
+
+        #### Description
+            อ่านเฉพาะคอลัมน์ที่ต้องใช้เป็นอาร์เรย์ (จาก snapshot ถ้ามี ไม่เช่นนั้นจาก Postgres)
+            แล้วคำนวณด้วย NumPy ทั้งหมด ผลลัพธ์ถูกแคชต่อชุดพารามิเตอร์จนกว่าข้อมูลจะเปลี่ยน \n
+            Only the needed columns are read as arrays (from the snapshot when
+            it is current, otherwise streamed from Postgres) and everything is
+            computed with NumPy. Results are cached per parameter set until the
+            underlying tables change.
+
+        #### Returns
+            list[dict] => หนึ่งรายการต่อ (พื้นที่, พันธุ์ยาง) เรียงตามรหัส
+        """
+
+        return await report_cache.get_or_set(
+            self.session,
+            ("distribution", tuple(query.model_dump().items())),
+            DISTRIBUTION_TABLES,
+            lambda: self._distribution(query),
+        )
+
+    async def _distribution(self, query: DistributionQuerySchema) -> list[dict]:
+        metrics = parse_metrics(query.metrics)
+        filters = report_filters(query)
+        snapshot = await farm_snapshot.current(self.session)
+
+        try:
+            if snapshot is not None:
+                columns = snapshot.columns([query.level, "rubber_type"], metrics, filters)
+            else:
+                stmt = farm_statement(
+                    [
+                        DIMENSIONS[query.level][0].label(query.level),
+                        RubberFarm.rubber_type_id.label("rubber_type"),
+                        *(getattr(RubberFarm, metric) for metric in metrics),
+                    ],
+                    {query.level},
+                    filters,
+                )
+                columns = await fetch_columns(self.session, stmt, (query.level, "rubber_type"), tuple(metrics))
+
+            names = (await self._type_names(["rubber_type"]))["rubber_type"]
+
+        except SQLAlchemyError as e:
+            logger.error("SQLAlchemy error: %s", e)
+            raise SQLProcessException(
+                event=e,
+                message="เกิดข้อผิดพลาดในการคำนวณการกระจายตัวของข้อมูลแปลงยาง",
+            )
+
+        groups, statistics = await asyncio.to_thread(self._distribution_statistics, columns, query.level, metrics, query.bins)
+
+        index = await geo_cache.get_index(self.session)
+
+        distributions = []
+
+        for i, (code, rubber_type) in enumerate(groups):
+            distribution = {
+                "level": query.level,
+                "code": code,
+                "name": self._geo_name(index, query.level, code, query.type),
+                "rubber_type": {"code": rubber_type, "name": names.get(rubber_type)},
+                "metrics": {},
+            }
+
+            for metric in metrics:
+                values = statistics[metric]
+                edges = values["edges"]
+
+                distribution["metrics"][metric] = {
+                    **{
+                        name: None if np.isnan(values[name][i]) else float(values[name][i])
+                        for name in ("min", "max", *(quantile for quantile, _ in DISTRIBUTION_QUANTILES))
+                    },
+                    "count": int(values["count"][i]),
+                    "histogram": [
+                        {"lower": float(edges[b]), "upper": float(edges[b + 1]), "count": int(count)}
+                        for b, count in enumerate(values["histogram"][i])
+                    ],
+                }
+
+            distributions.append(distribution)
+
+        return distributions
+
+    @staticmethod
+    def _distribution_statistics(columns: dict[str, np.ndarray], level: str, metrics: list[str], bins: int) -> tuple[list, dict]:
+        """
+        จัดกลุ่มตาม (พื้นที่, พันธุ์ยาง) แล้วคำนวณสถิติของแต่ละคอลัมน์ \n
+        Group by (area, rubber type) and compute every metric's statistics.
+        """
+
+        codes, code_index = np.unique(columns[level], return_inverse=True)
+        types, type_index = np.unique(columns["rubber_type"], return_inverse=True)
+
+        keys = np.ravel_multi_index((code_index, type_index), (max(len(codes), 1), max(len(types), 1)))
+        unique_keys, keys = np.unique(keys, return_inverse=True)
+
+        code_positions, type_positions = np.unravel_index(unique_keys, (max(len(codes), 1), max(len(types), 1)))
+        groups = list(zip(codes[code_positions].tolist(), types[type_positions].tolist()))
+
+        statistics = {}
+
+        for metric in metrics:
+            values = columns[metric]
+            present = ~np.isnan(values)
+            statistics[metric] = distribution_statistics(keys[present], values[present], len(groups), bins)
+
+        return groups, statistics
+
+    async def summary_rows(self, rows, groups: list[str], lang: str | None) -> list[dict]:
+        """
+        แปลงแถวผลรวมเป็น dict พร้อมชื่อของแต่ละกลุ่ม \n
+        Shape aggregate rows into dicts and attach a name to every group value.
+        """
+
+        index = await geo_cache.get_index(self.session)
+        names = await self._type_names(groups)
+
+        summaries = []
+
+        for row in rows:
+            summary = {}
+
+            for group in groups:
+                value = getattr(row, group)
+
+                if group == "year" or value is None:
+                    summary[group] = value
+                elif group in names:
+                    summary[group] = {"code": value, "name": names[group].get(value)}
+                else:
+                    summary[group] = {"code": value, "name": self._geo_name(index, group, value, lang)}
+
+            summary["farm_count"] = row.farm_count
+
+            for metric in METRICS:
+                summary[metric] = {
+                    "sum": getattr(row, f"{metric}_sum"),
+                    "avg": getattr(row, f"{metric}_avg"),
+                }
+
+            summaries.append(summary)
+
+        return summaries
+
+    async def _type_names(self, groups: list[str]) -> dict[str, dict[int, str]]:
+        """
+        ชื่อพันธุ์ยาง/ชนิดดิน (ตารางขนาดเล็ก) เฉพาะมิติที่ถูกเลือก \n
+        Names of rubber types and soil types, loaded only when grouped by them
+        and kept for the lifetime of the service (e.g. across export batches).
+        """
+
+        for group, model in (("rubber_type", RubberType), ("soil_type", SoilType)):
+            if group in groups and group not in self._names:
+                rows = (await self.session.execute(select(model.id, model.name))).all()
+                self._names[group] = {row.id: row.name for row in rows}
+
+        return {group: names for group, names in self._names.items() if group in groups}
+
+    def _geo_name(self, index: GeoIndex, group: str, code: int, lang: str | None) -> str | None:
+        entries = {
+            "geography": index.geographies,
+            "province": index.provinces,
+            "district": index.districts,
+            "subdistrict": index.sub_districts,
+        }[group]
+
+        entry = entries.get(code)
+
+        if entry is None:
+            return None
+
+        return entry.name_en if lang == "en" else entry.name_th
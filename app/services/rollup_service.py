@@ -0,0 +1,121 @@
+import logging
+from sqlalchemy import ARRAY, Integer, String, any_, bindparam, delete, func, literal, true, union_all
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.table_version import bump_table_version
+from app.models import RubberFarm, RubberFarmRollup, WeatherGeography
+from app.services.report_service import DIMENSIONS, METRICS, ROLLUP_LEVELS, farm_statement
+from app.utilities.app_exceptions import SQLProcessException, ServerProcessException
+
+logger = logging.getLogger(__name__)
+
+# คอลัมน์สะสมของตารางสรุปที่ถูกบวก/ลบด้วย delta
+COUNTER_COLUMNS = ("farm_count", *(f"{metric}_{part}" for metric in METRICS for part in ("sum", "count")))
+
+
+class RubberFarmRollupService:
+    """
+    ดูแลตารางสรุป RubberFarmRollup ให้ตรงกับข้อมูลแปลงยาง \n
+    Keeps the RubberFarmRollup table in step with RubberFarm.
+
+    #### Description
+        การเพิ่ม/ลบแปลงยางจะคำนวณเฉพาะส่วนต่าง (delta) ของแปลงที่เปลี่ยน แล้วบวกเข้าตารางสรุป
+        ด้วย INSERT ... SELECT ... ON CONFLICT DO UPDATE คำสั่งเดียว ภายใน transaction เดียวกับการเขียนแปลงยาง \n
+        Farm writes aggregate only the changed farms and add the delta with one
+        INSERT ... SELECT ... ON CONFLICT DO UPDATE, inside the caller's
+        transaction, so the rollups commit or roll back with the farms.
+        Call `remove_farms` before deleting or updating farms and `add_farms`
+        after inserting or updating them.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def add_farms(self, farm_ids: list[int]) -> None:
+        await self._apply(self._farm_filter(farm_ids), sign=1)
+
+    async def remove_farms(self, farm_ids: list[int]) -> None:
+        await self._apply(self._farm_filter(farm_ids), sign=-1)
+
+        # ลบกลุ่มที่ไม่เหลือแปลงยางแล้ว
+        await self.session.execute(delete(RubberFarmRollup).where(RubberFarmRollup.farm_count <= 0))
+
+    async def rebuild(self) -> None:
+        """
+        สร้างตารางสรุปใหม่ทั้งหมดจาก RubberFarm (ใช้เมื่อย้ายพื้นที่ไปสังกัดอื่น หรือแก้ข้อมูลนอกระบบ) \n
+        Recompute every rollup row from RubberFarm, e.g. after places are moved
+        to another parent or farms are edited outside the API.
+        """
+
+        try:
+            await self.session.execute(delete(RubberFarmRollup))
+            await self._apply(true(), sign=1)
+            await bump_table_version(self.session, "RubberFarmRollup")
+            await self.session.commit()
+            logger.info("Rubber farm rollups rebuilt")
+
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            logger.error("SQLAlchemy error: %s", e)
+            raise SQLProcessException(
+                event=e,
+                message="เกิดข้อผิดพลาดในการคำนวณตารางสรุปแปลงยาง",
+            )
+
+        except Exception as e:
+            await self.session.rollback()
+            logger.error("Unknown error: %s", e)
+            raise ServerProcessException(message="เกิดข้อผิดพลาดที่ไม่รู้จัก")
+
+    def _farm_filter(self, farm_ids: list[int]):
+        # ส่ง id ทั้งหมดเป็น array พารามิเตอร์เดียว (ไม่ติดขีดจำกัดจำนวนพารามิเตอร์ของ asyncpg)
+        return RubberFarm.id == any_(bindparam("farm_ids", list(farm_ids), type_=ARRAY(Integer)))
+
+    async def _apply(self, farm_filter, sign: int) -> None:
+        """
+        รวมแปลงยางที่ตรงกับ farm_filter ทุกระดับพื้นที่ แล้วบวก (sign=1) หรือลบ (sign=-1) เข้าตารางสรุป \n
+        Aggregate the farms matching `farm_filter` at every geo level and add
+        (sign=1) or subtract (sign=-1) the result.
+        """
+
+        selects = []
+
+        for level in ROLLUP_LEVELS:
+            geo_column = DIMENSIONS[level][0]
+            columns = [
+                literal(level, String).label("level"),
+                geo_column.label("geo_code"),
+                RubberFarm.rubber_type_id,
+                WeatherGeography.year,
+                (func.count() * sign).label("farm_count"),
+            ]
+
+            for metric in METRICS:
+                column = getattr(RubberFarm, metric)
+                columns += [
+                    (func.coalesce(func.sum(column), 0) * sign).label(f"{metric}_sum"),
+                    (func.count(column) * sign).label(f"{metric}_count"),
+                ]
+
+            selects.append(
+                farm_statement(columns, {level, "year"}, {})
+                .where(farm_filter)
+                .group_by(geo_column, RubberFarm.rubber_type_id, WeatherGeography.year)
+            )
+
+        stmt = insert(RubberFarmRollup).from_select(
+            ["level", "geo_code", "rubber_type_id", "year", *COUNTER_COLUMNS],
+            union_all(*selects),
+        )
+
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_rubber_farm_rollup_key",
+            set_={
+                **{column: getattr(RubberFarmRollup, column) + getattr(stmt.excluded, column) for column in COUNTER_COLUMNS},
+                "updated_at": func.now(),
+            },
+        )
+
+        await self.session.execute(stmt)
@@ -2,9 +2,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql import select
 from sqlalchemy.exc import SQLAlchemyError
 
+from app.core.table_version import bump_table_version
 from app.models import SubDistrict
-from app.schemas import SubDistrictCreateSchema
-from app.utilities.app_exceptions import DuplicateResourceException, ResourceNotFoundException, SQLProcessException, ServerProcessException
+from app.schemas import QuerySubDistrictSchema, SubDistrictCreateSchema
+from app.services.geo_cache import geo_cache
+from app.utilities.app_cursor import paginate_sorted
+from app.utilities.app_exceptions import DuplicateResourceException, InvalidInputException, ResourceNotFoundException, SQLProcessException, ServerProcessException
 
 class SubDistrictService:
 
@@ -51,6 +54,61 @@ class SubDistrictService:
             )
 
 
+    async def get_sub_districts(self, query: QuerySubDistrictSchema) -> tuple[list[dict], str | None]:
+        """
+        ดึงข้อมูลตำบลจากต้นไม้ข้อมูลพื้นที่ในหน่วยความจำ แบ่งหน้าด้วย cursor หรือ offset \n
+        List sub-districts from the in-memory geo tree, paged by cursor or offset.
+        """
+
+        try:
+            index = await geo_cache.get_index(self.session)
+
+            if query.district:
+                sub_districts = index.sub_districts_of(query.district)
+            else:
+                sub_districts = list(index.sub_districts.values())
+
+            if query.search:
+                search = query.search.lower()
+                sub_districts = [
+                    sub_district for sub_district in sub_districts
+                    if search in sub_district.name_th.lower()
+                    or search in (sub_district.name_en or "").lower()
+                    or search in str(sub_district.code)
+                    or search in str(sub_district.zip_code)
+                ]
+
+            if query.order_by_desc:
+                sub_districts = sub_districts[::-1]
+
+            sub_districts, cursor = paginate_sorted(
+                sub_districts, query, lambda sub_district: (sub_district.code,), descending=query.order_by_desc
+            )
+
+            return [
+                {
+                    "code": sub_district.code,
+                    "name": sub_district.name_en if query.type == "en" else sub_district.name_th,
+                    "zip_code": sub_district.zip_code,
+                }
+                for sub_district in sub_districts
+            ], cursor
+
+        except InvalidInputException as e:
+            raise e
+
+        except SQLAlchemyError as e:
+            raise SQLProcessException(
+                event=e,
+                message="เกิดข้อผิดพลาดในการดึงข้อมูลตำบล"
+            )
+
+        except Exception as e:
+            raise ServerProcessException(
+                message="เกิดข้อผิดพลาดที่ไม่รู้จัก"
+            )
+
+
     async def create_sub_district(self, sub_district: SubDistrictCreateSchema):
         """
         Create sub district data.
@@ -68,8 +126,10 @@ class SubDistrictService:
             new_sub_district = SubDistrictService._populate_sub_district_fields(SubDistrict(), sub_district)
 
             self.session.add(new_sub_district)
+            await bump_table_version(self.session, "SubDistrict")
             await self.session.commit()
             await self.session.refresh(new_sub_district)
+            await geo_cache.refresh(self.session)
 
             return new_sub_district
         
@@ -78,14 +138,14 @@ class SubDistrictService:
         
         except SQLAlchemyError as e:
 
-            self.session.rollback()
+            await self.session.rollback()
             raise SQLProcessException(
                 event=e,
                 message="เกิดข้อผิดพลาดในการสร้างข้อมูลตำบล"
             )
         
         except Exception as e:
-            self.session.rollback()
+            await self.session.rollback()
             raise ServerProcessException(
                 message="เกิดข้อผิดพลาดที่ไม่รู้จัก"
             )
@@ -110,8 +170,10 @@ class SubDistrictService:
             
             new_sub_district = self._populate_sub_district_fields(existing_sub_district, update_sub_district)
 
+            await bump_table_version(self.session, "SubDistrict")
             await self.session.commit()
             await self.session.refresh(new_sub_district)
+            await geo_cache.refresh(self.session)
 
             return existing_sub_district
         
@@ -120,14 +182,14 @@ class SubDistrictService:
         
         except SQLAlchemyError as e:
 
-            self.session.rollback()
+            await self.session.rollback()
             raise SQLProcessException(
                 event=e,
                 message="เกิดข้อผิดพลาดในการแก้ไขข้อมูลตำบล"
             )
         
         except Exception as e:
-            self.session.rollback()
+            await self.session.rollback()
             raise ServerProcessException(
                 message="เกิดข้อผิดพลาดที่ไม่รู้จัก"
             )
@@ -150,8 +212,10 @@ class SubDistrictService:
                     message="ไม่พบข้อมูลตำบลที่ต้องการลบ"
                 )
 
-            self.session.delete(existing_sub_district)
+            await self.session.delete(existing_sub_district)
+            await bump_table_version(self.session, "SubDistrict")
             await self.session.commit()
+            await geo_cache.refresh(self.session)
 
             return True
         
@@ -160,14 +224,14 @@ class SubDistrictService:
         
         except SQLAlchemyError as e:
             
-            self.session.rollback()
+            await self.session.rollback()
             raise SQLProcessException(
                 event=e,
                 message="เกิดข้อผิดพลาดในการลบข้อมูลตำบล"
             )
         
         except Exception as e:
-            self.session.rollback()
+            await self.session.rollback()
             raise ServerProcessException(
                 message="เกิดข้อผิดพลาดที่ไม่รู้จัก"
             )
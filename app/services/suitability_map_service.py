@@ -0,0 +1,234 @@
+import logging
+import numpy as np
+from sqlalchemy import delete, desc, func, insert, or_
+from sqlalchemy.sql import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.models import District, SoilGeography, SubDistrict, SuitabilityMap, WeatherGeography
+from app.schemas import SuitablePredictSchema
+from app.schemas.predict_schema import SuitabilityMapQuerySchema
+from app.services.predict_service import PredictService
+from app.services.suitability_rules import NUMERIC_PARAMS, suitability_rules
+from app.utilities.app_exceptions import SQLProcessException, ServerProcessException
+from app.utilities.app_utilities import LIKE_ESCAPE, contains_pattern
+
+logger = logging.getLogger(__name__)
+
+class SuitabilityMapService:
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.predict_service = PredictService(session)
+
+    async def rebuild(self, year: int | None = None) -> int:
+        """
+        คำนวณแผนที่ความเหมาะสมของทุกตำบลใหม่ (เฉพาะปีที่ระบุ หรือทุกปี) \n
+        Rebuild the precomputed suitability of every sub-district.
+
+        #### Parameters
+            year: int | None => ปีที่ต้องการคำนวณใหม่ (None = ทุกปี)
+
+        #### Returns
+            int => จำนวนแถวที่บันทึก
+        """
+
+        try:
+            stmt = (
+                select(
+                    SoilGeography.subdistrict_id,
+                    SoilGeography.year,
+                    SoilGeography.ph_top,
+                    WeatherGeography.rainfall_mm,
+                    WeatherGeography.average_temperature,
+                    WeatherGeography.average_humidity,
+                    WeatherGeography.rainy_day_count,
+                )
+                .distinct(SoilGeography.subdistrict_id, SoilGeography.year)
+                .join(SubDistrict, SubDistrict.code == SoilGeography.subdistrict_id)
+                .join(District, District.code == SubDistrict.district_id)
+                .join(
+                    WeatherGeography,
+                    (WeatherGeography.province_id == District.province_id)
+                    & (WeatherGeography.year == SoilGeography.year)
+                )
+                .order_by(SoilGeography.subdistrict_id, SoilGeography.year, SoilGeography.id)
+            )
+
+            clear_stmt = delete(SuitabilityMap)
+
+            if year:
+                stmt = stmt.where(SoilGeography.year == year)
+                clear_stmt = clear_stmt.where(SuitabilityMap.year == year)
+
+            rows = (await self.session.execute(stmt)).all()
+
+            await self.session.execute(clear_stmt)
+
+            batch_size = settings.SUITABILITY_MAP_BATCH_SIZE
+            for i in range(0, len(rows), batch_size):
+                records = await self._score_rows(rows[i:i + batch_size])
+                await self.session.execute(insert(SuitabilityMap), records)
+
+            await self.session.commit()
+            logger.info("Suitability map rebuilt with %d rows (year=%s)", len(rows), year)
+
+            return len(rows)
+
+        except SQLAlchemyError as e:
+            await self.session.rollback()
+            logger.error("SQLAlchemy error: %s", e)
+            raise SQLProcessException(
+                event=e,
+                message="เกิดข้อผิดพลาดในการคำนวณแผนที่ความเหมาะสม",
+            )
+
+        except ServerProcessException as e:
+            await self.session.rollback()
+            raise e
+
+        except Exception as e:
+            await self.session.rollback()
+            logger.error("Unknown error: %s", e)
+            raise ServerProcessException(message="เกิดข้อผิดพลาดที่ไม่รู้จัก")
+
+    async def _score_rows(self, rows: list) -> list[dict]:
+        """
+        ประเมินเกณฑ์และทำนายผลของแถวข้อมูลทั้งชุดพร้อมกัน \n
+        Score a batch of joined rows with the rule engine and the suitability model.
+        """
+
+        slope = settings.SUITABILITY_MAP_DEFAULT_SLOPE
+
+        numeric = np.array([
+            [row.average_temperature, row.average_humidity, row.rainfall_mm, row.rainy_day_count, slope]
+            for row in rows
+        ], dtype=float)
+
+        levels = suitability_rules.score_numeric(numeric)
+        ph_levels = suitability_rules.score_ph([row.ph_top for row in rows])
+        rule_scores = levels.sum(axis=1) + ph_levels
+
+        # โมเดลรับได้เฉพาะแถวที่มีข้อมูลครบและชั้น pH ที่ encoder รู้จัก
+        ph_classes = set(self.predict_service.load_encoder(
+            self.predict_service.SUITABILITY_ENCODER_DIR, "labelencoders", settings.PREDICT_SUITABILITY_MODEL_VERSION
+        )['pH_top'].classes_)
+
+        predictable = [
+            i for i, row in enumerate(rows)
+            if row.ph_top in ph_classes and not np.isnan(numeric[i, :4]).any()
+        ]
+
+        suitability = [None] * len(rows)
+        confidence = [None] * len(rows)
+
+        if predictable:
+            probabilities = await self.predict_service.predict_suitability_probabilities([
+                SuitablePredictSchema.model_construct(
+                    rainfall=rows[i].rainfall_mm,
+                    temperature=rows[i].average_temperature,
+                    humidity=rows[i].average_humidity,
+                    rainfall_days=rows[i].rainy_day_count,
+                    ph_top=rows[i].ph_top,
+                    slope=slope,
+                )
+                for i in predictable
+            ])
+
+            for i, row_probabilities in zip(predictable, probabilities):
+                suitability[i] = int(np.argmax(row_probabilities))
+                confidence[i] = float(np.max(row_probabilities))
+
+        level_columns = {f"{name}_level": levels[:, j].tolist() for j, name in enumerate(NUMERIC_PARAMS)}
+
+        return [
+            {
+                "subdistrict_id": row.subdistrict_id,
+                "year": row.year,
+                "rainfall_mm": row.rainfall_mm,
+                "average_temperature": row.average_temperature,
+                "average_humidity": row.average_humidity,
+                "rainy_day_count": row.rainy_day_count,
+                "ph_top": row.ph_top,
+                "slope": slope,
+                **{column: values[i] for column, values in level_columns.items()},
+                "ph_top_level": int(ph_levels[i]),
+                "rule_score": int(rule_scores[i]),
+                "suitability": suitability[i],
+                "confidence": confidence[i],
+            }
+            for i, row in enumerate(rows)
+        ]
+
+    async def get_map(self, query: SuitabilityMapQuerySchema) -> list[dict]:
+        """
+        ดึงผลความเหมาะสมที่คำนวณไว้แล้ว เรียงจากเหมาะสมมากไปน้อย \n
+        Return precomputed suitability rows, best ranked first.
+        """
+
+        try:
+            name_column = SubDistrict.name_en if query.type == "en" else SubDistrict.name_th
+
+            stmt = (
+                select(
+                    SuitabilityMap.subdistrict_id,
+                    name_column.label("name"),
+                    SubDistrict.district_id,
+                    District.province_id,
+                    SuitabilityMap.year,
+                    SuitabilityMap.ph_top,
+                    SuitabilityMap.rainfall_mm,
+                    SuitabilityMap.average_temperature,
+                    SuitabilityMap.average_humidity,
+                    SuitabilityMap.rainy_day_count,
+                    SuitabilityMap.slope,
+                    SuitabilityMap.rule_score,
+                    SuitabilityMap.suitability,
+                    SuitabilityMap.confidence,
+                )
+                .join(SubDistrict, SubDistrict.code == SuitabilityMap.subdistrict_id)
+                .join(District, District.code == SubDistrict.district_id)
+            )
+
+            if query.year:
+                stmt = stmt.where(SuitabilityMap.year == query.year)
+            else:
+                stmt = stmt.where(SuitabilityMap.year == select(func.max(SuitabilityMap.year)).scalar_subquery())
+
+            if query.province:
+                stmt = stmt.where(District.province_id == query.province)
+
+            if query.district:
+                stmt = stmt.where(SubDistrict.district_id == query.district)
+
+            if query.min_suitability is not None:
+                stmt = stmt.where(SuitabilityMap.suitability >= query.min_suitability)
+
+            if query.search:
+                stmt = stmt.where(or_(
+                    SubDistrict.name_th.ilike(contains_pattern(query.search), escape=LIKE_ESCAPE),
+                    SubDistrict.name_en.ilike(contains_pattern(query.search), escape=LIKE_ESCAPE)
+                ))
+
+            stmt = (
+                stmt.order_by(
+                    desc(SuitabilityMap.suitability).nulls_last(),
+                    desc(SuitabilityMap.rule_score),
+                    desc(SuitabilityMap.confidence).nulls_last(),
+                    SuitabilityMap.subdistrict_id,
+                )
+                .limit(query.limit)
+                .offset(query.offset)
+            )
+
+            result = await self.session.execute(stmt)
+
+            return [dict(row._mapping) for row in result.all()]
+
+        except SQLAlchemyError as e:
+            logger.error("SQLAlchemy error: %s", e)
+            raise SQLProcessException(
+                event=e,
+                message="เกิดข้อผิดพลาดในการดึงข้อมูลแผนที่ความเหมาะสม",
+            )
@@ -0,0 +1,309 @@
+import logging
+from collections.abc import Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# เกณฑ์ความเหมาะสมของแต่ละตัวแปร (2: เหมาะสม, 1: เหมาะสมปานกลาง, 0: ไม่เหมาะสม)
+SUITABILITY_PARAMS = {
+    "ph_top": {
+        "suitables": ["4.5-5.0", "4.5-5.5", "4.5-6.0", "5.0-5.5"],
+        "moderate": ["5.0-6.5", "5.5-6.5"],
+        "not_suitable": ["<4.0", "5.5-7.0", "5.5-8.0", "6.0-7.0", "6.0-8.0"],
+        "messages": {
+            "not_suitable": "ค่า pH ดินเฉลี่ย {value} ไม่เหมาะสม ควรมีค่า pH ดินระหว่าง {suitable}",
+            "moderate": "ค่า pH ดินเฉลี่ย {value} เหมาะสมปานกลาง ค่าที่เหมาะสมควรอยู่ระหว่าง {suitable}",
+            "suitable": "ค่า pH ดินเฉลี่ย {value} อยู่ในเกณฑ์ที่เหมาะสม"
+        }
+    },
+    "temperature": {
+        "ranges": {
+            "suitable": [{"min": 24, "max": 27}],
+            "moderate": [{"min": 20, "max": 24}, {"min": 27, "max": 35}],
+            "not_suitable": [{"max": 20}, {"min": 35}]
+        },
+        "messages": {
+            "not_suitable": "อุณหภูมิเฉลี่ย {value} °C ไม่เหมาะสม ควรอยู่ระหว่าง 24-27 °C",
+            "moderate": "อุณหภูมิเฉลี่ย {value} °C เหมาะสมปานกลาง ค่าที่เหมาะสมควรอยู่ระหว่าง 24-27 °C",
+            "suitable": "อุณหภูมิเฉลี่ย {value} °C อยู่ในเกณฑ์ที่เหมาะสม"
+        }
+    },
+    "humidity": {
+        "ranges": {
+            "suitable": [{"min": 65, "max": 80}],
+            "moderate": [{"min": 50, "max": 65}, {"min": 80, "max": 90}],
+            "not_suitable": [{"max": 50}, {"min": 90}]
+        },
+        "messages": {
+            "not_suitable": "ความชื้นสัมพัทธ์เฉลี่ย {value} % ไม่เหมาะสม ควรอยู่ระหว่าง 65-80 %",
+            "moderate": "ความชื้นสัมพัทธ์เฉลี่ย {value} % เหมาะสมปานกลาง ค่าที่เหมาะสมควรอยู่ระหว่าง 65-80 %",
+            "suitable": "ความชื้นสัมพัทธ์เฉลี่ย {value} % อยู่ในเกณฑ์ที่เหมาะสม"
+        }
+    },
+    "rainfall": {
+        "ranges": {
+            "suitable": [{"min": 1350, "max": 2500}],
+            "moderate": [{"min": 1000, "max": 1350}, {"min": 2500, "max": 3000}],
+            "not_suitable": [{"max": 1000}, {"min": 3000}]
+        },
+        "messages": {
+            "not_suitable": "ปริมาณน้ำฝนเฉลี่ย {value} มม. ไม่เหมาะสม ควรอยู่ระหว่าง 1350-2500 มม.",
+            "moderate": "ปริมาณน้ำฝนเฉลี่ย {value} มม. เหมาะสมปานกลาง ค่าที่เหมาะสมควรอยู่ระหว่าง 1350-2500 มม.",
+            "suitable": "ปริมาณน้ำฝนเฉลี่ย {value} มม. อยู่ในเกณฑ์ที่เหมาะสม"
+        }
+    },
+    "rainfall_days": {
+        "ranges": {
+            "suitable": [{"min": 120, "max": 200}],
+            "moderate": [{"min": 100, "max": 120}, {"min": 200, "max": 250}],
+            "not_suitable": [{"max": 100}, {"min": 250}]
+        },
+        "messages": {
+            "not_suitable": "จำนวนวันฝนตกเฉลี่ย {value} วัน ไม่เหมาะสม ควรอยู่ระหว่าง 120-200 วัน",
+            "moderate": "จำนวนวันฝนตกเฉลี่ย {value} วัน เหมาะสมปานกลาง ค่าที่เหมาะสมควรอยู่ระหว่าง 120-200 วัน",
+            "suitable": "จำนวนวันฝนตกเฉลี่ย {value} วัน อยู่ในเกณฑ์ที่เหมาะสม"
+        }
+    },
+    "slope": {
+        "ranges": {
+            "suitable": [{"min": 15, "max": 16}],
+            "moderate": [{"min": 0, "max": 15}, {"min": 16, "max": 45}],
+            "not_suitable": [{"min": 45}]
+        },
+        "messages": {
+            "not_suitable": "ความลาดชันเฉลี่ย {value} องศา ไม่เหมาะสม ควรอยู่ระหว่าง 15-16 องศา",
+            "moderate": "ความลาดชันเฉลี่ย {value} องศา เหมาะสมปานกลาง ค่าที่เหมาะสมควรอยู่ระหว่าง 15-16 องศา",
+            "suitable": "ความลาดชันเฉลี่ย {value} องศา อยู่ในเกณฑ์ที่เหมาะสม"
+        }
+    }
+}
+
+
+# ลำดับของตัวแปรในผลการประเมิน และคอลัมน์ของ matrix ที่ใช้กับ score_numeric
+NUMERIC_PARAMS = ("temperature", "humidity", "rainfall", "rainfall_days", "slope")
+EVALUATION_ORDER = ("temperature", "humidity", "rainfall", "rainfall_days", "slope", "ph_top")
+
+SUITABLE, MODERATE, NOT_SUITABLE = 2, 1, 0
+
+
+def _convert_to_float(value) -> float:
+    """Converts string values (including those with < or >) to float."""
+    if isinstance(value, str):
+        # Handle range values differently - extract first number for comparison
+        if "-" in value and not value.startswith("<") and not value.startswith(">"):
+            try:
+                # Return the midpoint of the range for comparison
+                min_val, max_val = map(float, value.split("-"))
+                return (min_val + max_val) / 2
+            except ValueError:
+                # If can't parse the range, log and return a default
+                logger.warning(f"Could not parse range value: {value}")
+                return 0.0
+
+        # Handle < and > values
+        if value.startswith('<'):
+            return float(value[1:]) - 0.1
+        elif value.startswith('>'):
+            return float(value[1:]) + 0.1
+
+        # Regular numeric string
+        return float(value)
+
+    # Already a numeric value
+    return float(value)
+
+
+def _is_in_range(value_float: float, range_str: str) -> bool:
+    """Checks if a value is within a specified range."""
+    try:
+        if range_str.startswith("<"):
+            return value_float < float(range_str[1:])
+        elif range_str.startswith(">"):
+            return value_float > float(range_str[1:])
+        else:
+            min_val, max_val = map(float, range_str.split("-"))
+            return min_val <= value_float <= max_val
+    except ValueError as e:
+        logger.error(f"Invalid range format '{range_str}': {str(e)}")
+        return False
+
+
+def _evaluate_ph_top(value: str, param: dict) -> dict:
+    """Evaluates a pH top class such as "4.5-5.0" against the defined classes."""
+    suitable = " หรือ ".join(param["suitables"])
+
+    if value in param["suitables"]:
+        level = SUITABLE
+    elif value in param["moderate"]:
+        level = MODERATE
+    elif value in param["not_suitable"]:
+        level = NOT_SUITABLE
+    else:
+        # Unknown class, evaluate it numerically (midpoint of the range)
+        try:
+            value_float = _convert_to_float(value)
+        except ValueError:
+            logger.error(f"Invalid pH value format: {value}")
+            return {"suitability": NOT_SUITABLE, "message": f"ค่า pH ดิน ({value}) ไม่ถูกต้อง"}
+
+        if any(_is_in_range(value_float, r) for r in param["suitables"]):
+            level = SUITABLE
+        elif any(_is_in_range(value_float, r) for r in param["moderate"]):
+            level = MODERATE
+        else:
+            level = NOT_SUITABLE
+
+    if level == SUITABLE:
+        message = param["messages"]["suitable"].format(value=value)
+    else:
+        key = "moderate" if level == MODERATE else "not_suitable"
+        message = param["messages"][key].format(value=value, suitable=suitable)
+
+    return {"suitability": level, "message": message}
+
+
+class _CompiledRanges:
+    """
+    เกณฑ์แบบช่วงตัวเลขที่แปลงเป็น array ของจุดแบ่งแล้ว \n
+    Numeric ranges compiled into sorted boundary arrays.
+
+    #### Description
+        จุดแบ่ง (edges) แบ่งแกนตัวเลขเป็นจุดบนขอบและช่วงเปิดระหว่างขอบ ระดับความเหมาะสม
+        ของแต่ละส่วนถูกคำนวณไว้ล่วงหน้า การประเมินจึงเหลือเพียง `np.searchsorted` ครั้งเดียว \n
+        The edges split the number line into the edge points and the open gaps
+        between them. The level of each piece is computed once, so scoring a
+        column is a single `np.searchsorted` plus two lookups. Ranges are
+        inclusive on both ends and the best matching level wins, exactly as
+        the original per-value loop did.
+    """
+
+    def __init__(self, ranges: dict):
+        bounds = [
+            (r.get("min", -np.inf), r.get("max", np.inf), level)
+            for name, level in (("suitable", SUITABLE), ("moderate", MODERATE))
+            for r in ranges.get(name, [])
+        ]
+
+        def level_at(x: float) -> int:
+            return max((level for lo, hi, level in bounds if lo <= x <= hi), default=NOT_SUITABLE)
+
+        edges = sorted({b for lo, hi, _ in bounds for b in (lo, hi) if np.isfinite(b)})
+        samples = (
+            [edges[0] - 1.0]
+            + [(a + b) / 2 for a, b in zip(edges, edges[1:])]
+            + [edges[-1] + 1.0]
+        )
+
+        self.edges = np.asarray(edges, dtype=float)
+        self.point_levels = np.asarray([level_at(e) for e in edges], dtype=np.int8)
+        self.gap_levels = np.asarray([level_at(x) for x in samples], dtype=np.int8)
+
+    def score(self, values: np.ndarray) -> np.ndarray:
+        idx = np.searchsorted(self.edges, values, side="left")
+        on_edge = self.edges[np.minimum(idx, len(self.edges) - 1)] == values
+        levels = np.where(on_edge, self.point_levels[np.minimum(idx, len(self.edges) - 1)], self.gap_levels[idx])
+
+        return np.where(np.isnan(values), NOT_SUITABLE, levels).astype(np.int8)
+
+
+class SuitabilityRuleEngine:
+    """
+    ตัวประเมินความเหมาะสมตามเกณฑ์ที่คอมไพล์ไว้ล่วงหน้า \n
+    Suitability rule engine compiled once from SUITABILITY_PARAMS.
+
+    #### Description
+        ตัวแปรเชิงตัวเลขถูกประเมินทีละคอลัมน์ของ matrix ด้วย NumPy ส่วนค่า pH
+        ใช้ตารางผลลัพธ์ที่คำนวณไว้ล่วงหน้าสำหรับทุกชั้น pH ที่รู้จัก \n
+        Numeric parameters are scored a whole column at a time, and every
+        known pH class maps straight to its precomputed result.
+    """
+
+    def __init__(self, params: dict = SUITABILITY_PARAMS, ph_classes: Sequence[str] = ()):
+        self.params = params
+        self.ranges = {name: _CompiledRanges(params[name]["ranges"]) for name in NUMERIC_PARAMS}
+
+        ph_param = params["ph_top"]
+        known = set(ph_param["suitables"]) | set(ph_param["moderate"]) | set(ph_param["not_suitable"]) | set(ph_classes)
+        self.ph_results = {value: _evaluate_ph_top(value, ph_param) for value in known}
+
+    def score_numeric(self, values: np.ndarray) -> np.ndarray:
+        """
+        ประเมินระดับความเหมาะสมของ matrix (N, 5) ตามลำดับคอลัมน์ NUMERIC_PARAMS \n
+        Score an (N, 5) matrix whose columns follow NUMERIC_PARAMS.
+        """
+
+        values = np.asarray(values, dtype=float).reshape(-1, len(NUMERIC_PARAMS))
+
+        return np.column_stack([
+            self.ranges[name].score(values[:, i]) for i, name in enumerate(NUMERIC_PARAMS)
+        ])
+
+    def evaluate_ph(self, value) -> dict:
+        result = self.ph_results.get(value)
+
+        if result is None:
+            if not isinstance(value, str):
+                return {"suitability": NOT_SUITABLE, "message": f"ค่า pH ดิน ({value}) ไม่ถูกต้อง"}
+            result = _evaluate_ph_top(value, self.params["ph_top"])
+
+        return dict(result)
+
+    def score_ph(self, values: Sequence) -> np.ndarray:
+        return np.fromiter((self.evaluate_ph(v)["suitability"] for v in values), dtype=np.int8, count=len(values))
+
+    def evaluate(self, param_name: str, value) -> dict:
+        """
+        ประเมินค่าตัวแปรเดียว \n
+        Evaluate a single value of one parameter.
+        """
+
+        if param_name == "ph_top":
+            return self.evaluate_ph(value)
+
+        if param_name not in self.ranges:
+            return {"suitability": 0, "message": "ไม่พบข้อมูลเกณฑ์การประเมิน"}
+
+        try:
+            numeric_value = float(value)
+        except (TypeError, ValueError):
+            logger.error(f"Invalid numeric value for {param_name}: {value}")
+            return {
+                "suitability": 0,
+                "message": f"ค่า {param_name} ({value}) ไม่ถูกต้อง ต้องเป็นตัวเลข"
+            }
+
+        level = int(self.ranges[param_name].score(np.asarray([numeric_value]))[0])
+
+        return self._numeric_result(param_name, level, numeric_value)
+
+    def evaluate_many(self, columns: dict[str, Sequence]) -> list[dict]:
+        """
+        ประเมินหลายรายการพร้อมกัน รับค่าเป็นคอลัมน์ของแต่ละตัวแปร \n
+        Evaluate many rows at once from per-parameter columns and return one
+        evaluation dict per row, in EVALUATION_ORDER.
+        """
+
+        matrix = np.column_stack([np.asarray(columns[name], dtype=float) for name in NUMERIC_PARAMS])
+        levels = self.score_numeric(matrix).tolist()
+        values = matrix.tolist()
+
+        evaluations = []
+        for row_values, row_levels, ph_value in zip(values, levels, columns["ph_top"]):
+            evaluation = {
+                name: self._numeric_result(name, level, value)
+                for name, level, value in zip(NUMERIC_PARAMS, row_levels, row_values)
+            }
+            evaluation["ph_top"] = self.evaluate_ph(ph_value)
+            evaluations.append({name: evaluation[name] for name in EVALUATION_ORDER})
+
+        return evaluations
+
+    def _numeric_result(self, param_name: str, level: int, value: float) -> dict:
+        messages = self.params[param_name]["messages"]
+        key = {SUITABLE: "suitable", MODERATE: "moderate", NOT_SUITABLE: "not_suitable"}[level]
+
+        return {"suitability": level, "message": messages[key].format(value=value)}
+
+
+suitability_rules = SuitabilityRuleEngine()
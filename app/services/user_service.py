@@ -14,7 +14,8 @@ from app.schemas.token_schema import TokenSchema
 from app.schemas.user_schema import UserCreateSchema, UserLoginSchema
 from app.services.role_service import RoleService
 from app.services.token_service import TokenService
-from app.utilities.app_exceptions import DuplicateResourceException, InvalidAuthorizationException, InvalidOutputException, ResourceNotFoundException, SQLProcessException, ServerProcessException
+from app.utilities.app_cursor import decode_cursor
+from app.utilities.app_exceptions import DuplicateResourceException, InvalidAuthorizationException, InvalidInputException, InvalidOutputException, ResourceNotFoundException, SQLProcessException, ServerProcessException
 from app.utilities.password_service import get_password_hash, verify_password
 
 # Configure logging
@@ -71,12 +72,20 @@ class UserService:
 
         try:
 
+            # เรียงตาม id เสมอ ให้ทั้งแบบ offset และแบบ cursor ได้ลำดับเดียวกันและไม่ข้ามหรือซ้ำแถว
             stmt = (
             select(UserAccount)
             .options(selectinload(UserAccount.profile), selectinload(UserAccount.roles))
-            .limit(query.limit).offset(query.offset)
+            .order_by(UserAccount.id)
             )
 
+            # keyset pagination: เริ่มต่อจาก id ของแถวสุดท้ายในหน้าก่อนหน้า
+            if query.after:
+                (after_id,) = decode_cursor(query.after)
+                stmt = stmt.where(UserAccount.id > UUID(after_id)).limit(query.limit)
+            else:
+                stmt = stmt.limit(query.limit).offset(query.offset)
+
             result = await self.session.execute(stmt)
             users = result.scalars().all()
 
@@ -90,6 +99,12 @@ class UserService:
         except InvalidOutputException as e:
             logger.error("Invalid output exception: %s", e)
             raise e
+
+        except InvalidInputException as e:
+            raise e
+
+        except (ValueError, TypeError, AttributeError):
+            raise InvalidInputException(message="cursor ไม่ถูกต้อง")
         
         except SQLAlchemyError as e:
             logger.error("SQLAlchemy error: %s", e)
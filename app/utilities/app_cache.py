@@ -0,0 +1,139 @@
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.table_version import get_table_version
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    แคชแบบ LRU ที่มีอายุของข้อมูล (TTL) \n
+    In-process LRU cache whose entries also expire after `ttl` seconds.
+
+    #### Description
+        เมื่อจำนวนข้อมูลเกิน `max_size` จะลบรายการที่ใช้งานล่าสุดนานที่สุดออก \n
+        The least recently used entry is evicted once `max_size` is exceeded.
+        A `max_size` of 0 disables the cache.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key, _MISSING)
+
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+
+        expires_at, value = entry
+
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        if self.max_size <= 0:
+            return
+
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class DependencyCache:
+    """
+    แคชผลลัพธ์ที่แต่ละรายการบันทึกตารางที่ใช้คำนวณ และหมดอายุทันทีเมื่อตารางเหล่านั้นถูกแก้ไข \n
+    Result cache whose entries record the tables they were computed from.
+
+    #### Description
+        แต่ละรายการเก็บเลขรุ่นของตารางที่อ้างถึง (อ่านจากตาราง TableVersion ก่อนคำนวณ)
+        เมื่อ transaction ใดเรียก `bump_table_version` กับตารางเหล่านั้น ไม่ว่าจะใน worker ใด
+        รายการนั้นจะไม่ถูกใช้อีก ส่วนรายการที่ไม่ได้อ้างถึงตารางนั้นยังใช้ได้ตามเดิม \n
+        Each entry keeps the versions of its tables, read from the shared
+        TableVersion table before the value was computed. Once any worker
+        commits a bump of one of them the entry is recomputed on its next
+        read, while entries over other tables keep being served. Entries are
+        also bounded by LRU size and `ttl`.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self._entries = TTLCache(max_size=max_size, ttl=ttl)
+        self.stale = 0
+
+    async def get_or_set(
+        self,
+        session: AsyncSession,
+        key: Hashable,
+        tables: tuple[str, ...],
+        compute: Callable[[], Awaitable[Any]],
+        versions: tuple[int, ...] | None = None,
+    ) -> Any:
+        """
+        คืนค่าจากแคชถ้าเลขรุ่นของ tables ยังตรงกัน หรือคำนวณใหม่แล้วเก็บพร้อมเลขรุ่นชุดนั้น \n
+        Return the cached value while the versions of `tables` still match,
+        otherwise compute it and store it with those versions. Callers that
+        look up many keys over the same tables can pass `versions` read once.
+        """
+
+        # อ่านเลขรุ่นก่อนคำนวณ: ถ้ามีการเขียนระหว่างคำนวณ รายการนี้จะถือว่าเก่าในครั้งถัดไป
+        if versions is None:
+            versions = await get_table_version(session, *tables)
+
+        entry = self._entries.get(key, _MISSING)
+
+        if entry is not _MISSING:
+            cached_versions, value = entry
+
+            if cached_versions == versions:
+                return value
+
+            self._entries.pop(key)
+            self.stale += 1
+
+        value = await compute()
+        self._entries.set(key, (versions, value))
+
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {**self._entries.stats(), "stale": self.stale}
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,74 @@
+import base64
+import binascii
+import orjson
+
+from app.utilities.app_exceptions import InvalidInputException
+
+
+def encode_cursor(values: list) -> str:
+    """
+    เข้ารหัสค่าของคีย์การเรียงลำดับของแถวสุดท้ายเป็น cursor แบบทึบ \n
+    Encode the sort key of the last row of a page as an opaque cursor.
+    """
+
+    return base64.urlsafe_b64encode(orjson.dumps(values)).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list:
+    """
+    ถอดรหัส cursor ที่ได้จาก `encode_cursor` \n
+    Decode a cursor produced by `encode_cursor`.
+    """
+
+    try:
+        values = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+
+    except (binascii.Error, ValueError):
+        raise InvalidInputException(message="cursor ไม่ถูกต้อง")
+
+    if not isinstance(values, list):
+        raise InvalidInputException(message="cursor ไม่ถูกต้อง")
+
+    return values
+
+
+def next_cursor(rows: list, limit: int | None, sort_key) -> str | None:
+    """
+    cursor ของหน้าถัดไป หรือ None เมื่อเป็นหน้าสุดท้าย \n
+    Cursor of the next page, or None when this page is the last one.
+    """
+
+    if not rows or not limit or len(rows) < limit:
+        return None
+
+    return encode_cursor(list(sort_key(rows[-1])))
+
+
+def paginate_sorted(items: list, query, sort_key, descending: bool = False) -> tuple[list, str | None]:
+    """
+    แบ่งหน้าข้อมูลในหน่วยความจำที่เรียงตาม `sort_key` แล้ว ด้วย cursor (`after`) หรือ offset \n
+    Page an already sorted in-memory list by cursor (`after`) or offset.
+
+    #### Returns
+        tuple[list, str | None] => ข้อมูลในหน้านี้ และ cursor ของหน้าถัดไป
+    """
+
+    if query.after:
+        after = tuple(decode_cursor(query.after))
+
+        try:
+            if descending:
+                items = [item for item in items if sort_key(item) < after]
+            else:
+                items = [item for item in items if sort_key(item) > after]
+
+        except TypeError:
+            raise InvalidInputException(message="cursor ไม่ถูกต้อง")
+
+    elif query.offset:
+        items = items[query.offset:]
+
+    if query.limit:
+        items = items[:query.limit]
+
+    return items, next_cursor(items, query.limit, sort_key)
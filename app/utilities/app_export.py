@@ -0,0 +1,209 @@
+import asyncio
+import csv
+import io
+import tempfile
+from collections.abc import AsyncIterator, Sequence
+from contextlib import aclosing
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+from app.utilities.app_exceptions import ServerProcessException
+
+# ชนิดไฟล์ที่ส่งออกได้: (media type, นามสกุลไฟล์)
+EXPORT_MEDIA_TYPES = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+
+
+async def csv_stream(header: Sequence[str], rows: AsyncIterator[Sequence]) -> AsyncIterator[bytes]:
+    """
+    เขียน CSV ทีละส่วนจากแถวที่ได้รับ โดยไม่เก็บไฟล์ทั้งไฟล์ไว้ในหน่วยความจำ \n
+    Write CSV incrementally, yielding a chunk once the buffer reaches
+    `EXPORT_CHUNK_BYTES`, so memory stays flat for any number of rows.
+    """
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    # BOM ให้ Excel เปิดภาษาไทยได้ถูกต้อง
+    buffer.write("\ufeff")
+    writer.writerow(header)
+
+    async for row in rows:
+        writer.writerow(row)
+
+        if buffer.tell() >= settings.EXPORT_CHUNK_BYTES:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue().encode("utf-8")
+
+
+def load_workbook_class():
+    """
+    นำเข้า openpyxl เมื่อจำเป็นเท่านั้น (ติดตั้งผ่าน optional dependency "export") \n
+    Import openpyxl lazily; it is only needed for XLSX exports.
+    """
+
+    try:
+        from openpyxl import Workbook
+    except ImportError:
+        raise ServerProcessException(message="ระบบยังไม่รองรับการส่งออกไฟล์ Excel (ไม่ได้ติดตั้ง openpyxl)")
+
+    return Workbook
+
+
+def append_rows(sheet, rows: list[list]) -> None:
+    for row in rows:
+        sheet.append(row)
+
+
+async def xlsx_stream(header: Sequence[str], rows: AsyncIterator[Sequence], sheet_title: str) -> AsyncIterator[bytes]:
+    """
+    เขียน XLSX ด้วย workbook แบบ write-only แล้วส่งไฟล์ออกทีละส่วน \n
+    Write XLSX with a write-only workbook, which spools rows to a temporary
+    file instead of keeping them in memory, then stream the saved file.
+
+    #### Description
+        ไฟล์ XLSX เป็น zip ที่ต้องเขียนให้ครบก่อนจึงส่ง byte แรกได้ ผู้ใช้จึงต้องรอจนอ่านข้อมูลครบทุกแถว
+        แถวถูกเขียนลง sheet ทีละชุดใน thread แยก เพื่อไม่ให้ event loop ค้าง
+        และจำกัดจำนวนแถวไว้ที่ `EXPORT_XLSX_MAX_ROWS` ถ้าเกินจะปิดท้าย sheet ด้วยแถวแจ้งให้ใช้ CSV
+        ซึ่งส่งข้อมูลออกได้ทันทีและไม่จำกัดจำนวนแถว \n
+        An XLSX file is a zip that must be complete before its first byte can
+        be sent, so the download only starts once every row has been read.
+        Rows are appended one batch at a time in a worker thread to keep the
+        event loop free, and capped at `EXPORT_XLSX_MAX_ROWS`; past the cap the
+        sheet ends with a row pointing to the CSV export, which streams
+        immediately and has no row limit.
+    """
+
+    workbook = load_workbook_class()(write_only=True)
+    sheet = workbook.create_sheet(title=sheet_title)
+    sheet.append(list(header))
+
+    batch = []
+    written = 0
+
+    # aclosing ปิด cursor และ session ของแถวที่เหลือทันทีเมื่อหยุดอ่านก่อนหมด
+    async with aclosing(rows):
+        async for row in rows:
+            if written + len(batch) >= settings.EXPORT_XLSX_MAX_ROWS:
+                batch.append([f"ข้อมูลเกิน {settings.EXPORT_XLSX_MAX_ROWS} แถว กรุณาส่งออกเป็น CSV เพื่อรับข้อมูลทั้งหมด"])
+                break
+
+            batch.append(list(row))
+
+            if len(batch) >= settings.EXPORT_BATCH_SIZE:
+                await asyncio.to_thread(append_rows, sheet, batch)
+                written += len(batch)
+                batch = []
+
+    await asyncio.to_thread(append_rows, sheet, batch)
+
+    with tempfile.TemporaryFile() as file:
+        await asyncio.to_thread(workbook.save, file)
+        file.seek(0)
+
+        while chunk := await asyncio.to_thread(file.read, settings.EXPORT_CHUNK_BYTES):
+            yield chunk
+
+
+def load_pyarrow():
+    """
+    นำเข้า pyarrow เมื่อจำเป็นเท่านั้น (ติดตั้งผ่าน optional dependency "export") \n
+    Import pyarrow lazily; it is only needed for Parquet/Arrow exports.
+    """
+
+    try:
+        import pyarrow
+        import pyarrow.ipc
+        import pyarrow.parquet
+    except ImportError:
+        raise ServerProcessException(message="ระบบยังไม่รองรับการส่งออกไฟล์ Parquet/Arrow (ไม่ได้ติดตั้ง pyarrow)")
+
+    return pyarrow
+
+
+class _ChunkSink(io.RawIOBase):
+    """
+    ปลายทางของ writer ที่เก็บ bytes ไว้จนกว่าจะถูกดึงออกไปส่ง \n
+    Write-only file object that buffers written bytes until they are drained.
+    """
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+async def arrow_stream(format: str, types: dict[str, str], batches: AsyncIterator[dict[str, list]]) -> AsyncIterator[bytes]:
+    """
+    เขียน Parquet (หนึ่ง row group ต่อชุด) หรือ Arrow IPC stream ทีละ record batch \n
+    Write Parquet (one row group per batch) or an Arrow IPC stream, one
+    record batch at a time, yielding the bytes as soon as they are written.
+    """
+
+    pa = load_pyarrow()
+    arrow_types = {"int": pa.int64(), "float": pa.float64(), "string": pa.string()}
+    schema = pa.schema([(name, arrow_types[kind]) for name, kind in types.items()])
+
+    sink = _ChunkSink()
+
+    if format == "parquet":
+        writer = pa.parquet.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+
+    try:
+        async for batch in batches:
+            record_batch = pa.RecordBatch.from_pydict(batch, schema=schema)
+            await asyncio.to_thread(writer.write_batch, record_batch)
+
+            if data := sink.drain():
+                yield data
+
+    finally:
+        writer.close()
+
+    yield sink.drain()
+
+
+def export_stream(format: str, header: Sequence[str], rows: AsyncIterator[Sequence], sheet_title: str) -> AsyncIterator[bytes]:
+    if format == "xlsx":
+        return xlsx_stream(header, rows, sheet_title)
+
+    return csv_stream(header, rows)
+
+
+def export_response(format: str, chunks: AsyncIterator[bytes], filename: str) -> StreamingResponse:
+    """
+    StreamingResponse ของไฟล์ที่ส่งออก พร้อม Content-Disposition สำหรับดาวน์โหลด \n
+    Wrap an export stream in a chunked StreamingResponse sent as a download.
+    """
+
+    media_type, extension = EXPORT_MEDIA_TYPES[format]
+
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}.{extension}"'},
+    )
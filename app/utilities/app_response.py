@@ -0,0 +1,72 @@
+import hashlib
+from typing import Any, NamedTuple
+import orjson
+from fastapi import Request, Response, status
+
+from app.core.config import settings
+from app.schemas.result import Result
+from app.utilities.app_cache import TTLCache
+
+
+class PreparedResponse(NamedTuple):
+    body: bytes
+    etag: str
+
+
+# ผลลัพธ์ที่ serialize แล้วของข้อมูลอ้างอิง (ข้อมูลพื้นที่) ใช้ร่วมกันทั้งโปรเซส
+reference_response_cache = TTLCache(
+    max_size=settings.GEO_RESPONSE_CACHE_SIZE,
+    ttl=settings.GEO_RESPONSE_MAX_AGE,
+)
+
+
+def prepare_response(data: Any, next_cursor: str | None = None) -> PreparedResponse:
+    """
+    serialize ผลลัพธ์เป็น orjson bytes ครั้งเดียว พร้อม ETag จาก hash ของเนื้อหา \n
+    Serialize a successful Result once and derive a strong ETag from its bytes.
+
+    #### Description
+        ไม่มีฟิลด์ trace_id ในเนื้อหา เพื่อให้ใช้ซ้ำได้ทุกคำขอ trace_id ของคำขอส่งใน header X-Trace-ID
+        (ตั้งโดย middleware ทุกคำตอบ) \n
+        The body has no trace_id field, so it can be shared between requests.
+        The request's trace id is sent in the X-Trace-ID header, which the
+        middleware sets on every response.
+    """
+
+    body = orjson.dumps(Result(success=True, data=data, next_cursor=next_cursor).model_dump(exclude={"trace_id"}))
+    etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+    return PreparedResponse(body, etag)
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    candidates = (candidate.strip().removeprefix("W/") for candidate in if_none_match.split(","))
+
+    return etag in candidates
+
+
+def cached_response(request: Request, prepared: PreparedResponse, max_age: int = settings.GEO_RESPONSE_MAX_AGE) -> Response:
+    """
+    ส่งผลลัพธ์ที่เตรียมไว้ หรือ 304 เมื่อ If-None-Match ตรงกับ ETag \n
+    Send the prepared body, or 304 Not Modified when If-None-Match matches.
+    A `max_age` of 0 sends `no-cache`, so clients revalidate every time and
+    only the ETag/304 path saves the transfer.
+    """
+
+    headers = {
+        "ETag": prepared.etag,
+        "Cache-Control": f"public, max-age={max_age}" if max_age > 0 else "no-cache",
+    }
+
+    if etag_matches(request, prepared.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=prepared.body, media_type="application/json", headers=headers)
@@ -4,4 +4,16 @@ def generate_trace_id() -> str:
     """
     Generate a unique trace ID.
     """
-    return str(uuid.uuid4()) 
\ No newline at end of file
+    return str(uuid.uuid4()) 
+
+# อักขระ escape ที่ใช้คู่กับ contains_pattern: column.ilike(contains_pattern(q), escape=LIKE_ESCAPE)
+LIKE_ESCAPE = "\\"
+
+
+def contains_pattern(text: str) -> str:
+    """
+    Build a LIKE/ILIKE "contains" pattern with `%`, `_` and the escape
+    character in `text` matched literally.
+    """
+    escaped = text.replace(LIKE_ESCAPE, LIKE_ESCAPE * 2).replace("%", LIKE_ESCAPE + "%").replace("_", LIKE_ESCAPE + "_")
+    return f"%{escaped}%"